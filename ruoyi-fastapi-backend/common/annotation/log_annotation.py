@@ -1,14 +1,13 @@
 import inspect
-import json
 import time
 from collections.abc import Awaitable, Callable
 from datetime import datetime
 from functools import wraps
+from itertools import islice
 from typing import Any, Literal, TypeVar
 
-import httpx
-from async_lru import alru_cache
-from fastapi import Request
+import orjson
+from fastapi import BackgroundTasks, Request, Response
 from fastapi.responses import JSONResponse, ORJSONResponse, UJSONResponse
 from starlette.status import HTTP_200_OK
 from typing_extensions import ParamSpec
@@ -21,6 +20,7 @@ from exceptions.exception import LoginException, ServiceException, ServiceWarnin
 from module_admin.entity.vo.log_vo import LogininforModel, OperLogModel
 from module_admin.service.log_service import LogQueueService
 from utils.dependency_util import DependencyUtil
+from utils.ip_location_util import INTERNAL_LOCATION, IpLocationUtil
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -38,6 +38,8 @@ class Log:
         title: str,
         business_type: BusinessType,
         log_type: Literal['login', 'operation'] | None = 'operation',
+        is_save_request_data: bool = True,
+        result_capture: Literal['none', 'status', 'truncated', 'full'] = 'truncated',
     ) -> None:
         """
         日志装饰器
@@ -45,12 +47,23 @@ class Log:
         :param title: 当前日志装饰器装饰的模块标题
         :param business_type: 业务类型（OTHER其它 INSERT新增 UPDATE修改 DELETE删除 GRANT授权 EXPORT导出 IMPORT导入 FORCE强退 GENCODE生成代码 CLEAN清空数据）
         :param log_type: 日志类型（login表示登录日志，operation表示为操作日志）
+        :param is_save_request_data: 是否记录请求参数，文件导入等请求体较大的高频接口可设置为False以跳过请求参数采集
+        :param result_capture: 返回参数记录策略（none不记录 status仅记录状态码及提示信息 truncated按结构截断后记录 full完整序列化后记录，超出字段长度时再截断）
         :return:
         """
         self.title = title
         self.business_type = business_type.value
         self.log_type = log_type
+        self.is_save_request_data = is_save_request_data
+        self.result_capture = result_capture
         self._oper_param_len = 2000
+        self._json_result_len = 2000
+        # 请求体超过该字节数时不再解析，仅记录截断后的原始内容
+        self._param_capture_bytes = 64 * 1024
+        # 结构化截断时字符串保留的最大长度、列表及字典保留的最大元素数量和最大嵌套深度
+        self._param_str_len = 256
+        self._param_item_count = 20
+        self._param_depth = 5
 
     def __call__(self, func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
         @wraps(func)
@@ -73,10 +86,7 @@ class Log:
             # 获取请求ip归属区域
             oper_location = await self._get_oper_location(oper_ip)
             # 获取请求参数
-            oper_param = await self._get_request_params(request)
-            # 日志表请求参数字段长度最大为2000，因此在此处判断长度
-            if len(oper_param) > self._oper_param_len:
-                oper_param = '请求参数过长'
+            oper_param = await self._get_request_params(request) if self.is_save_request_data else ''
 
             # 获取操作时间
             oper_time = datetime.now()
@@ -98,17 +108,18 @@ class Log:
             cost_time = float(time.perf_counter() - start_time) * 1000
             # 判断请求是否来自api文档
             request_from_swagger, request_from_redoc = self._is_request_from_swagger_or_redoc(request)
-            # 根据响应结果的类型使用不同的方法获取响应结果参数
-            result_dict = self._get_result_dict(result, request_from_swagger, request_from_redoc)
-            json_result = json.dumps(result_dict, ensure_ascii=False)
-            # 根据响应结果获取响应状态及异常信息
-            status, error_msg = self._get_status_and_error_msg(result_dict)
-            # 根据日志类型向对应的日志表插入数据
-            if self.log_type == 'login':
-                # 登录请求来自于api文档时不记录登录日志，其余情况则记录
-                if request_from_swagger or request_from_redoc:
-                    pass
-                else:
+            # 登录请求来自于api文档时不记录登录日志，其余情况则记录
+            if self.log_type == 'login' and (request_from_swagger or request_from_redoc):
+                return result
+            current_user = RequestContext.get_current_user() if self.log_type != 'login' else None
+
+            async def record_log() -> None:
+                # 根据响应结果的类型使用不同的方法获取响应结果参数
+                result_dict = self._get_result_dict(result, request_from_swagger, request_from_redoc)
+                # 根据响应结果获取响应状态及异常信息
+                status, error_msg = self._get_status_and_error_msg(result_dict)
+                # 根据日志类型向对应的日志表插入数据
+                if self.log_type == 'login':
                     user = kwargs.get('form_data')
                     login_log.update(
                         {
@@ -120,29 +131,31 @@ class Log:
                     )
 
                     await LogQueueService.enqueue_login_log(request, LogininforModel(**login_log), func_path)
-            else:
-                current_user = RequestContext.get_current_user()
-                oper_name = current_user.user.user_name
-                dept_name = current_user.user.dept.dept_name if current_user.user.dept else None
-                operation_log = OperLogModel(
-                    title=self.title,
-                    businessType=self.business_type,
-                    method=func_path,
-                    requestMethod=request_method,
-                    operatorType=operator_type,
-                    operName=oper_name,
-                    deptName=dept_name,
-                    operUrl=oper_url,
-                    operIp=oper_ip,
-                    operLocation=oper_location,
-                    operParam=oper_param,
-                    jsonResult=json_result,
-                    status=status,
-                    errorMsg=error_msg,
-                    operTime=oper_time,
-                    costTime=int(cost_time),
-                )
-                await LogQueueService.enqueue_operation_log(request, operation_log, func_path)
+                else:
+                    oper_name = current_user.user.user_name
+                    dept_name = current_user.user.dept.dept_name if current_user.user.dept else None
+                    operation_log = OperLogModel(
+                        title=self.title,
+                        businessType=self.business_type,
+                        method=func_path,
+                        requestMethod=request_method,
+                        operatorType=operator_type,
+                        operName=oper_name,
+                        deptName=dept_name,
+                        operUrl=oper_url,
+                        operIp=oper_ip,
+                        operLocation=oper_location,
+                        operParam=oper_param,
+                        jsonResult=self._get_json_result(result_dict),
+                        status=status,
+                        errorMsg=error_msg,
+                        operTime=oper_time,
+                        costTime=int(cost_time),
+                    )
+                    await LogQueueService.enqueue_operation_log(request, operation_log, func_path)
+
+            # 响应结果的解析、序列化及日志入队在响应发送完成后执行，不占用接口响应时间
+            await self._run_after_response(result, record_log)
 
             return result
 
@@ -179,23 +192,27 @@ class Log:
 
         return operator_type
 
-    async def _get_oper_location(self, oper_ip: str) -> str:
+    async def _get_oper_location(self, oper_ip: str) -> str | None:
         """
         获取请求IP归属区域
 
         :param oper_ip: 请求IP
-        :return: 请求IP归属区域
+        :return: 请求IP归属区域，开启延迟查询且未命中缓存时返回None，由日志聚合消费时补充
         """
-        oper_location = '内网IP'
-        if AppConfig.app_ip_location_query:
-            oper_location = await get_ip_location(oper_ip)
+        if not AppConfig.app_ip_location_query:
+            return INTERNAL_LOCATION
+        if AppConfig.app_ip_location_resolve_later:
+            return IpLocationUtil.get_cached_location(oper_ip)
 
-        return oper_location
+        return await IpLocationUtil.resolve(oper_ip)
 
     async def _get_request_params(self, request: Request) -> str:
         """
         获取请求参数
 
+        优先复用FastAPI解析接口参数时已缓存的请求体及表单，未缓存时仅读取不超过限制大小的请求体，
+        超出日志表请求参数字段长度时按结构截断长字符串、长列表及深层嵌套，而不是直接丢弃
+
         :param request: Request对象
         :return: 格式化后的请求参数字符串
         """
@@ -211,43 +228,244 @@ class Log:
 
         # JSON请求
         if 'application/json' in content_type:
-            json_body = await request.json()
-            if json_body:
-                params['json_body'] = json_body
+            body = await self._get_request_body(request)
+            if body is None:
+                params['json_body'] = f'<请求体过大，共{request.headers.get("Content-Length")}字节>'
+            elif body:
+                params['json_body'] = self._parse_json_body(body)
 
         # 表单数据
         elif 'multipart/form-data' in content_type or 'application/x-www-form-urlencoded' in content_type:
-            form_data = await request.form()
-            if form_data:
-                # 过滤掉文件对象，只保留普通表单字段
-                form_dict = {key: value for key, value in form_data.items() if not hasattr(value, 'filename')}
-                if form_dict:
-                    params['form_data'] = form_dict
-
-                # 仅在multipart时尝试处理文件
-                if 'multipart/form-data' in content_type:
-                    file_info = {}
-                    for key, value in form_data.items():
-                        if hasattr(value, 'filename'):
-                            file_info[key] = {
-                                'filename': value.filename,
-                                'content_type': value.content_type,
-                                'size': value.size,
-                                'headers': dict(value.headers),
-                            }
-                    if file_info:
-                        params['files'] = file_info
+            params.update(await self._get_form_params(request, 'multipart/form-data' in content_type))
 
         # 其他文本请求
         elif 'application/octet-stream' not in content_type:
-            body = await request.body()
-            if body:
-                params['raw_body'] = body.decode('utf-8')
+            body = await self._get_request_body(request)
+            if body is None:
+                params['raw_body'] = f'<请求体过大，共{request.headers.get("Content-Length")}字节>'
+            elif body:
+                params['raw_body'] = self._truncate_text(
+                    body[: self._param_str_len * 4].decode('utf-8', 'ignore'), len(body)
+                )
+
+        return self._dump_request_params(params) if params else ''
+
+    async def _get_form_params(self, request: Request, is_multipart: bool) -> dict:
+        """
+        获取表单参数
+
+        :param request: Request对象
+        :param is_multipart: 是否为multipart请求
+        :return: 表单参数
+        """
+        params = {}
+        form_data = await self._get_request_form(request)
+        if form_data is None:
+            params['form_data'] = f'<表单数据过大，共{request.headers.get("Content-Length")}字节>'
+        elif form_data:
+            # 过滤掉文件对象，只保留普通表单字段
+            form_dict = {key: value for key, value in form_data.items() if not hasattr(value, 'filename')}
+            if form_dict:
+                params['form_data'] = form_dict
+
+            # 仅在multipart时尝试处理文件
+            if is_multipart:
+                file_info = {}
+                for key, value in form_data.items():
+                    if hasattr(value, 'filename'):
+                        file_info[key] = {
+                            'filename': value.filename,
+                            'content_type': value.content_type,
+                            'size': value.size,
+                            'headers': dict(value.headers),
+                        }
+                if file_info:
+                    params['files'] = file_info
+
+        return params
+
+    def _get_content_length(self, request: Request) -> int | None:
+        """
+        获取请求头中声明的请求体长度
+
+        :param request: Request对象
+        :return: 请求体长度，未声明时返回None
+        """
+        content_length = request.headers.get('Content-Length')
+        return int(content_length) if content_length and content_length.isdigit() else None
+
+    async def _get_request_body(self, request: Request) -> bytes | None:
+        """
+        获取请求体，FastAPI已读取时直接复用，否则仅在请求体不超过限制大小时读取
+
+        :param request: Request对象
+        :return: 请求体，请求体过大时返回None
+        """
+        body = getattr(request, '_body', None)
+        if body is not None:
+            return body
+        content_length = self._get_content_length(request)
+        if content_length is None:
+            return b''
+        if content_length > self._param_capture_bytes:
+            return None
+        return await request.body()
+
+    async def _get_request_form(self, request: Request) -> Any:
+        """
+        获取表单数据，FastAPI已解析时直接复用，否则仅在请求体不超过限制大小时解析
+
+        :param request: Request对象
+        :return: 表单数据，请求体过大时返回None
+        """
+        form_data = getattr(request, '_form', None)
+        if form_data is not None:
+            return form_data
+        content_length = self._get_content_length(request)
+        if content_length is not None and content_length > self._param_capture_bytes:
+            return None
+        return await request.form()
+
+    def _parse_json_body(self, body: bytes) -> Any:
+        """
+        解析JSON请求体，请求体超过限制大小时不再解析，仅保留截断后的原始内容
+
+        :param body: 请求体
+        :return: 解析后的请求体
+        """
+        if len(body) > self._param_capture_bytes:
+            return self._truncate_text(body[: self._param_str_len * 4].decode('utf-8', 'ignore'), len(body))
+        try:
+            return orjson.loads(body)
+        except ValueError:
+            return self._truncate_text(body.decode('utf-8', 'ignore'))
+
+    def _truncate_text(self, text: str, total_length: int | None = None, max_length: int | None = None) -> str:
+        """
+        截断过长的字符串
+
+        :param text: 字符串
+        :param total_length: 原始内容长度，为None时使用字符串长度
+        :param max_length: 保留的最大长度，为None时使用默认长度
+        :return: 截断后的字符串
+        """
+        max_length = self._param_str_len if max_length is None else max_length
+        total_length = len(text) if total_length is None else total_length
+        if len(text) <= max_length and total_length <= max_length:
+            return text
+        return f'{text[:max_length]}...(共{total_length}字符)'
+
+    def _truncate_value(self, value: Any, str_len: int, item_count: int, depth: int) -> Any:
+        """
+        按结构截断请求参数，保证截断后仍是合法的JSON结构
+
+        :param value: 请求参数
+        :param str_len: 字符串保留的最大长度
+        :param item_count: 列表及字典保留的最大元素数量
+        :param depth: 剩余可展开的嵌套深度
+        :return: 截断后的请求参数
+        """
+        if isinstance(value, str):
+            return self._truncate_text(value, max_length=str_len)
+        if isinstance(value, dict):
+            if depth <= 0:
+                return f'{{...共{len(value)}项}}'
+            truncated_dict = {
+                key: self._truncate_value(item, str_len, item_count, depth - 1)
+                for key, item in islice(value.items(), item_count)
+            }
+            if len(value) > item_count:
+                truncated_dict['...'] = f'共{len(value)}项'
+            return truncated_dict
+        if isinstance(value, (list, tuple)):
+            if depth <= 0:
+                return f'[...共{len(value)}项]'
+            truncated_list = [self._truncate_value(item, str_len, item_count, depth - 1) for item in value[:item_count]]
+            if len(value) > item_count:
+                truncated_list.append(f'...共{len(value)}项')
+            return truncated_list
+        return value
+
+    def _dump_value(self, value: Any) -> str:
+        """
+        序列化日志参数
 
-        return json.dumps(params, ensure_ascii=False, indent=2) if params else ''
+        :param value: 日志参数
+        :return: 序列化后的字符串
+        """
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def _dump_with_limit(self, value: Any, max_length: int, overflow_text: str, truncate_first: bool = False) -> str:
+        """
+        序列化日志参数，超出日志表字段长度时逐步收紧截断规则
+
+        :param value: 日志参数
+        :param max_length: 日志表字段长度
+        :param overflow_text: 截断后仍超出字段长度时记录的提示信息
+        :param truncate_first: 是否直接按结构截断后再序列化，避免序列化完整的大对象
+        :return: 序列化后的字符串
+        """
+        dumped = None if truncate_first else self._dump_value(value)
+        str_len, item_count, depth = self._param_str_len, self._param_item_count, self._param_depth
+        while (dumped is None or len(dumped) > max_length) and str_len > 1:
+            dumped = self._dump_value(self._truncate_value(value, str_len, item_count, depth))
+            str_len, item_count, depth = str_len // 2, max(item_count // 2, 1), max(depth - 1, 1)
+        if len(dumped) > max_length:
+            dumped = overflow_text
+
+        return dumped
+
+    def _dump_request_params(self, params: dict) -> str:
+        """
+        序列化请求参数，日志表请求参数字段长度最大为2000，超出时按结构截断
+
+        :param params: 请求参数
+        :return: 序列化后的请求参数字符串
+        """
+        return self._dump_with_limit(params, self._oper_param_len, '请求参数过长')
+
+    def _get_json_result(self, result_dict: dict) -> str:
+        """
+        根据返回参数记录策略获取返回参数
+
+        :param result_dict: 操作结果字典
+        :return: 序列化后的返回参数字符串
+        """
+        if self.result_capture == 'none':
+            return ''
+        if self.result_capture == 'status':
+            result_dict = {key: result_dict[key] for key in ('code', 'msg', 'message') if key in result_dict}
+
+        return self._dump_with_limit(
+            result_dict, self._json_result_len, '返回参数过长', truncate_first=self.result_capture == 'truncated'
+        )
+
+    async def _run_after_response(self, result: Any, log_task: Callable[[], Awaitable[None]]) -> None:
+        """
+        将日志记录任务追加到响应的后台任务中，在响应发送完成后执行，非Response对象的结果则立即执行
+
+        :param result: 操作结果
+        :param log_task: 日志记录任务
+        :return: None
+        """
+
+        async def safe_log_task() -> None:
+            try:
+                await log_task()
+            except Exception as e:
+                logger.exception(f'记录{self.title}日志失败：{e}')
+
+        if isinstance(result, Response):
+            background_tasks = BackgroundTasks()
+            if result.background is not None:
+                background_tasks.add_task(result.background)
+            background_tasks.add_task(safe_log_task)
+            result.background = background_tasks
+        else:
+            await safe_log_task()
 
     def _get_login_log(
-        self, user_agent: Any, oper_ip: str, oper_location: str, oper_time: datetime, origin_kwargs: dict
+        self, user_agent: Any, oper_ip: str, oper_location: str | None, oper_time: datetime, origin_kwargs: dict
     ) -> dict:
         """
         获取登录日志信息
@@ -332,7 +550,7 @@ class Log:
         :return: 操作结果字典
         """
         if isinstance(result, (JSONResponse, ORJSONResponse, UJSONResponse)):
-            result_dict = json.loads(str(result.body, 'utf-8'))
+            result_dict = orjson.loads(result.body)
         elif request_from_swagger or request_from_redoc:
             result_dict = {}
         elif result.status_code == HTTP_200_OK:
@@ -343,31 +561,6 @@ class Log:
         return result_dict
 
 
-@alru_cache()
-async def get_ip_location(oper_ip: str) -> str:
-    """
-    查询ip归属区域
-
-    :param oper_ip: 需要查询的ip
-    :return: ip归属区域
-    """
-    oper_location = '内网IP'
-    try:
-        if oper_ip not in ['127.0.0.1', 'localhost']:
-            oper_location = '未知'
-            async with httpx.AsyncClient() as client:
-                ip_result = await client.get(f'https://qifu-api.baidubce.com/ip/geo/v1/district?ip={oper_ip}')
-                if ip_result.status_code == HTTP_200_OK:
-                    prov = ip_result.json().get('data', {}).get('prov')
-                    city = ip_result.json().get('data', {}).get('city')
-                    if prov or city:
-                        oper_location = f'{prov}-{city}'
-    except Exception as e:
-        oper_location = '未知'
-        print(e)
-    return oper_location
-
-
 def get_function_parameters_name_by_type(func: Callable, param_type: Any) -> list:
     """
     获取函数指定类型的参数名称
@@ -1,10 +1,13 @@
 from fastapi import Depends, Request, params
-from sqlalchemy import ColumnElement, func, or_, select
+from sqlalchemy import ColumnElement, false, or_, true
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.context import RequestContext
 from config.database import Base
-from module_admin.entity.do.dept_do import SysDept
-from module_admin.entity.do.role_do import SysRoleDept
+from config.get_db import get_db
+from module_admin.dao.dept_dao import DeptDao
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from utils.dependency_util import DependencyUtil
 
 
@@ -18,6 +21,8 @@ class GetDataScope:
     DATA_SCOPE_DEPT = '3'
     DATA_SCOPE_DEPT_AND_CHILD = '4'
     DATA_SCOPE_SELF = '5'
+    # 可见部门数量超过该值时改用子查询过滤，避免IN列表的绑定参数数量超出数据库驱动限制
+    DEPT_ID_IN_LIST_MAX_SIZE = 2000
 
     def __init__(
         self,
@@ -36,65 +41,99 @@ class GetDataScope:
         self.user_alias = user_alias
         self.dept_alias = dept_alias
 
-    def __call__(self, request: Request) -> ColumnElement:
+    async def __call__(self, request: Request, query_db: AsyncSession = Depends(get_db)) -> ColumnElement:
         DependencyUtil.check_exclude_routes(request, err_msg='当前路由不在认证规则内，不可使用GetDataScope依赖项')
         current_user = RequestContext.get_current_user()
         user_id = current_user.user.user_id
-        dept_id = current_user.user.dept_id
-        custom_data_scope_role_id_list = [
-            item.role_id for item in current_user.user.role if item.data_scope == self.DATA_SCOPE_CUSTOM
-        ]
+        if current_user.user.admin or any(role.data_scope == self.DATA_SCOPE_ALL for role in current_user.user.role):
+            return true()
+        dept_id_list = await self.get_visible_dept_ids(request, query_db, current_user)
         param_sql_list = []
-        for role in current_user.user.role:
-            if current_user.user.admin or role.data_scope == self.DATA_SCOPE_ALL:
-                param_sql_list = [True]
-                break
-            if role.data_scope == self.DATA_SCOPE_CUSTOM:
-                if len(custom_data_scope_role_id_list) > 1:
-                    param_sql_list.append(
-                        getattr(self.query_alias, self.dept_alias).in_(
-                            select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_(custom_data_scope_role_id_list))
-                        )
-                        if hasattr(self.query_alias, self.dept_alias)
-                        else False
-                    )
-                else:
-                    param_sql_list.append(
-                        getattr(self.query_alias, self.dept_alias).in_(
-                            select(SysRoleDept.dept_id).where(SysRoleDept.role_id == role.role_id)
-                        )
-                        if hasattr(self.query_alias, self.dept_alias)
-                        else False
-                    )
-            elif role.data_scope == self.DATA_SCOPE_DEPT:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.dept_alias) == dept_id
-                    if hasattr(self.query_alias, self.dept_alias)
-                    else False
-                )
-            elif role.data_scope == self.DATA_SCOPE_DEPT_AND_CHILD:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.dept_alias).in_(
-                        select(SysDept.dept_id).where(
-                            or_(SysDept.dept_id == dept_id, func.find_in_set(dept_id, SysDept.ancestors))
-                        )
-                    )
-                    if hasattr(self.query_alias, self.dept_alias)
-                    else False
-                )
-            elif role.data_scope == self.DATA_SCOPE_SELF:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.user_alias) == user_id
-                    if hasattr(self.query_alias, self.user_alias)
-                    else False
-                )
+        if dept_id_list and hasattr(self.query_alias, self.dept_alias):
+            dept_column = getattr(self.query_alias, self.dept_alias)
+            if len(dept_id_list) > self.DEPT_ID_IN_LIST_MAX_SIZE:
+                param_sql_list.append(self.get_visible_dept_sql(dept_column, current_user))
             else:
-                param_sql_list.append(False)
-        param_sql_list = list(dict.fromkeys(param_sql_list))
-        param_sql = or_(*param_sql_list)
+                param_sql_list.append(dept_column.in_(sorted(dept_id_list)))
+        if any(role.data_scope == self.DATA_SCOPE_SELF for role in current_user.user.role) and hasattr(
+            self.query_alias, self.user_alias
+        ):
+            param_sql_list.append(getattr(self.query_alias, self.user_alias) == user_id)
+        param_sql = or_(*param_sql_list) if param_sql_list else false()
 
         return param_sql
 
+    @classmethod
+    def _get_dept_scope_params(cls, current_user: CurrentUserModel) -> tuple[list[int], int | None, int | None]:
+        """
+        根据当前用户角色的数据权限范围获取计算可见部门所需的参数
+
+        :param current_user: 当前用户对象
+        :return: 自定义数据权限的角色id列表、需要包含本部门及以下部门的部门id、需要包含本部门的部门id
+        """
+        role_list = current_user.user.role
+        dept_id = current_user.user.dept_id
+        custom_role_id_list = [role.role_id for role in role_list if role.data_scope == cls.DATA_SCOPE_CUSTOM]
+        dept_and_child = any(role.data_scope == cls.DATA_SCOPE_DEPT_AND_CHILD for role in role_list)
+        dept_only = any(role.data_scope == cls.DATA_SCOPE_DEPT for role in role_list)
+
+        return (
+            custom_role_id_list,
+            dept_id if dept_and_child else None,
+            dept_id if dept_only else None,
+        )
+
+    @classmethod
+    def get_visible_dept_sql(cls, dept_column: ColumnElement, current_user: CurrentUserModel) -> ColumnElement:
+        """
+        获取以子查询表示的数据权限可见部门过滤条件，通过闭包表及角色部门关联表在数据库中计算可见部门
+
+        :param dept_column: 部门id字段
+        :param current_user: 当前用户对象
+        :return: 可见部门过滤条件
+        """
+        custom_role_id_list, child_dept_id, self_dept_id = cls._get_dept_scope_params(current_user)
+        param_sql_list = []
+        dept_id_query = DeptDao.get_data_scope_dept_id_query(custom_role_id_list, child_dept_id)
+        if dept_id_query is not None:
+            param_sql_list.append(dept_column.in_(dept_id_query))
+        if self_dept_id is not None:
+            param_sql_list.append(dept_column == self_dept_id)
+
+        return or_(*param_sql_list) if param_sql_list else false()
+
+    @classmethod
+    async def get_visible_dept_ids(
+        cls, request: Request, query_db: AsyncSession, current_user: CurrentUserModel
+    ) -> frozenset[int]:
+        """
+        获取当前用户数据权限可见的部门id集合，按用户id及权限版本戳缓存，角色或部门变更后自动失效
+
+        :param request: Request对象
+        :param query_db: orm对象
+        :param current_user: 当前用户对象
+        :return: 可见部门id集合
+        """
+        user_id = current_user.user.user_id
+        permission_stamp = RequestContext.get_current_permission_stamp()
+        if permission_stamp is not None:
+            dept_id_list = await PrincipalCacheService.get_data_scope_dept_ids(
+                request.app.state.redis, user_id, permission_stamp
+            )
+            if dept_id_list is not None:
+                return dept_id_list
+        custom_role_id_list, child_dept_id, self_dept_id = cls._get_dept_scope_params(current_user)
+        dept_id_list = await DeptDao.get_data_scope_dept_ids_dao(query_db, custom_role_id_list, child_dept_id)
+        if self_dept_id is not None:
+            dept_id_list.add(self_dept_id)
+        dept_id_list = frozenset(dept_id_list)
+        if permission_stamp is not None:
+            await PrincipalCacheService.set_data_scope_dept_ids(
+                request.app.state.redis, user_id, permission_stamp, dept_id_list
+            )
+
+        return dept_id_list
+
 
 def DataScopeDependency(  # noqa: N802
     query_alias: Base,
@@ -25,16 +25,13 @@ class CheckUserInterfaceAuth:
             request, err_msg='当前路由不在认证规则内，不可使用CheckUserInterfaceAuth依赖项'
         )
         current_user = RequestContext.get_current_user()
-        user_auth_list = current_user.permissions
-        if '*:*:*' in user_auth_list:
-            return True
-        if isinstance(self.perm, str) and self.perm in user_auth_list:
+        if isinstance(self.perm, str) and current_user.has_permission(self.perm):
             return True
         if isinstance(self.perm, list):
             if self.is_strict:
-                if all(perm_str in user_auth_list for perm_str in self.perm):
+                if all(current_user.has_permission(perm_str) for perm_str in self.perm):
                     return True
-            elif any(perm_str in user_auth_list for perm_str in self.perm):
+            elif any(current_user.has_permission(perm_str) for perm_str in self.perm):
                 return True
         raise PermissionException(data='', message='该用户无此接口权限')
 
@@ -59,15 +56,13 @@ class CheckRoleInterfaceAuth:
             request, err_msg='当前路由不在认证规则内，不可使用CheckRoleInterfaceAuth依赖项'
         )
         current_user = RequestContext.get_current_user()
-        user_role_list = current_user.user.role
-        user_role_key_list = [role.role_key for role in user_role_list]
-        if isinstance(self.role_key, str) and self.role_key in user_role_key_list:
+        if isinstance(self.role_key, str) and current_user.has_role(self.role_key):
             return True
         if isinstance(self.role_key, list):
             if self.is_strict:
-                if all(role_key_str in user_role_key_list for role_key_str in self.role_key):
+                if all(current_user.has_role(role_key_str) for role_key_str in self.role_key):
                     return True
-            elif any(role_key_str in user_role_key_list for role_key_str in self.role_key):
+            elif any(current_user.has_role(role_key_str) for role_key_str in self.role_key):
                 return True
         raise PermissionException(data='', message='该用户无此接口权限')
 
@@ -18,6 +18,7 @@ class CommonConstant:
     DEPT_DISABLE: 部门停用状态
     UNIQUE: 校验是否唯一的返回标识（是）
     NOT_UNIQUE: 校验是否唯一的返回标识（否）
+    PAGE_COUNT_LIMIT: 大表分页查询总数统计上限
     """
 
     PASSWORD_ERROR_COUNT = 5
@@ -33,6 +34,7 @@ class CommonConstant:
     DEPT_DISABLE = '1'
     UNIQUE = True
     NOT_UNIQUE = False
+    PAGE_COUNT_LIMIT = 100000
 
 
 class HttpStatusConstant:
@@ -133,6 +135,76 @@ class JobConstant:
     JOB_WHITE_LIST = ['module_task']
 
 
+class CacheConstant:
+    """
+    缓存常量
+
+    PRINCIPAL_LOCAL_CACHE_SIZE: 进程内用户认证信息缓存最大条目数
+    PRINCIPAL_LOCAL_CACHE_TTL: 进程内用户认证信息缓存过期时间（秒）
+    PRINCIPAL_REDIS_CACHE_TTL: Redis用户认证信息缓存过期时间（秒）
+    DATA_SCOPE_LOCAL_CACHE_SIZE: 进程内数据权限部门缓存最大条目数
+    DATA_SCOPE_LOCAL_CACHE_TTL: 进程内数据权限部门缓存过期时间（秒）
+    DATA_SCOPE_REDIS_CACHE_TTL: Redis数据权限部门缓存过期时间（秒）
+    ROUTER_LOCAL_CACHE_SIZE: 进程内角色组合路由缓存最大条目数
+    ROUTER_LOCAL_CACHE_TTL: 进程内角色组合路由缓存过期时间（秒）
+    ROUTER_REDIS_CACHE_TTL: Redis角色组合路由缓存过期时间（秒）
+    ROLE_MENU_INDEX_LOCAL_CACHE_SIZE: 进程内角色菜单位图索引缓存最大条目数
+    ROLE_MENU_INDEX_LOCAL_CACHE_TTL: 进程内角色菜单位图索引缓存过期时间（秒）
+    ROLE_MENU_INDEX_REDIS_CACHE_TTL: Redis角色菜单位图索引缓存过期时间（秒）
+    CACHE_KEY_PAGE_SIZE: 缓存监控每页获取的缓存键数量
+    SYS_CACHE_LOCAL_SIZE: 进程内字典及参数配置缓存每个命名空间的最大条目数
+    SYS_CACHE_LOCAL_TTL: 进程内字典及参数配置缓存过期时间（秒）
+    SYS_CACHE_INVALIDATE_CHANNEL: 字典及参数配置缓存失效通知频道
+    """
+
+    PRINCIPAL_LOCAL_CACHE_SIZE = 4096
+    PRINCIPAL_LOCAL_CACHE_TTL = 60
+    PRINCIPAL_REDIS_CACHE_TTL = 1800
+    DATA_SCOPE_LOCAL_CACHE_SIZE = 4096
+    DATA_SCOPE_LOCAL_CACHE_TTL = 60
+    DATA_SCOPE_REDIS_CACHE_TTL = 1800
+    ROUTER_LOCAL_CACHE_SIZE = 1024
+    ROUTER_LOCAL_CACHE_TTL = 300
+    ROUTER_REDIS_CACHE_TTL = 1800
+    ROLE_MENU_INDEX_LOCAL_CACHE_SIZE = 4
+    ROLE_MENU_INDEX_LOCAL_CACHE_TTL = 300
+    ROLE_MENU_INDEX_REDIS_CACHE_TTL = 1800
+    CACHE_KEY_PAGE_SIZE = 500
+    SYS_CACHE_LOCAL_SIZE = 4096
+    SYS_CACHE_LOCAL_TTL = 300
+    SYS_CACHE_INVALIDATE_CHANNEL = 'sys_cache:invalidate'
+
+
+class AsyncTaskConstant:
+    """
+    异步任务常量
+
+    TYPE_EXPORT: 导出任务
+    TYPE_IMPORT: 导入任务
+    STATUS_PENDING: 排队中
+    STATUS_RUNNING: 执行中
+    STATUS_SUCCESS: 执行成功
+    STATUS_FAILURE: 执行失败
+    WORKER_COUNT: 每个应用进程执行任务的协程数量
+    QUEUE_SIZE: 每个应用进程排队任务数量上限
+    EXPIRE_SECONDS: 任务信息及结果文件保留时间（秒）
+    USER_TASK_LIMIT: 每个用户保留的最近任务数量
+    FILE_PREFIX: 任务结果文件名前缀
+    """
+
+    TYPE_EXPORT = 'export'
+    TYPE_IMPORT = 'import'
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCESS = 'success'
+    STATUS_FAILURE = 'failure'
+    WORKER_COUNT = 2
+    QUEUE_SIZE = 100
+    EXPIRE_SECONDS = 86400
+    USER_TASK_LIMIT = 50
+    FILE_PREFIX = 'async_task_'
+
+
 class LockConstant:
     """
     分布式锁常量
@@ -1,17 +1,16 @@
-import re
 from contextvars import ContextVar, Token
-from typing import Literal
 
 from exceptions.exception import LoginException
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from utils.route_util import ExcludeRouteMatcher
 
 # 定义上下文变量
-# 存储当前请求的编译后的排除路由模式列表
-current_exclude_patterns: ContextVar[
-    list[dict[str, str | list[Literal['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']] | re.Pattern]] | None
-] = ContextVar('current_exclude_patterns', default=None)
+# 存储当前请求的排除路由匹配器
+current_exclude_matcher: ContextVar[ExcludeRouteMatcher | None] = ContextVar('current_exclude_matcher', default=None)
 # 存储当前用户信息
 current_user: ContextVar[CurrentUserModel | None] = ContextVar('current_user', default=None)
+# 存储当前用户的权限版本戳
+current_permission_stamp: ContextVar[str | None] = ContextVar('current_permission_stamp', default=None)
 
 
 class RequestContext:
@@ -20,32 +19,23 @@ class RequestContext:
     """
 
     @staticmethod
-    def set_current_exclude_patterns(
-        exclude_patterns: list[
-            dict[str, str | list[Literal['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']] | re.Pattern]
-        ],
-    ) -> Token:
+    def set_current_exclude_matcher(exclude_matcher: ExcludeRouteMatcher) -> Token:
         """
-        设置当前请求的编译后的排除路由模式列表
+        设置当前请求的排除路由匹配器
 
-        :param exclude_patterns: 编译后的排除路由模式列表
+        :param exclude_matcher: 排除路由匹配器
         :return: 上下文变量令牌，用于重置
         """
-        return current_exclude_patterns.set(exclude_patterns)
+        return current_exclude_matcher.set(exclude_matcher)
 
     @staticmethod
-    def get_current_exclude_patterns() -> list[
-        dict[str, str | list[Literal['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']] | re.Pattern]
-    ]:
+    def get_current_exclude_matcher() -> ExcludeRouteMatcher | None:
         """
-        获取当前请求的编译后的排除路由模式列表
+        获取当前请求的排除路由匹配器
 
-        :return: 编译后的排除路由模式列表
+        :return: 排除路由匹配器，未设置时返回None
         """
-        _exclude_patterns = current_exclude_patterns.get()
-        if _exclude_patterns is None:
-            _exclude_patterns = []
-        return _exclude_patterns
+        return current_exclude_matcher.get()
 
     @staticmethod
     def set_current_user(user: CurrentUserModel) -> Token:
@@ -70,13 +60,32 @@ class RequestContext:
         return _current_user
 
     @staticmethod
-    def reset_current_exclude_patterns(token: Token) -> None:
+    def set_current_permission_stamp(permission_stamp: str) -> Token:
         """
-        重置当前请求的编译后的排除路由模式列表
+        设置当前用户的权限版本戳
 
-        :param token: 设置编译后的排除路由模式列表时返回的令牌
+        :param permission_stamp: 权限版本戳
+        :return: 上下文变量令牌，用于重置
+        """
+        return current_permission_stamp.set(permission_stamp)
+
+    @staticmethod
+    def get_current_permission_stamp() -> str | None:
+        """
+        获取当前用户的权限版本戳
+
+        :return: 权限版本戳，未设置时返回None
+        """
+        return current_permission_stamp.get()
+
+    @staticmethod
+    def reset_current_exclude_matcher(token: Token) -> None:
+        """
+        重置当前请求的排除路由匹配器
+
+        :param token: 设置排除路由匹配器时返回的令牌
         """
-        current_exclude_patterns.reset(token)
+        current_exclude_matcher.reset(token)
 
     @staticmethod
     def reset_current_user(token: Token) -> None:
@@ -92,5 +101,6 @@ class RequestContext:
         """
         清除所有上下文变量
         """
-        current_exclude_patterns.set(None)
+        current_exclude_matcher.set(None)
         current_user.set(None)
+        current_permission_stamp.set(None)
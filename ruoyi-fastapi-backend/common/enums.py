@@ -49,3 +49,10 @@ class RedisInitKeyConfig(Enum):
     ACCOUNT_LOCK = {'key': 'account_lock', 'remark': '用户锁定'}
     PASSWORD_ERROR_COUNT = {'key': 'password_error_count', 'remark': '密码错误次数'}
     SMS_CODE = {'key': 'sms_code', 'remark': '短信验证码'}
+    USER_PRINCIPAL = {'key': 'user_principal', 'remark': '用户认证信息'}
+    PERMISSION_VERSION = {'key': 'permission_version', 'remark': '权限版本号'}
+    DATA_SCOPE_DEPT = {'key': 'data_scope_dept', 'remark': '数据权限部门'}
+    ROLE_ROUTER = {'key': 'role_router', 'remark': '角色组合路由信息'}
+    ROLE_MENU_INDEX = {'key': 'role_menu_index', 'remark': '角色菜单位图索引'}
+    ONLINE_SESSION = {'key': 'online_session', 'remark': '在线用户会话'}
+    ASYNC_TASK = {'key': 'async_task', 'remark': '异步导入导出任务'}
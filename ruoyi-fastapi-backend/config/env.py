@@ -23,10 +23,19 @@ class AppSettings(BaseSettings):
     app_reload: bool = True
     app_workers: int = 1
     app_ip_location_query: bool = True
+    app_ip_location_backend: str = 'http'
+    app_ip_location_db_path: str = 'assets/ip2region/ip2region.xdb'
+    app_ip_location_resolve_later: bool = True
+    app_ip_location_cache_size: int = 10000
+    app_ip_location_cache_ttl: int = 86400
+    app_ip_location_timeout: float = 3
+    app_ip_location_max_connections: int = 20
     app_same_time_login: bool = True
     app_demo_mode: bool = False
     app_disable_swagger: bool = False
     app_disable_redoc: bool = False
+    app_password_hash_workers: int = 4
+    app_password_hash_queue_size: int = 64
 
 
 class JwtSettings(BaseSettings):
@@ -93,6 +102,12 @@ class LogSettings(BaseSettings):
     log_stream_claim_batch_size: int = 100
     log_stream_dedup_ttl: int = 3600
     log_stream_dedup_prefix: str = 'log:dedup'
+    log_aggregator_embedded: bool = True
+    log_stream_max_consumers: int = 4
+    log_stream_max_batch_size: int = 1000
+    log_stream_scale_lag: int = 1000
+    log_stream_scale_interval_ms: int = 5000
+    log_stream_metrics_prefix: str = 'log:metrics'
 
     loguru_json: bool = False
     loguru_level: str = 'INFO'
@@ -163,12 +178,16 @@ class UploadSettings:
         'pdf',
     ]
     DOWNLOAD_PATH = 'vf_admin/download_path'
+    # 异步任务结果文件目录，只能通过异步任务结果下载接口校验任务归属后下载
+    ASYNC_TASK_PATH = 'vf_admin/async_task_path'
 
     def __init__(self) -> None:
         if not os.path.exists(self.UPLOAD_PATH):
             os.makedirs(self.UPLOAD_PATH)
         if not os.path.exists(self.DOWNLOAD_PATH):
             os.makedirs(self.DOWNLOAD_PATH)
+        if not os.path.exists(self.ASYNC_TASK_PATH):
+            os.makedirs(self.ASYNC_TASK_PATH)
 
 
 class CachePathConfig:
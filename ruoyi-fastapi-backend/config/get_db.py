@@ -3,6 +3,7 @@ from collections.abc import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.database import AsyncSessionLocal, Base, async_engine
+from module_admin.service.dept_service import DeptService
 from utils.log_util import logger
 
 
@@ -28,6 +29,23 @@ async def init_create_table() -> None:
     logger.info('✅️ 数据库连接成功')
 
 
+async def init_dept_closure() -> None:
+    """
+    应用启动时校验并重建部门闭包表，只能由持有启动锁的worker调用，避免多个worker并发重建时主键冲突。
+    重建失败时抛出异常终止启动，避免闭包表缺失导致部门数据权限查询结果为空
+
+    :return:
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            closure_count = await DeptService.init_dept_closure_services(session)
+        except Exception as e:
+            logger.error(f'❌️ 部门闭包表重建失败：{e}')
+            raise e
+        if closure_count:
+            logger.info(f'✅️ 部门闭包表重建完成，共{closure_count}条关系')
+
+
 async def close_async_engine() -> None:
     """
     应用关闭时释放数据库连接池
@@ -1,9 +1,10 @@
 from typing import Annotated
 
-from fastapi import Path, Request, Response
+from fastapi import Path, Query, Request, Response
 
 from common.aspect.interface_auth import UserInterfaceAuthDependency
 from common.aspect.pre_auth import PreAuthDependency
+from common.constant import CacheConstant
 from common.router import APIRouterPro
 from common.vo import DataResponseModel, ResponseBaseModel
 from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel
@@ -49,16 +50,25 @@ async def get_monitor_cache_name(request: Request) -> Response:
 @cache_controller.get(
     '/getKeys/{cache_name}',
     summary='获取缓存键列表接口',
-    description='用于获取指定缓存名称下的所有缓存键列表',
+    description='用于分页获取指定缓存名称下的缓存键列表，响应中的cursor为下一页游标，为0时表示已获取全部缓存键',
     response_model=DataResponseModel[list[str]],
     dependencies=[UserInterfaceAuthDependency('monitor:cache:list')],
 )
-async def get_monitor_cache_key(request: Request, cache_name: Annotated[str, Path(description='缓存名称')]) -> Response:
-    # 获取全量数据
-    cache_key_list_result = await CacheService.get_cache_monitor_cache_key_services(request, cache_name)
+async def get_monitor_cache_key(
+    request: Request,
+    cache_name: Annotated[str, Path(description='缓存名称')],
+    cursor: Annotated[int, Query(ge=0, description='游标，首页为0')] = 0,
+    page_size: Annotated[
+        int, Query(alias='pageSize', ge=1, le=10000, description='每页缓存键数量')
+    ] = CacheConstant.CACHE_KEY_PAGE_SIZE,
+) -> Response:
+    # 获取分页数据
+    next_cursor, cache_key_list_result = await CacheService.get_cache_monitor_cache_key_services(
+        request, cache_name, cursor, page_size
+    )
     logger.info('获取成功')
 
-    return ResponseUtil.success(data=cache_key_list_result)
+    return ResponseUtil.success(data=cache_key_list_result, dict_content={'cursor': next_cursor})
 
 
 @cache_controller.get(
@@ -1,12 +1,15 @@
 from typing import Annotated
+from urllib.parse import quote
 
-from fastapi import BackgroundTasks, File, Query, Request, Response, UploadFile
+from fastapi import BackgroundTasks, File, Path, Query, Request, Response, UploadFile
 from fastapi.responses import StreamingResponse
 
-from common.aspect.pre_auth import PreAuthDependency
+from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.router import APIRouterPro
-from common.vo import DynamicResponseModel
-from module_admin.entity.vo.common_vo import UploadResponseModel
+from common.vo import DataResponseModel, DynamicResponseModel
+from module_admin.entity.vo.common_vo import AsyncTaskModel, UploadResponseModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.common_service import CommonService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -50,7 +53,72 @@ async def common_download(
     download_result = await CommonService.download_services(background_tasks, file_name, delete)
     logger.info(download_result.message)
 
-    return ResponseUtil.streaming(data=download_result.result)
+    return ResponseUtil.streaming(
+        data=download_result.result, headers={'download-filename': quote(file_name.rsplit('/', 1)[-1])}
+    )
+
+
+@common_controller.get(
+    '/task/list',
+    summary='获取异步任务列表接口',
+    description='用于获取当前用户最近提交的异步导入导出任务列表',
+    response_model=DataResponseModel[list[AsyncTaskModel]],
+)
+async def get_common_task_list(
+    request: Request,
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    task_list_result = await AsyncTaskService.get_task_list_services(request.app.state.redis, current_user)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=task_list_result)
+
+
+@common_controller.get(
+    '/task/download/{task_id}',
+    summary='异步任务结果文件下载接口',
+    description='用于下载执行成功的异步导入导出任务的结果文件',
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            'description': '流式返回任务结果文件',
+            'content': {
+                'application/octet-stream': {},
+            },
+        }
+    },
+)
+async def common_task_download(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    task_id: Annotated[str, Path(description='任务ID')],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    download_result = await CommonService.download_task_result_services(
+        request, background_tasks, task_id, current_user
+    )
+    logger.info('下载成功')
+
+    return ResponseUtil.streaming(
+        data=download_result.result, headers={'download-filename': quote(download_result.message)}
+    )
+
+
+@common_controller.get(
+    '/task/{task_id}',
+    summary='获取异步任务详情接口',
+    description='用于轮询指定异步导入导出任务的状态及进度',
+    response_model=DataResponseModel[AsyncTaskModel],
+)
+async def get_common_task(
+    request: Request,
+    task_id: Annotated[str, Path(description='任务ID')],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    task_result = await AsyncTaskService.get_task_services(request.app.state.redis, task_id, current_user)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=task_result)
 
 
 @common_controller.get(
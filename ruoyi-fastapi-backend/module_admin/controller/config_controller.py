@@ -15,8 +15,8 @@ from common.router import APIRouterPro
 from common.vo import DataResponseModel, PageResponseModel, ResponseBaseModel
 from module_admin.entity.vo.config_vo import ConfigModel, ConfigPageQueryModel, DeleteConfigModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.config_service import ConfigService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -182,10 +182,26 @@ async def export_system_config_list(
     request: Request,
     config_page_query: Annotated[ConfigPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
-    config_query_result = await ConfigService.get_config_list_services(query_db, config_page_query, is_page=False)
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '参数数据导出',
+            lambda db: ConfigService.get_config_list_services(db, config_page_query, is_page=False, is_stream=True),
+            ConfigService.export_config_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
+    config_query_result = await ConfigService.get_config_list_services(
+        query_db, config_page_query, is_page=False, is_stream=True
+    )
     config_export_result = await ConfigService.export_config_list_services(config_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(config_export_result))
+    return ResponseUtil.streaming(data=config_export_result)
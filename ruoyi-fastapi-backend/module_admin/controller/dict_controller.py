@@ -22,8 +22,8 @@ from module_admin.entity.vo.dict_vo import (
     DictTypePageQueryModel,
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.dict_service import DictDataService, DictTypeService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -191,15 +191,31 @@ async def export_system_dict_type_list(
     request: Request,
     dict_type_page_query: Annotated[DictTypePageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '字典类型数据导出',
+            lambda db: DictTypeService.get_dict_type_list_services(
+                db, dict_type_page_query, is_page=False, is_stream=True
+            ),
+            DictTypeService.export_dict_type_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
     dict_type_query_result = await DictTypeService.get_dict_type_list_services(
-        query_db, dict_type_page_query, is_page=False
+        query_db, dict_type_page_query, is_page=False, is_stream=True
     )
     dict_type_export_result = await DictTypeService.export_dict_type_list_services(dict_type_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(dict_type_export_result))
+    return ResponseUtil.streaming(data=dict_type_export_result)
 
 
 @dict_controller.get(
@@ -349,12 +365,28 @@ async def export_system_dict_data_list(
     request: Request,
     dict_data_page_query: Annotated[DictDataPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '字典数据数据导出',
+            lambda db: DictDataService.get_dict_data_list_services(
+                db, dict_data_page_query, is_page=False, is_stream=True
+            ),
+            DictDataService.export_dict_data_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
     dict_data_query_result = await DictDataService.get_dict_data_list_services(
-        query_db, dict_data_page_query, is_page=False
+        query_db, dict_data_page_query, is_page=False, is_stream=True
     )
     dict_data_export_result = await DictDataService.export_dict_data_list_services(dict_data_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(dict_data_export_result))
+    return ResponseUtil.streaming(data=dict_data_export_result)
@@ -23,9 +23,9 @@ from module_admin.entity.vo.job_vo import (
     JobPageQueryModel,
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.job_log_service import JobLogService
 from module_admin.service.job_service import JobService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -205,13 +205,27 @@ async def export_system_job_list(
     request: Request,
     job_page_query: Annotated[JobPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
-    job_query_result = await JobService.get_job_list_services(query_db, job_page_query, is_page=False)
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '定时任务数据导出',
+            lambda db: JobService.get_job_list_services(db, job_page_query, is_page=False, is_stream=True),
+            lambda batches: JobService.export_job_list_services(request, batches),
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
+    job_query_result = await JobService.get_job_list_services(query_db, job_page_query, is_page=False, is_stream=True)
     job_export_result = await JobService.export_job_list_services(request, job_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(job_export_result))
+    return ResponseUtil.streaming(data=job_export_result)
 
 
 @job_controller.get(
@@ -293,10 +307,26 @@ async def export_system_job_log_list(
     request: Request,
     job_log_page_query: Annotated[JobLogPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
-    job_log_query_result = await JobLogService.get_job_log_list_services(query_db, job_log_page_query, is_page=False)
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '定时任务调度日志数据导出',
+            lambda db: JobLogService.get_job_log_list_services(db, job_log_page_query, is_page=False, is_stream=True),
+            lambda batches: JobLogService.export_job_log_list_services(request, batches),
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
+    job_log_query_result = await JobLogService.get_job_log_list_services(
+        query_db, job_log_page_query, is_page=False, is_stream=True
+    )
     job_log_export_result = await JobLogService.export_job_log_list_services(request, job_log_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(job_log_export_result))
+    return ResponseUtil.streaming(data=job_log_export_result)
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from common.annotation.log_annotation import Log
 from common.aspect.db_seesion import DBSessionDependency
 from common.aspect.interface_auth import UserInterfaceAuthDependency
-from common.aspect.pre_auth import PreAuthDependency
+from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
 from common.vo import PageResponseModel, ResponseBaseModel
@@ -20,8 +20,9 @@ from module_admin.entity.vo.log_vo import (
     OperLogPageQueryModel,
     UnlockUser,
 )
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.log_service import LoginLogService, OperationLogService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -110,17 +111,33 @@ async def export_system_operation_log_list(
     request: Request,
     operation_log_page_query: Annotated[OperLogPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '操作日志数据导出',
+            lambda db: OperationLogService.get_operation_log_list_services(
+                db, operation_log_page_query, is_page=False, is_stream=True
+            ),
+            lambda batches: OperationLogService.export_operation_log_list_services(request, batches),
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
     operation_log_query_result = await OperationLogService.get_operation_log_list_services(
-        query_db, operation_log_page_query, is_page=False
+        query_db, operation_log_page_query, is_page=False, is_stream=True
     )
     operation_log_export_result = await OperationLogService.export_operation_log_list_services(
         request, operation_log_query_result
     )
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(operation_log_export_result))
+    return ResponseUtil.streaming(data=operation_log_export_result)
 
 
 @log_controller.get(
@@ -221,12 +238,28 @@ async def export_system_login_log_list(
     request: Request,
     login_log_page_query: Annotated[LoginLogPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '登录日志数据导出',
+            lambda db: LoginLogService.get_login_log_list_services(
+                db, login_log_page_query, is_page=False, is_stream=True
+            ),
+            LoginLogService.export_login_log_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
     login_log_query_result = await LoginLogService.get_login_log_list_services(
-        query_db, login_log_page_query, is_page=False
+        query_db, login_log_page_query, is_page=False, is_stream=True
     )
     login_log_export_result = await LoginLogService.export_login_log_list_services(login_log_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(login_log_export_result))
+    return ResponseUtil.streaming(data=login_log_export_result)
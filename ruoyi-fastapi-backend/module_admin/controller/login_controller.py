@@ -15,7 +15,9 @@ from common.vo import CrudResponseModel, DataResponseModel, DynamicResponseModel
 from config.env import AppConfig, JwtConfig
 from module_admin.entity.vo.login_vo import LoginToken, RouterModel, Token, UserLogin, UserRegister
 from module_admin.entity.vo.user_vo import CurrentUserModel, EditUserModel
+from module_admin.service.config_service import ConfigService
 from module_admin.service.login_service import CustomOAuth2PasswordRequestForm, LoginService, oauth2_scheme
+from module_admin.service.online_service import OnlineService
 from module_admin.service.user_service import UserService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -36,7 +38,8 @@ async def login(
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
     captcha_enabled = (
-        await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled') == 'true'
+        await ConfigService.query_config_list_from_cache_services(request.app.state.redis, 'sys.account.captchaEnabled')
+        == 'true'
     )
     user = UserLogin(
         userName=form_data.username,
@@ -59,21 +62,29 @@ async def login(
         },
         expires_delta=access_token_expires,
     )
-    if AppConfig.app_same_time_login:
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
-    else:
-        # 此方法可实现同一账号同一时间只能登录一次
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{result[0].user_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
+    # 不允许同一账号同时登录时以用户id作为会话编号，可实现同一账号同一时间只能登录一次
+    token_id = session_id if AppConfig.app_same_time_login else str(result[0].user_id)
+    login_info = user.login_info or {}
+    await request.app.state.redis.set(
+        f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}',
+        access_token,
+        ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+    )
+    await OnlineService.register_session(
+        request.app.state.redis,
+        token_id,
+        {
+            'user_name': result[0].user_name,
+            'dept_name': result[1].dept_name if result[1] else None,
+            'ipaddr': login_info.get('ipaddr'),
+            'login_location': login_info.get('loginLocation'),
+            'browser': login_info.get('browser'),
+            'os': login_info.get('os'),
+            'login_time': login_info.get('loginTime'),
+        },
+    )
     await UserService.edit_user_services(
-        query_db, EditUserModel(userId=result[0].user_id, loginDate=datetime.now(), type='status')
+        request, query_db, EditUserModel(userId=result[0].user_id, loginDate=datetime.now(), type='status')
     )
     logger.info('登录成功')
     # 判断请求是否来自于api文档，如果是返回指定格式的结果，用于修复api文档认证成功后token显示undefined的bug
@@ -110,7 +121,7 @@ async def get_login_user_routers(
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
     logger.info('获取成功')
-    user_routers = await LoginService.get_current_user_routers(current_user.user.user_id, query_db)
+    user_routers = await LoginService.get_current_user_routers(request, current_user, query_db)
 
     return ResponseUtil.success(data=user_routers)
 
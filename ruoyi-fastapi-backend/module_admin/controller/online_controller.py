@@ -9,8 +9,8 @@ from common.aspect.interface_auth import UserInterfaceAuthDependency
 from common.aspect.pre_auth import PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
-from common.vo import ResponseBaseModel
-from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlinePageResponseModel, OnlineQueryModel
+from common.vo import PageResponseModel, ResponseBaseModel
+from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineModel, OnlinePageQueryModel
 from module_admin.service.online_service import OnlineService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -24,20 +24,18 @@ online_controller = APIRouterPro(
     '/list',
     summary='获取在线用户分页列表接口',
     description='用于获取在线用户分页列表',
-    response_model=OnlinePageResponseModel,
+    response_model=PageResponseModel[OnlineModel],
     dependencies=[UserInterfaceAuthDependency('monitor:online:list')],
 )
 async def get_monitor_online_list(
     request: Request,
-    online_page_query: Annotated[OnlineQueryModel, Query()],
+    online_page_query: Annotated[OnlinePageQueryModel, Query()],
 ) -> Response:
-    # 获取全量数据
-    online_query_result = await OnlineService.get_online_list_services(request, online_page_query)
+    # 获取分页数据
+    online_page_query_result = await OnlineService.get_online_list_services(request, online_page_query)
     logger.info('获取成功')
 
-    return ResponseUtil.success(
-        model_content=OnlinePageResponseModel(rows=online_query_result, total=len(online_query_result))
-    )
+    return ResponseUtil.success(model_content=online_page_query_result)
 
 
 @online_controller.delete(
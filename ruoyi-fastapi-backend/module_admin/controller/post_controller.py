@@ -15,8 +15,8 @@ from common.router import APIRouterPro
 from common.vo import DataResponseModel, PageResponseModel, ResponseBaseModel
 from module_admin.entity.vo.post_vo import DeletePostModel, PostModel, PostPageQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.post_service import PostService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -86,7 +86,7 @@ async def edit_system_post(
 ) -> Response:
     edit_post.update_by = current_user.user.user_name
     edit_post.update_time = datetime.now()
-    edit_post_result = await PostService.edit_post_services(query_db, edit_post)
+    edit_post_result = await PostService.edit_post_services(request, query_db, edit_post)
     logger.info(edit_post_result.message)
 
     return ResponseUtil.success(msg=edit_post_result.message)
@@ -150,10 +150,26 @@ async def export_system_post_list(
     request: Request,
     post_page_query: Annotated[PostPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
-    post_query_result = await PostService.get_post_list_services(query_db, post_page_query, is_page=False)
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '岗位数据导出',
+            lambda db: PostService.get_post_list_services(db, post_page_query, is_page=False, is_stream=True),
+            PostService.export_post_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
+    post_query_result = await PostService.get_post_list_services(
+        query_db, post_page_query, is_page=False, is_stream=True
+    )
     post_export_result = await PostService.export_post_list_services(post_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(post_export_result))
+    return ResponseUtil.streaming(data=post_export_result)
@@ -26,10 +26,10 @@ from module_admin.entity.vo.role_vo import (
     RolePageQueryModel,
 )
 from module_admin.entity.vo.user_vo import CrudUserRoleModel, CurrentUserModel, UserInfoModel, UserRolePageQueryModel
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.dept_service import DeptService
 from module_admin.service.role_service import RoleService
 from module_admin.service.user_service import UserService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -99,7 +99,7 @@ async def add_system_role(
     add_role.create_time = datetime.now()
     add_role.update_by = current_user.user.user_name
     add_role.update_time = datetime.now()
-    add_role_result = await RoleService.add_role_services(query_db, add_role)
+    add_role_result = await RoleService.add_role_services(request, query_db, add_role)
     logger.info(add_role_result.message)
 
     return ResponseUtil.success(msg=add_role_result.message)
@@ -126,7 +126,7 @@ async def edit_system_role(
         await RoleService.check_role_data_scope_services(query_db, str(edit_role.role_id), data_scope_sql)
     edit_role.update_by = current_user.user.user_name
     edit_role.update_time = datetime.now()
-    edit_role_result = await RoleService.edit_role_services(query_db, edit_role)
+    edit_role_result = await RoleService.edit_role_services(request, query_db, edit_role)
     logger.info(edit_role_result.message)
 
     return ResponseUtil.success(msg=edit_role_result.message)
@@ -158,7 +158,7 @@ async def edit_system_role_datascope(
         updateBy=current_user.user.user_name,
         updateTime=datetime.now(),
     )
-    role_data_scope_result = await RoleService.role_datascope_services(query_db, edit_role)
+    role_data_scope_result = await RoleService.role_datascope_services(request, query_db, edit_role)
     logger.info(role_data_scope_result.message)
 
     return ResponseUtil.success(msg=role_data_scope_result.message)
@@ -186,7 +186,7 @@ async def delete_system_role(
             if not current_user.user.admin:
                 await RoleService.check_role_data_scope_services(query_db, role_id, data_scope_sql)
     delete_role = DeleteRoleModel(roleIds=role_ids, updateBy=current_user.user.user_name, updateTime=datetime.now())
-    delete_role_result = await RoleService.delete_role_services(query_db, delete_role)
+    delete_role_result = await RoleService.delete_role_services(request, query_db, delete_role)
     logger.info(delete_role_result.message)
 
     return ResponseUtil.success(msg=delete_role_result.message)
@@ -235,15 +235,31 @@ async def export_system_role_list(
     role_page_query: Annotated[RolePageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
     data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysDept)],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '角色数据导出',
+            lambda db: RoleService.get_role_list_services(
+                db, role_page_query, data_scope_sql, is_page=False, is_stream=True
+            ),
+            RoleService.export_role_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
     role_query_result = await RoleService.get_role_list_services(
-        query_db, role_page_query, data_scope_sql, is_page=False
+        query_db, role_page_query, data_scope_sql, is_page=False, is_stream=True
     )
     role_export_result = await RoleService.export_role_list_services(role_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(role_export_result))
+    return ResponseUtil.streaming(data=role_export_result)
 
 
 @role_controller.put(
@@ -271,7 +287,7 @@ async def reset_system_role_status(
         updateTime=datetime.now(),
         type='status',
     )
-    edit_role_result = await RoleService.edit_role_services(query_db, edit_role)
+    edit_role_result = await RoleService.edit_role_services(request, query_db, edit_role)
     logger.info(edit_role_result.message)
 
     return ResponseUtil.success(msg=edit_role_result.message)
@@ -336,7 +352,7 @@ async def add_system_role_user(
 ) -> Response:
     if not current_user.user.admin:
         await RoleService.check_role_data_scope_services(query_db, str(add_role_user.role_id), data_scope_sql)
-    add_role_user_result = await UserService.add_user_role_services(query_db, add_role_user)
+    add_role_user_result = await UserService.add_user_role_services(request, query_db, add_role_user)
     logger.info(add_role_user_result.message)
 
     return ResponseUtil.success(msg=add_role_user_result.message)
@@ -355,7 +371,7 @@ async def cancel_system_role_user(
     cancel_user_role: CrudUserRoleModel,
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    cancel_user_role_result = await UserService.delete_user_role_services(query_db, cancel_user_role)
+    cancel_user_role_result = await UserService.delete_user_role_services(request, query_db, cancel_user_role)
     logger.info(cancel_user_role_result.message)
 
     return ResponseUtil.success(msg=cancel_user_role_result.message)
@@ -374,7 +390,9 @@ async def batch_cancel_system_role_user(
     batch_cancel_user_role: Annotated[CrudUserRoleModel, Query()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    batch_cancel_user_role_result = await UserService.delete_user_role_services(query_db, batch_cancel_user_role)
+    batch_cancel_user_role_result = await UserService.delete_user_role_services(
+        request, query_db, batch_cancel_user_role
+    )
     logger.info(batch_cancel_user_role_result.message)
 
     return ResponseUtil.success(msg=batch_cancel_user_role_result.message)
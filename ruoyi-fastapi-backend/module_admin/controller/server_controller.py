@@ -4,7 +4,8 @@ from common.aspect.interface_auth import UserInterfaceAuthDependency
 from common.aspect.pre_auth import PreAuthDependency
 from common.router import APIRouterPro
 from common.vo import DataResponseModel
-from module_admin.entity.vo.server_vo import ServerMonitorModel
+from module_admin.entity.vo.server_vo import LogAggregatorMetricsModel, ServerMonitorModel
+from module_admin.service.log_service import LogAggregatorService
 from module_admin.service.server_service import ServerService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -27,3 +28,17 @@ async def get_monitor_server_info(request: Request) -> Response:
     logger.info('获取成功')
 
     return ResponseUtil.success(data=server_info_query_result)
+
+
+@server_controller.get(
+    '/logAggregator',
+    summary='获取日志聚合消费指标接口',
+    description='用于获取各工作进程日志聚合消费者上报的积压、吞吐量及落库耗时等指标',
+    response_model=DataResponseModel[list[LogAggregatorMetricsModel]],
+    dependencies=[UserInterfaceAuthDependency('monitor:server:list')],
+)
+async def get_log_aggregator_metrics(request: Request) -> Response:
+    log_aggregator_metrics_result = await LogAggregatorService.get_metrics(request.app.state.redis)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=log_aggregator_metrics_result)
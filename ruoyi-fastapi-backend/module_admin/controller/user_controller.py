@@ -39,6 +39,7 @@ from module_admin.entity.vo.user_vo import (
     UserRoleResponseModel,
     UserRowModel,
 )
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.dept_service import DeptService
 from module_admin.service.role_service import RoleService
 from module_admin.service.user_service import UserService
@@ -115,7 +116,7 @@ async def add_system_user(
         await RoleService.check_role_data_scope_services(
             query_db, ','.join([str(item) for item in add_user.role_ids]), role_data_scope_sql
         )
-    add_user.password = PwdUtil.get_password_hash(add_user.password)
+    add_user.password = await PwdUtil.get_password_hash(add_user.password)
     add_user.create_by = current_user.user.user_name
     add_user.create_time = datetime.now()
     add_user.update_by = current_user.user.user_name
@@ -153,7 +154,7 @@ async def edit_system_user(
         )
     edit_user.update_by = current_user.user.user_name
     edit_user.update_time = datetime.now()
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -185,7 +186,7 @@ async def delete_system_user(
             if not current_user.user.admin:
                 await UserService.check_user_data_scope_services(query_db, int(user_id), data_scope_sql)
     delete_user = DeleteUserModel(userIds=user_ids, updateBy=current_user.user.user_name, updateTime=datetime.now())
-    delete_user_result = await UserService.delete_user_services(query_db, delete_user)
+    delete_user_result = await UserService.delete_user_services(request, query_db, delete_user)
     logger.info(delete_user_result.message)
 
     return ResponseUtil.success(msg=delete_user_result.message)
@@ -211,13 +212,13 @@ async def reset_system_user_pwd(
         await UserService.check_user_data_scope_services(query_db, reset_user.user_id, data_scope_sql)
     edit_user = EditUserModel(
         userId=reset_user.user_id,
-        password=PwdUtil.get_password_hash(reset_user.password),
+        password=await PwdUtil.get_password_hash(reset_user.password),
         pwdUpdateDate=datetime.now(),
         updateBy=current_user.user.user_name,
         updateTime=datetime.now(),
         type='pwd',
     )
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -248,7 +249,7 @@ async def change_system_user_status(
         updateTime=datetime.now(),
         type='status',
     )
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -333,7 +334,7 @@ async def change_system_user_profile_avatar(
             updateTime=datetime.now(),
             type='avatar',
         )
-        edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+        edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
         logger.info(edit_user_result.message)
 
         return ResponseUtil.success(model_content=AvatarModel(imgUrl=edit_user.avatar), msg=edit_user_result.message)
@@ -363,7 +364,7 @@ async def change_system_user_profile_info(
         postIds=current_user.user.post_ids.split(',') if current_user.user.post_ids else [],
         role=current_user.user.role,
     )
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -390,7 +391,7 @@ async def reset_system_user_password(
         updateBy=current_user.user.user_name,
         updateTime=datetime.now(),
     )
-    reset_user_result = await UserService.reset_user_services(query_db, reset_user)
+    reset_user_result = await UserService.reset_user_services(request, query_db, reset_user)
     logger.info(reset_user_result.message)
 
     return ResponseUtil.success(msg=reset_user_result.message)
@@ -403,7 +404,7 @@ async def reset_system_user_password(
     response_model=ResponseBaseModel,
     dependencies=[UserInterfaceAuthDependency('system:user:import')],
 )
-@Log(title='用户管理', business_type=BusinessType.IMPORT)
+@Log(title='用户管理', business_type=BusinessType.IMPORT, is_save_request_data=False)
 async def batch_import_system_user(
     request: Request,
     file: Annotated[UploadFile, File(...)],
@@ -412,13 +413,21 @@ async def batch_import_system_user(
     current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
     user_data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysUser)],
     dept_data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysDept)],
+    is_async: Annotated[bool, Query(alias='isAsync', description='是否提交为异步导入任务')] = False,
 ) -> Response:
+    if is_async:
+        import_task = await UserService.submit_batch_import_user_task_services(
+            request, file, update_support, current_user, user_data_scope_sql, dept_data_scope_sql
+        )
+        logger.info(f'导入任务{import_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导入任务提交成功', data=import_task)
     batch_import_result = await UserService.batch_import_user_services(
         request, query_db, file, update_support, current_user, user_data_scope_sql, dept_data_scope_sql
     )
     logger.info(batch_import_result.message)
 
-    return ResponseUtil.success(msg=batch_import_result.message)
+    return ResponseUtil.success(msg=batch_import_result.message, data=batch_import_result.result)
 
 
 @user_controller.post(
@@ -466,15 +475,31 @@ async def export_system_user_list(
     user_page_query: Annotated[UserPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
     data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysUser)],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    is_async: Annotated[
+        bool, Query(alias='isAsync', description='是否提交为异步导出任务，数据量较大时建议开启')
+    ] = False,
 ) -> Response:
-    # 获取全量数据
+    if is_async:
+        export_task = await AsyncTaskService.submit_export_services(
+            current_user,
+            '用户数据导出',
+            lambda db: UserService.get_user_list_services(
+                db, user_page_query, data_scope_sql, is_page=False, is_stream=True
+            ),
+            UserService.export_user_list_services,
+        )
+        logger.info(f'导出任务{export_task.task_id}提交成功')
+
+        return ResponseUtil.success(msg='导出任务提交成功', data=export_task)
+    # 分批流式获取全量数据
     user_query_result = await UserService.get_user_list_services(
-        query_db, user_page_query, data_scope_sql, is_page=False
+        query_db, user_page_query, data_scope_sql, is_page=False, is_stream=True
     )
     user_export_result = await UserService.export_user_list_services(user_query_result)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(user_export_result))
+    return ResponseUtil.streaming(data=user_export_result)
 
 
 @user_controller.get(
@@ -519,7 +544,7 @@ async def update_system_role_user(
         await UserService.check_user_data_scope_services(query_db, user_id, user_data_scope_sql)
         await RoleService.check_role_data_scope_services(query_db, role_ids, role_data_scope_sql)
     add_user_role_result = await UserService.add_user_role_services(
-        query_db, CrudUserRoleModel(userId=user_id, roleIds=role_ids)
+        request, query_db, CrudUserRoleModel(userId=user_id, roleIds=role_ids)
     )
     logger.info(add_user_role_result.message)
 
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from datetime import datetime, time
 from typing import Any
 
@@ -54,14 +55,15 @@ class ConfigDao:
 
     @classmethod
     async def get_config_list(
-        cls, db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取参数配置列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 参数配置列表信息对象
         """
         query = (
@@ -81,7 +83,7 @@ class ConfigDao:
             .distinct()
         )
         config_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, is_stream=is_stream
         )
 
         return config_list
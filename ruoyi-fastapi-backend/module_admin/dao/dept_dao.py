@@ -1,10 +1,10 @@
 from collections.abc import Sequence
 
-from sqlalchemy import ColumnElement, bindparam, func, select, update
+from sqlalchemy import ColumnElement, CompoundSelect, Select, bindparam, delete, func, insert, select, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.util import immutabledict
 
-from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
+from module_admin.entity.do.role_do import SysRoleDept
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.dept_vo import DeptModel
 
@@ -88,7 +88,9 @@ class DeptDao:
                     .where(
                         SysDept.dept_id != dept_info.dept_id,
                         ~SysDept.dept_id.in_(
-                            select(SysDept.dept_id).where(func.find_in_set(dept_info.dept_id, SysDept.ancestors))
+                            select(SysDeptClosure.descendant_id).where(
+                                SysDeptClosure.ancestor_id == dept_info.dept_id, SysDeptClosure.depth > 0
+                            )
                         ),
                         SysDept.del_flag == '0',
                         SysDept.status == '0',
@@ -105,19 +107,37 @@ class DeptDao:
         return dept_result
 
     @classmethod
-    async def get_children_dept_dao(cls, db: AsyncSession, dept_id: int) -> Sequence[SysDept]:
+    async def get_children_dept_ancestors_dao(
+        cls, db: AsyncSession, dept_id: int, ancestors_prefix: str, last_dept_id: int, limit: int
+    ) -> list[tuple[int, str]]:
         """
-        根据部门id查询当前部门的子部门列表信息
+        根据部门id按部门id顺序分批查询祖先以指定前缀开头的子部门id及祖先
 
         :param db: orm对象
         :param dept_id: 部门id
-        :return: 子部门信息列表
+        :param ancestors_prefix: 祖先前缀
+        :param last_dept_id: 上一批次最后一个子部门id
+        :param limit: 每批次查询数量
+        :return: 子部门id及祖先列表
         """
-        dept_result = (
-            (await db.execute(select(SysDept).where(func.find_in_set(dept_id, SysDept.ancestors)))).scalars().all()
-        )
+        children_result = (
+            await db.execute(
+                select(SysDept.dept_id, SysDept.ancestors)
+                .where(
+                    SysDept.dept_id.in_(
+                        select(SysDeptClosure.descendant_id).where(
+                            SysDeptClosure.ancestor_id == dept_id, SysDeptClosure.depth > 0
+                        )
+                    ),
+                    func.substr(SysDept.ancestors, 1, len(ancestors_prefix)) == ancestors_prefix,
+                    SysDept.dept_id > last_dept_id,
+                )
+                .order_by(SysDept.dept_id)
+                .limit(limit)
+            )
+        ).all()
 
-        return dept_result
+        return [(row.dept_id, row.ancestors) for row in children_result]
 
     @classmethod
     async def get_dept_list_for_tree(
@@ -219,17 +239,42 @@ class DeptDao:
         :param update_dept: 需要更新的部门列表
         :return:
         """
+        if not update_dept:
+            return
+        # 使用表对象执行executemany，避免ORM按主键批量更新时逐行处理
+        dept_table = SysDept.__table__
+        await db.execute(
+            update(dept_table)
+            .where(dept_table.c.dept_id == bindparam('b_dept_id'))
+            .values(ancestors=bindparam('b_ancestors')),
+            [{'b_dept_id': dept['dept_id'], 'b_ancestors': dept['ancestors']} for dept in update_dept],
+        )
+
+    @classmethod
+    async def replace_children_dept_ancestors_prefix_dao(
+        cls, db: AsyncSession, dept_id: int, old_prefix: str, new_prefix: str
+    ) -> None:
+        """
+        根据部门id通过一条更新语句将子部门祖先中的旧前缀替换为新前缀，依赖concat及substr函数，适用于MySQL及PostgreSQL
+
+        :param db: orm对象
+        :param dept_id: 部门id
+        :param old_prefix: 旧的祖先前缀
+        :param new_prefix: 新的祖先前缀
+        :return:
+        """
         await db.execute(
             update(SysDept)
-            .where(SysDept.dept_id == bindparam('dept_id'))
-            .values(
-                {
-                    'dept_id': bindparam('dept_id'),
-                    'ancestors': bindparam('ancestors'),
-                }
-            ),
-            update_dept,
-            execution_options=immutabledict({'synchronize_session': None}),
+            .where(
+                SysDept.dept_id.in_(
+                    select(SysDeptClosure.descendant_id).where(
+                        SysDeptClosure.ancestor_id == dept_id, SysDeptClosure.depth > 0
+                    )
+                ),
+                func.substr(SysDept.ancestors, 1, len(old_prefix)) == old_prefix,
+            )
+            .values(ancestors=func.concat(new_prefix, func.substr(SysDept.ancestors, len(old_prefix) + 1)))
+            .execution_options(synchronize_session=False)
         )
 
     @classmethod
@@ -271,7 +316,13 @@ class DeptDao:
             await db.execute(
                 select(func.count('*'))
                 .select_from(SysDept)
-                .where(SysDept.status == '0', SysDept.del_flag == '0', func.find_in_set(dept_id, SysDept.ancestors))
+                .join(SysDeptClosure, SysDept.dept_id == SysDeptClosure.descendant_id)
+                .where(
+                    SysDept.status == '0',
+                    SysDept.del_flag == '0',
+                    SysDeptClosure.ancestor_id == dept_id,
+                    SysDeptClosure.depth > 0,
+                )
             )
         ).scalar()
 
@@ -313,3 +364,172 @@ class DeptDao:
         ).scalar()
 
         return dept_user_count
+
+    @classmethod
+    async def get_dept_ids_by_data_scope(cls, db: AsyncSession, data_scope_sql: ColumnElement) -> set[int]:
+        """
+        获取数据权限范围内所有未删除的部门id集合
+
+        :param db: orm对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 部门id集合
+        """
+        dept_ids = (
+            (await db.execute(select(SysDept.dept_id).where(SysDept.del_flag == '0', data_scope_sql))).scalars().all()
+        )
+
+        return set(dept_ids)
+
+    @classmethod
+    def get_data_scope_dept_id_query(
+        cls, custom_role_id_list: list[int], child_dept_id: int | None
+    ) -> Select | CompoundSelect | None:
+        """
+        构建查询数据权限可见部门id的语句
+
+        :param custom_role_id_list: 自定义数据权限的角色id列表
+        :param child_dept_id: 需要包含本部门及以下部门数据权限的部门id，为None时不包含
+        :return: 查询可见部门id的语句，没有可见部门时返回None
+        """
+        query_list = []
+        if custom_role_id_list:
+            query_list.append(
+                select(SysRoleDept.dept_id.label('dept_id')).where(SysRoleDept.role_id.in_(custom_role_id_list))
+            )
+        if child_dept_id is not None:
+            query_list.append(
+                select(SysDeptClosure.descendant_id.label('dept_id')).where(SysDeptClosure.ancestor_id == child_dept_id)
+            )
+        if not query_list:
+            return None
+
+        return query_list[0] if len(query_list) == 1 else union_all(*query_list)
+
+    @classmethod
+    async def get_data_scope_dept_ids_dao(
+        cls, db: AsyncSession, custom_role_id_list: list[int], child_dept_id: int | None
+    ) -> set[int]:
+        """
+        查询数据权限可见的部门id集合
+
+        :param db: orm对象
+        :param custom_role_id_list: 自定义数据权限的角色id列表
+        :param child_dept_id: 需要包含本部门及以下部门数据权限的部门id，为None时不包含
+        :return: 可见部门id集合
+        """
+        dept_id_query = cls.get_data_scope_dept_id_query(custom_role_id_list, child_dept_id)
+        if dept_id_query is None:
+            return set()
+        dept_id_result = (await db.execute(dept_id_query)).scalars().all()
+
+        return set(dept_id_result)
+
+    @classmethod
+    async def get_dept_descendant_closure_dao(cls, db: AsyncSession, dept_id: int) -> list[tuple[int, int]]:
+        """
+        根据部门id从闭包表查询当前部门及其所有子部门
+
+        :param db: orm对象
+        :param dept_id: 部门id
+        :return: 子部门id及与当前部门的层级距离列表，包含当前部门自身
+        """
+        descendant_result = (
+            await db.execute(
+                select(SysDeptClosure.descendant_id, SysDeptClosure.depth).where(SysDeptClosure.ancestor_id == dept_id)
+            )
+        ).all()
+
+        return [(row.descendant_id, row.depth) for row in descendant_result]
+
+    @classmethod
+    async def get_dept_ancestor_closure_dao(cls, db: AsyncSession, dept_id: int) -> list[tuple[int, int]]:
+        """
+        根据部门id从闭包表查询当前部门及其所有祖先部门
+
+        :param db: orm对象
+        :param dept_id: 部门id
+        :return: 祖先部门id及与当前部门的层级距离列表，包含当前部门自身
+        """
+        ancestor_result = (
+            await db.execute(
+                select(SysDeptClosure.ancestor_id, SysDeptClosure.depth).where(SysDeptClosure.descendant_id == dept_id)
+            )
+        ).all()
+
+        return [(row.ancestor_id, row.depth) for row in ancestor_result]
+
+    @classmethod
+    async def add_dept_closure_dao(cls, db: AsyncSession, closure_list: list[dict]) -> None:
+        """
+        批量新增部门闭包关系
+
+        :param db: orm对象
+        :param closure_list: 部门闭包关系列表，元素包含ancestor_id、descendant_id及depth
+        :return:
+        """
+        if closure_list:
+            await db.execute(insert(SysDeptClosure), closure_list)
+
+    @classmethod
+    async def delete_dept_closure_dao(
+        cls, db: AsyncSession, descendant_id_list: list[int], exclude_ancestor_id_list: list[int] | None = None
+    ) -> None:
+        """
+        批量删除部门闭包关系
+
+        :param db: orm对象
+        :param descendant_id_list: 需要删除闭包关系的后代部门id列表
+        :param exclude_ancestor_id_list: 需要保留闭包关系的祖先部门id列表，为空时删除后代部门的全部闭包关系
+        :return:
+        """
+        await db.execute(
+            delete(SysDeptClosure).where(
+                SysDeptClosure.descendant_id.in_(descendant_id_list),
+                ~SysDeptClosure.ancestor_id.in_(exclude_ancestor_id_list) if exclude_ancestor_id_list else True,
+            )
+        )
+
+    @classmethod
+    async def get_dept_closure_source_dao(cls, db: AsyncSession) -> list[tuple[int, int]]:
+        """
+        获取构建部门闭包表所需的部门id及父部门id
+
+        :param db: orm对象
+        :return: 部门id及父部门id列表
+        """
+        dept_result = (
+            await db.execute(select(SysDept.dept_id, SysDept.parent_id).where(SysDept.del_flag == '0'))
+        ).all()
+
+        return [(row.dept_id, row.parent_id) for row in dept_result]
+
+    @classmethod
+    async def get_dept_closure_checksum_dao(cls, db: AsyncSession) -> tuple[int, int, int, int]:
+        """
+        查询部门闭包表的校验值
+
+        :param db: orm对象
+        :return: 闭包关系数量及祖先部门id、后代部门id、层级差的合计
+        """
+        closure_checksum = (
+            await db.execute(
+                select(
+                    func.count('*'),
+                    func.coalesce(func.sum(SysDeptClosure.ancestor_id), 0),
+                    func.coalesce(func.sum(SysDeptClosure.descendant_id), 0),
+                    func.coalesce(func.sum(SysDeptClosure.depth), 0),
+                ).select_from(SysDeptClosure)
+            )
+        ).one()
+
+        return tuple(int(value) for value in closure_checksum)
+
+    @classmethod
+    async def clear_dept_closure_dao(cls, db: AsyncSession) -> None:
+        """
+        清空部门闭包表
+
+        :param db: orm对象
+        :return:
+        """
+        await db.execute(delete(SysDeptClosure))
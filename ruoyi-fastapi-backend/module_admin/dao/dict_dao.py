@@ -1,8 +1,8 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, time
 from typing import Any
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import Row, and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -68,14 +68,15 @@ class DictTypeDao:
 
     @classmethod
     async def get_dict_type_list(
-        cls, db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取字典类型列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 字典类型列表信息对象
         """
         query = (
@@ -95,7 +96,7 @@ class DictTypeDao:
             .distinct()
         )
         dict_type_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, is_stream=is_stream
         )
 
         return dict_type_list
@@ -185,14 +186,15 @@ class DictDataDao:
 
     @classmethod
     async def get_dict_data_list(
-        cls, db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取字典数据列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 字典数据列表信息对象
         """
         query = (
@@ -206,7 +208,7 @@ class DictDataDao:
             .distinct()
         )
         dict_data_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, is_stream=is_stream
         )
 
         return dict_data_list
@@ -241,6 +243,30 @@ class DictDataDao:
 
         return dict_data_list
 
+    @classmethod
+    async def get_all_enabled_dict_data(cls, db: AsyncSession) -> Sequence[Row[tuple[str, SysDictData | None]]]:
+        """
+        一次性获取所有正常状态字典类型及其正常状态的字典数据
+
+        :param db: orm对象
+        :return: 字典类型及字典数据列表，未包含字典数据的字典类型对应的字典数据为None
+        """
+        dict_data_list = (
+            await db.execute(
+                select(SysDictType.dict_type, SysDictData)
+                .select_from(SysDictType)
+                .where(SysDictType.status == '0')
+                .join(
+                    SysDictData,
+                    and_(SysDictType.dict_type == SysDictData.dict_type, SysDictData.status == '0'),
+                    isouter=True,
+                )
+                .order_by(SysDictType.dict_type, SysDictData.dict_sort)
+            )
+        ).all()
+
+        return dict_data_list
+
     @classmethod
     async def add_dict_data_dao(cls, db: AsyncSession, dict_data: DictDataModel) -> SysDictData:
         """
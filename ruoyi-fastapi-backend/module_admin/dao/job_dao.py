@@ -1,4 +1,4 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from typing import Any
 
 from sqlalchemy import delete, select, update
@@ -59,14 +59,15 @@ class JobDao:
 
     @classmethod
     async def get_job_list(
-        cls, db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取定时任务列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 定时任务列表信息对象
         """
         query = (
@@ -80,7 +81,7 @@ class JobDao:
             .distinct()
         )
         job_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, is_stream=is_stream
         )
 
         return job_list
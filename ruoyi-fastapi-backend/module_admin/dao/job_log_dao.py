@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from datetime import datetime, time
 from typing import Any
 
@@ -5,6 +6,7 @@ from sqlalchemy import delete, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from common.constant import CommonConstant
 from common.vo import PageModel
 from module_admin.entity.do.job_do import SysJobLog
 from module_admin.entity.vo.job_vo import JobLogModel, JobLogPageQueryModel
@@ -18,14 +20,15 @@ class JobLogDao:
 
     @classmethod
     async def get_job_log_list(
-        cls, db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取定时任务日志列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 定时任务日志列表信息对象
         """
         query = (
@@ -45,7 +48,15 @@ class JobLogDao:
             .distinct()
         )
         job_log_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            is_stream=is_stream,
+            keyset_columns=[SysJobLog.create_time, SysJobLog.job_log_id],
+            cursor=query_object.cursor,
+            count_limit=CommonConstant.PAGE_COUNT_LIMIT,
         )
 
         return job_log_list
@@ -1,9 +1,11 @@
+from collections.abc import AsyncIterator
 from datetime import datetime, time
 from typing import Any
 
-from sqlalchemy import asc, delete, desc, select
+from sqlalchemy import asc, delete, desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.constant import CommonConstant
 from common.vo import PageModel
 from module_admin.entity.do.log_do import SysLogininfor, SysOperLog
 from module_admin.entity.vo.log_vo import LogininforModel, LoginLogPageQueryModel, OperLogModel, OperLogPageQueryModel
@@ -19,14 +21,15 @@ class OperationLogDao:
 
     @classmethod
     async def get_operation_log_list(
-        cls, db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取操作日志列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 操作日志列表信息对象
         """
         if query_object.is_asc == 'ascending':
@@ -54,8 +57,23 @@ class OperationLogDao:
             .distinct()
             .order_by(order_by_column)
         )
+        # 按操作时间排序时使用游标分页，其他排序列可能为空，仍按页码分页
+        sort_column = (
+            getattr(SysOperLog, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
+            if query_object.is_asc
+            else SysOperLog.oper_time
+        )
         operation_log_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            is_stream=is_stream,
+            keyset_columns=[SysOperLog.oper_time, SysOperLog.oper_id] if sort_column is SysOperLog.oper_time else None,
+            is_desc=query_object.is_asc != 'ascending',
+            cursor=query_object.cursor,
+            count_limit=CommonConstant.PAGE_COUNT_LIMIT,
         )
 
         return operation_log_list
@@ -75,6 +93,21 @@ class OperationLogDao:
 
         return db_operation_log
 
+    @classmethod
+    async def add_operation_log_batch_dao(cls, db: AsyncSession, operation_log_list: list[OperLogModel]) -> None:
+        """
+        批量新增操作日志数据库操作
+
+        :param db: orm对象
+        :param operation_log_list: 操作日志对象列表
+        :return:
+        """
+        if operation_log_list:
+            await db.execute(
+                insert(SysOperLog),
+                [operation_log.model_dump(exclude={'oper_id'}) for operation_log in operation_log_list],
+            )
+
     @classmethod
     async def delete_operation_log_dao(cls, db: AsyncSession, operation_log: OperLogModel) -> None:
         """
@@ -104,14 +137,15 @@ class LoginLogDao:
 
     @classmethod
     async def get_login_log_list(
-        cls, db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取登录日志列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 登录日志列表信息对象
         """
         if query_object.is_asc == 'ascending':
@@ -140,8 +174,25 @@ class LoginLogDao:
             .distinct()
             .order_by(order_by_column)
         )
+        # 按访问时间排序时使用游标分页，其他排序列可能为空，仍按页码分页
+        sort_column = (
+            getattr(SysLogininfor, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
+            if query_object.is_asc
+            else SysLogininfor.login_time
+        )
         login_log_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            is_stream=is_stream,
+            keyset_columns=[SysLogininfor.login_time, SysLogininfor.info_id]
+            if sort_column is SysLogininfor.login_time
+            else None,
+            is_desc=query_object.is_asc != 'ascending',
+            cursor=query_object.cursor,
+            count_limit=CommonConstant.PAGE_COUNT_LIMIT,
         )
 
         return login_log_list
@@ -161,6 +212,20 @@ class LoginLogDao:
 
         return db_login_log
 
+    @classmethod
+    async def add_login_log_batch_dao(cls, db: AsyncSession, login_log_list: list[LogininforModel]) -> None:
+        """
+        批量新增登录日志数据库操作
+
+        :param db: orm对象
+        :param login_log_list: 登录日志对象列表
+        :return:
+        """
+        if login_log_list:
+            await db.execute(
+                insert(SysLogininfor), [login_log.model_dump(exclude={'info_id'}) for login_log in login_log_list]
+            )
+
     @classmethod
     async def delete_login_log_dao(cls, db: AsyncSession, login_log: LogininforModel) -> None:
         """
@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import Row, and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from module_admin.entity.do.menu_do import SysMenu
@@ -53,48 +53,54 @@ class MenuDao:
         return menu_info
 
     @classmethod
-    async def get_menu_list_for_tree(cls, db: AsyncSession, user_id: int, role: list) -> Sequence[SysMenu]:
+    async def get_menu_list_by_ids(
+        cls, db: AsyncSession, menu_ids: list[int], menu_types: list[str] | None = None
+    ) -> Sequence[SysMenu]:
         """
-        根据角色信息获取所有在用菜单列表信息
+        根据菜单id列表获取在用菜单列表信息
 
         :param db: orm对象
-        :param user_id: 用户id
-        :param role: 用户角色列表信息
+        :param menu_ids: 菜单id列表
+        :param menu_types: 菜单类型列表，为None时不限制菜单类型
         :return: 菜单列表信息
         """
-        role_id_list = [item.role_id for item in role]
-        if 1 in role_id_list:
-            menu_query_all = (
-                (await db.execute(select(SysMenu).where(SysMenu.status == '0').order_by(SysMenu.order_num).distinct()))
-                .scalars()
-                .all()
-            )
-        else:
-            menu_query_all = (
-                (
-                    await db.execute(
-                        select(SysMenu)
-                        .select_from(SysUser)
-                        .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                        .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                        .join(
-                            SysRole,
-                            and_(
-                                SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'
-                            ),
-                            isouter=True,
-                        )
-                        .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                        .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
-                        .order_by(SysMenu.order_num)
-                        .distinct()
+        if not menu_ids:
+            return []
+        menu_list = (
+            (
+                await db.execute(
+                    select(SysMenu)
+                    .where(
+                        SysMenu.status == '0',
+                        SysMenu.menu_id.in_(menu_ids),
+                        SysMenu.menu_type.in_(menu_types) if menu_types else True,
                     )
+                    .order_by(SysMenu.order_num)
                 )
-                .scalars()
-                .all()
             )
+            .scalars()
+            .all()
+        )
+
+        return menu_list
+
+    @classmethod
+    async def get_menu_index_list(cls, db: AsyncSession) -> Sequence[Row[tuple[int, str, str]]]:
+        """
+        获取构建角色菜单位图索引所需的在用菜单信息，按显示顺序排列
+
+        :param db: orm对象
+        :return: 菜单id、菜单类型及权限标识列表
+        """
+        menu_index_list = (
+            await db.execute(
+                select(SysMenu.menu_id, SysMenu.menu_type, SysMenu.perms)
+                .where(SysMenu.status == '0')
+                .order_by(SysMenu.order_num, SysMenu.menu_id)
+            )
+        ).all()
 
-        return menu_query_all
+        return menu_index_list
 
     @classmethod
     async def get_menu_list(
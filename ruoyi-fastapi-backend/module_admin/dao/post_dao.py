@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy import delete, func, select, update
@@ -72,14 +73,15 @@ class PostDao:
 
     @classmethod
     async def get_post_list(
-        cls, db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取岗位列表信息
 
         :param db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 岗位列表信息对象
         """
         query = (
@@ -93,7 +95,7 @@ class PostDao:
             .distinct()
         )
         post_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, is_stream=is_stream
         )
 
         return post_list
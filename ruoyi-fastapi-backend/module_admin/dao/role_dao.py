@@ -1,8 +1,8 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, time
 from typing import Any
 
-from sqlalchemy import ColumnElement, and_, delete, desc, func, select, update
+from sqlalchemy import ColumnElement, Row, and_, delete, desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -131,8 +131,13 @@ class RoleDao:
 
     @classmethod
     async def get_role_list(
-        cls, db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls,
+        db: AsyncSession,
+        query_object: RolePageQueryModel,
+        data_scope_sql: ColumnElement,
+        is_page: bool = False,
+        is_stream: bool = False,
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取角色列表信息
 
@@ -140,6 +145,7 @@ class RoleDao:
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 角色列表信息对象
         """
         query = (
@@ -165,7 +171,7 @@ class RoleDao:
             .distinct()
         )
         role_list: PageModel | list[dict[str, Any]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, is_stream=is_stream
         )
 
         return role_list
@@ -211,6 +217,25 @@ class RoleDao:
             .values(del_flag='2', update_by=role.update_by, update_time=role.update_time)
         )
 
+    @classmethod
+    async def get_role_menu_index_list(cls, db: AsyncSession) -> Sequence[Row[tuple[int, int]]]:
+        """
+        获取构建角色菜单位图索引所需的在用角色菜单关联信息
+
+        :param db: orm对象
+        :return: 角色id及菜单id列表
+        """
+        role_menu_index_list = (
+            await db.execute(
+                select(SysRoleMenu.role_id, SysRoleMenu.menu_id).join(
+                    SysRole,
+                    and_(SysRoleMenu.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                )
+            )
+        ).all()
+
+        return role_menu_index_list
+
     @classmethod
     async def get_role_menu_dao(cls, db: AsyncSession, role: RoleModel) -> Sequence[SysMenu]:
         """
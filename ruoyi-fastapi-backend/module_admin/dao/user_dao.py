@@ -1,15 +1,14 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, time
 from typing import Any
 
-from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, delete, desc, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
-from module_admin.entity.do.dept_do import SysDept
-from module_admin.entity.do.menu_do import SysMenu
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
 from module_admin.entity.do.post_do import SysPost
-from module_admin.entity.do.role_do import SysRole, SysRoleMenu
+from module_admin.entity.do.role_do import SysRole
 from module_admin.entity.do.user_do import SysUser, SysUserPost, SysUserRole
 from module_admin.entity.vo.user_vo import (
     UserModel,
@@ -81,111 +80,65 @@ class UserDao:
         return query_user_info
 
     @classmethod
-    async def get_user_by_id(cls, db: AsyncSession, user_id: int) -> dict[str, Any]:
+    async def get_user_id_map_by_user_names(cls, db: AsyncSession, user_names: list[str]) -> dict[str, int]:
         """
-        根据user_id获取用户信息
+        根据用户账号列表批量获取未删除用户的用户id
 
         :param db: orm对象
-        :param user_id: 用户id
-        :return: 当前user_id的用户信息对象
-        """
-        query_user_basic_info = (
-            (
-                await db.execute(
-                    select(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .distinct()
-                )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_dept_info = (
-            (
-                await db.execute(
-                    select(SysDept)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(
-                        SysDept,
-                        and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
-                    )
-                    .distinct()
-                )
+        :param user_names: 用户账号列表
+        :return: 以用户账号为键、用户id为值的字典
+        """
+        if not user_names:
+            return {}
+        user_rows = (
+            await db.execute(
+                select(SysUser.user_name, SysUser.user_id)
+                .where(SysUser.del_flag == '0', SysUser.user_name.in_(user_names))
+                .order_by(SysUser.create_time)
             )
-            .scalars()
-            .first()
-        )
-        query_user_role_info = (
+        ).all()
+
+        # 同名账号取最新创建的用户
+        return dict(user_rows)
+
+    @classmethod
+    async def get_user_ids_by_data_scope(
+        cls, db: AsyncSession, user_ids: list[int], data_scope_sql: ColumnElement
+    ) -> set[int]:
+        """
+        获取用户id列表中属于数据权限范围内的用户id集合
+
+        :param db: orm对象
+        :param user_ids: 用户id列表
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 用户id集合
+        """
+        if not user_ids:
+            return set()
+        scope_user_ids = (
             (
                 await db.execute(
-                    select(SysRole)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                    select(SysUser.user_id).where(
+                        SysUser.del_flag == '0', SysUser.user_id.in_(user_ids), data_scope_sql
                     )
-                    .distinct()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_post_info = (
-            (
-                await db.execute(
-                    select(SysPost)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
-                    .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
-                    .distinct()
                 )
             )
             .scalars()
             .all()
         )
-        role_id_list = [item.role_id for item in query_user_role_info]
-        if 1 in role_id_list:
-            query_user_menu_info = (
-                (await db.execute(select(SysMenu).where(SysMenu.status == '0').distinct())).scalars().all()
-            )
-        else:
-            query_user_menu_info = (
-                (
-                    await db.execute(
-                        select(SysMenu)
-                        .select_from(SysUser)
-                        .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                        .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                        .join(
-                            SysRole,
-                            and_(
-                                SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'
-                            ),
-                            isouter=True,
-                        )
-                        .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                        .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
-                        .order_by(SysMenu.order_num)
-                        .distinct()
-                    )
-                )
-                .scalars()
-                .all()
-            )
 
-        results = {
-            'user_basic_info': query_user_basic_info,
-            'user_dept_info': query_user_dept_info,
-            'user_role_info': query_user_role_info,
-            'user_post_info': query_user_post_info,
-            'user_menu_info': query_user_menu_info,
-        }
+        return set(scope_user_ids)
 
-        return results
+    @classmethod
+    async def get_user_by_id(cls, db: AsyncSession, user_id: int) -> dict[str, Any]:
+        """
+        根据user_id获取用户信息
+
+        :param db: orm对象
+        :param user_id: 用户id
+        :return: 当前user_id的用户信息对象
+        """
+        return await cls._get_user_info_by_id(db, user_id, normal_only=True)
 
     @classmethod
     async def get_user_detail_by_id(cls, db: AsyncSession, user_id: int) -> dict[str, Any]:
@@ -196,92 +149,60 @@ class UserDao:
         :param user_id: 用户id
         :return: 当前user_id的用户信息对象
         """
-        query_user_basic_info = (
-            (await db.execute(select(SysUser).where(SysUser.del_flag == '0', SysUser.user_id == user_id).distinct()))
-            .scalars()
-            .first()
-        )
-        query_user_dept_info = (
-            (
-                await db.execute(
-                    select(SysDept)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(
-                        SysDept,
-                        and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
-                    )
-                    .distinct()
-                )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_role_info = (
-            (
-                await db.execute(
-                    select(SysRole)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                    )
-                    .distinct()
+        return await cls._get_user_info_by_id(db, user_id, normal_only=False)
+
+    @classmethod
+    async def _get_user_info_by_id(cls, db: AsyncSession, user_id: int, normal_only: bool) -> dict[str, Any]:
+        """
+        通过一次查询获取用户基本信息、部门信息、角色信息及岗位信息
+
+        :param db: orm对象
+        :param user_id: 用户id
+        :param normal_only: 是否只查询状态正常的用户
+        :return: 当前user_id的用户基本信息、部门信息、角色信息及岗位信息
+        """
+        query_rows = (
+            await db.execute(
+                select(SysUser, SysDept, SysRole, SysPost)
+                .where(
+                    SysUser.status == '0' if normal_only else True,
+                    SysUser.del_flag == '0',
+                    SysUser.user_id == user_id,
                 )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_post_info = (
-            (
-                await db.execute(
-                    select(SysPost)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
-                    .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
-                    .distinct()
+                .join(
+                    SysDept,
+                    and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
+                    isouter=True,
                 )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_menu_info = (
-            (
-                await db.execute(
-                    select(SysMenu)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                        isouter=True,
-                    )
-                    .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                    .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
-                    .distinct()
+                .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                .join(
+                    SysRole,
+                    and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                    isouter=True,
                 )
+                .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
+                .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'), isouter=True)
             )
-            .scalars()
-            .all()
-        )
+        ).all()
+        # 角色与岗位的连接结果为笛卡尔积，借助orm的标识映射按对象去重并保持原有顺序
         results = {
-            'user_basic_info': query_user_basic_info,
-            'user_dept_info': query_user_dept_info,
-            'user_role_info': query_user_role_info,
-            'user_post_info': query_user_post_info,
-            'user_menu_info': query_user_menu_info,
+            'user_basic_info': query_rows[0][0] if query_rows else None,
+            'user_dept_info': query_rows[0][1] if query_rows else None,
+            'user_role_info': list(dict.fromkeys(row[2] for row in query_rows if row[2] is not None)),
+            'user_post_info': list(dict.fromkeys(row[3] for row in query_rows if row[3] is not None)),
         }
 
         return results
 
     @classmethod
     async def get_user_list(
-        cls, db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
-    ) -> PageModel | list[list[dict[str, Any]]]:
+        cls,
+        db: AsyncSession,
+        query_object: UserPageQueryModel,
+        data_scope_sql: ColumnElement,
+        is_page: bool = False,
+        is_stream: bool = False,
+    ) -> PageModel | list[list[dict[str, Any]]] | AsyncIterator[list[Any]]:
         """
         根据查询参数获取用户列表信息
 
@@ -289,17 +210,15 @@ class UserDao:
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 用户列表信息对象
         """
         query = (
             select(SysUser, SysDept)
             .where(
                 SysUser.del_flag == '0',
-                or_(
-                    SysUser.dept_id == query_object.dept_id,
-                    SysUser.dept_id.in_(
-                        select(SysDept.dept_id).where(func.find_in_set(query_object.dept_id, SysDept.ancestors))
-                    ),
+                SysUser.dept_id.in_(
+                    select(SysDeptClosure.descendant_id).where(SysDeptClosure.ancestor_id == query_object.dept_id)
                 )
                 if query_object.dept_id
                 else True,
@@ -327,7 +246,15 @@ class UserDao:
             .distinct()
         )
         user_list: PageModel | list[list[dict[str, Any]]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db,
+            query,
+            query_object.page_num,
+            query_object.page_size,
+            is_page,
+            is_stream=is_stream,
+            keyset_columns=[SysUser.user_id],
+            is_desc=False,
+            cursor=query_object.cursor,
         )
 
         return user_list
@@ -358,6 +285,30 @@ class UserDao:
         """
         await db.execute(update(SysUser), [user])
 
+    @classmethod
+    async def add_user_batch_dao(cls, db: AsyncSession, users: list[dict[str, Any]]) -> None:
+        """
+        批量新增用户数据库操作，以多行插入语句执行
+
+        :param db: orm对象
+        :param users: 需要新增的用户字典列表
+        :return:
+        """
+        if users:
+            await db.execute(insert(SysUser), users)
+
+    @classmethod
+    async def edit_user_batch_dao(cls, db: AsyncSession, users: list[dict[str, Any]]) -> None:
+        """
+        批量编辑用户数据库操作，按主键批量更新
+
+        :param db: orm对象
+        :param users: 需要更新的用户字典列表，每个字典均需包含user_id
+        :return:
+        """
+        if users:
+            await db.execute(update(SysUser), users)
+
     @classmethod
     async def delete_user_dao(cls, db: AsyncSession, user: UserModel) -> None:
         """
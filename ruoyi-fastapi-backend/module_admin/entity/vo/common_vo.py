@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Any, Literal
+
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 
@@ -13,3 +16,26 @@ class UploadResponseModel(BaseModel):
     new_file_name: str | None = Field(default=None, description='新文件名称')
     original_filename: str | None = Field(default=None, description='原文件名称')
     url: str | None = Field(default=None, description='新文件url')
+
+
+class AsyncTaskModel(BaseModel):
+    """
+    异步导入导出任务模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    task_id: str = Field(description='任务ID')
+    task_type: Literal['export', 'import'] = Field(description='任务类型（export导出 import导入）')
+    task_name: str = Field(description='任务名称')
+    status: Literal['pending', 'running', 'success', 'failure'] = Field(
+        description='任务状态（pending排队中 running执行中 success执行成功 failure执行失败）'
+    )
+    processed: int = Field(default=0, description='已处理数据条数')
+    total: int | None = Field(default=None, description='数据总条数，无法预先统计时为空')
+    file_name: str | None = Field(default=None, description='结果文件名称')
+    message: str | None = Field(default=None, description='任务执行结果信息')
+    result: Any | None = Field(default=None, description='任务执行结果数据')
+    create_by: int | None = Field(default=None, description='提交任务的用户ID')
+    create_time: datetime | None = Field(default=None, description='提交时间')
+    finish_time: datetime | None = Field(default=None, description='完成时间')
@@ -30,15 +30,13 @@ class OnlineQueryModel(OnlineModel):
     end_time: str | None = Field(default=None, description='结束时间')
 
 
-class OnlinePageResponseModel(BaseModel):
+class OnlinePageQueryModel(OnlineQueryModel):
     """
-    在线用户分页响应模型
+    在线用户分页查询模型
     """
 
-    model_config = ConfigDict(alias_generator=to_camel)
-
-    rows: list[OnlineModel] = Field(description='在线用户记录列表')
-    total: int = Field(description='总记录数')
+    page_num: int = Field(default=1, description='当前页码')
+    page_size: int = Field(default=10, description='每页记录数')
 
 
 class DeleteOnlineModel(BaseModel):
@@ -64,3 +64,21 @@ class ServerMonitorModel(BaseModel):
     mem: MemoryInfo | None = Field(description='內存相关信息')
     sys: SysInfo | None = Field(description='服务器相关信息')
     sys_files: list[SysFiles] | None = Field(description='磁盘相关信息')
+
+
+class LogAggregatorMetricsModel(BaseModel):
+    """
+    日志聚合消费指标对应pydantic模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    worker: str = Field(description='消费进程名称')
+    lag: int | None = Field(default=None, description='消费组积压消息数量')
+    pending: int | None = Field(default=None, description='已读取未确认的消息数量')
+    consumer_count: int | None = Field(default=None, description='当前消费者数量')
+    batch_size: int | None = Field(default=None, description='当前每批读取的消息数量')
+    throughput: float | None = Field(default=None, description='每秒处理的消息数量')
+    processed_count: int | None = Field(default=None, description='累计处理的消息数量')
+    flush_latency_avg_ms: float | None = Field(default=None, description='平均落库耗时（毫秒）')
+    flush_latency_max_ms: float | None = Field(default=None, description='统计窗口内最大落库耗时（毫秒）')
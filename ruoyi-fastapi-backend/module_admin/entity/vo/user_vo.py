@@ -1,8 +1,8 @@
 import re
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from pydantic.alias_generators import to_camel
 from pydantic_validation_decorator import Network, NotBlank, Size, Xss
 
@@ -10,6 +10,7 @@ from exceptions.exception import ModelValidatorException
 from module_admin.entity.vo.dept_vo import DeptModel
 from module_admin.entity.vo.post_vo import PostModel
 from module_admin.entity.vo.role_vo import RoleModel
+from utils.permission_util import PermissionMatcher
 
 
 class TokenData(BaseModel):
@@ -137,6 +138,32 @@ class CurrentUserModel(BaseModel):
     is_default_modify_pwd: bool = Field(default=False, description='是否初始密码修改提醒')
     is_password_expired: bool = Field(default=False, description='密码是否过期提醒')
 
+    _permission_matcher: PermissionMatcher = PrivateAttr()
+    _role_key_set: frozenset[str] = PrivateAttr()
+
+    def model_post_init(self, context: Any, /) -> None:
+        # 预先构建权限匹配器及角色标识集合，用户认证信息缓存后可在多个请求间复用
+        self._permission_matcher = PermissionMatcher(self.permissions)
+        self._role_key_set = frozenset(self.roles)
+
+    def has_permission(self, perm: str) -> bool:
+        """
+        判断当前用户是否拥有指定权限标识
+
+        :param perm: 权限标识
+        :return: 是否拥有该权限
+        """
+        return self._permission_matcher.has_permission(perm)
+
+    def has_role(self, role_key: str) -> bool:
+        """
+        判断当前用户是否拥有指定角色标识
+
+        :param role_key: 角色标识
+        :return: 是否拥有该角色
+        """
+        return role_key in self._role_key_set
+
 
 class UserDetailModel(BaseModel):
     """
@@ -190,6 +217,7 @@ class UserPageQueryModel(UserQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    cursor: str | None = Field(default=None, description='分页游标，传入上一页返回的下一页游标时按游标分页')
 
 
 class AddUserModel(UserModel):
@@ -0,0 +1,38 @@
+import asyncio
+import contextlib
+import signal
+
+from config.get_db import close_async_engine
+from config.get_redis import RedisUtil
+from module_admin.service.log_service import LogAggregatorService
+from utils.ip_location_util import IpLocationUtil
+from utils.log_util import logger
+
+
+async def run_log_worker() -> None:
+    """
+    以独立进程运行日志聚合消费者，配合LOG_AGGREGATOR_EMBEDDED=false使用，使应用进程无需承担日志落库开销
+
+    :return: None
+    """
+    redis = await RedisUtil.create_redis_pool()
+    consume_task = asyncio.create_task(LogAggregatorService.consume_stream(redis))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # Windows不支持add_signal_handler，此时依赖KeyboardInterrupt退出
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, consume_task.cancel)
+    logger.info('🚀 日志聚合消费进程启动成功')
+    try:
+        await consume_task
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await redis.close()
+        await IpLocationUtil.close()
+        await close_async_engine()
+        logger.info('✅️ 日志聚合消费进程已停止')
+
+
+if __name__ == '__main__':
+    asyncio.run(run_log_worker())
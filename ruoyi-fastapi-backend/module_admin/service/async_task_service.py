@@ -0,0 +1,358 @@
+import asyncio
+import os
+import time
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+import aiofiles
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.constant import AsyncTaskConstant
+from common.enums import RedisInitKeyConfig
+from config.database import AsyncSessionLocal
+from config.env import UploadConfig
+from exceptions.exception import ServiceException
+from module_admin.entity.vo.common_vo import AsyncTaskModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from utils.log_util import logger
+
+
+class AsyncTaskReporter:
+    """
+    异步任务进度上报对象，由任务执行函数调用以更新任务进度及结果
+    """
+
+    def __init__(self, redis: aioredis.Redis, task: AsyncTaskModel) -> None:
+        """
+        初始化异步任务进度上报对象
+
+        :param redis: redis对象
+        :param task: 异步任务信息
+        """
+        self.redis = redis
+        self.task = task
+
+    async def progress(self, processed: int, total: int | None = None) -> None:
+        """
+        更新任务进度
+
+        :param processed: 已处理数据条数
+        :param total: 数据总条数，无法预先统计时为空
+        :return: None
+        """
+        self.task.processed = processed
+        if total is not None:
+            self.task.total = total
+        await AsyncTaskService.save_task(self.redis, self.task)
+
+    async def count_batches(self, batches: AsyncIterable[list[Any]]) -> AsyncIterator[list[Any]]:
+        """
+        包装数据批次的异步迭代器，每获取一批数据即按累计条数更新任务进度
+
+        :param batches: 数据批次的异步迭代器
+        :return: 数据批次的异步迭代器
+        """
+        processed = 0
+        async for batch in batches:
+            processed += len(batch)
+            await self.progress(processed)
+            yield batch
+
+    def result_file_name(self, extension: str = 'xlsx') -> str:
+        """
+        获取任务结果文件名称并记录到任务信息中
+
+        :param extension: 文件扩展名
+        :return: 任务结果文件名称
+        """
+        self.task.file_name = f'{AsyncTaskConstant.FILE_PREFIX}{self.task.task_id}.{extension}'
+        return self.task.file_name
+
+
+AsyncTaskRunner = Callable[[AsyncSession, AsyncTaskReporter], Awaitable[None]]
+
+
+class AsyncTaskService:
+    """
+    异步导入导出任务服务层
+
+    任务提交后进入应用进程内的队列，由固定数量的工作协程依次执行，每个任务使用独立的数据库会话，
+    任务状态及进度保存于Redis，结果文件写入通用下载接口无法访问的独立目录，前端通过任务ID轮询状态，
+    并经校验任务归属的结果下载接口获取结果文件。
+    任务执行函数会引用请求中已解析的数据权限条件等对象，因此只在提交任务的进程内执行，无需额外的消息队列
+    """
+
+    _queue: asyncio.Queue[tuple[AsyncTaskModel, AsyncTaskRunner]] | None = None
+    _workers: list[asyncio.Task] = []
+    _redis: aioredis.Redis | None = None
+
+    @classmethod
+    def _task_key(cls, task_id: str) -> str:
+        """
+        获取任务信息缓存键名
+
+        :param task_id: 任务ID
+        :return: 任务信息缓存键名
+        """
+        return f'{RedisInitKeyConfig.ASYNC_TASK.key}:{task_id}'
+
+    @classmethod
+    def _user_task_key(cls, user_id: int) -> str:
+        """
+        获取用户任务列表缓存键名
+
+        :param user_id: 用户id
+        :return: 用户任务列表缓存键名
+        """
+        return f'{RedisInitKeyConfig.ASYNC_TASK.key}:user:{user_id}'
+
+    @classmethod
+    async def start_workers(cls, redis: aioredis.Redis) -> None:
+        """
+        启动异步任务工作协程并清理过期的任务结果文件
+
+        :param redis: redis对象
+        :return: None
+        """
+        cls._redis = redis
+        cls._queue = asyncio.Queue(maxsize=AsyncTaskConstant.QUEUE_SIZE)
+        cls._workers = [asyncio.create_task(cls._worker(cls._queue)) for _ in range(AsyncTaskConstant.WORKER_COUNT)]
+        await asyncio.to_thread(cls._clean_expired_files)
+
+    @classmethod
+    async def stop_workers(cls) -> None:
+        """
+        停止异步任务工作协程，执行中及排队中的任务均标记为执行失败
+
+        :return: None
+        """
+        for worker in cls._workers:
+            worker.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+        cls._workers = []
+        if cls._queue is not None:
+            while not cls._queue.empty():
+                task, _ = cls._queue.get_nowait()
+                await cls._finish_task(task, AsyncTaskConstant.STATUS_FAILURE, '应用已停止，任务未执行')
+            cls._queue = None
+
+    @classmethod
+    async def submit_task_services(
+        cls, current_user: CurrentUserModel, task_type: str, task_name: str, runner: AsyncTaskRunner
+    ) -> AsyncTaskModel:
+        """
+        提交异步任务service
+
+        :param current_user: 当前用户对象
+        :param task_type: 任务类型
+        :param task_name: 任务名称
+        :param runner: 任务执行函数，以独立的数据库会话及进度上报对象调用
+        :return: 已提交的任务信息
+        """
+        if cls._queue is None or cls._redis is None:
+            raise ServiceException(message='异步任务服务未启动')
+        if cls._queue.full():
+            raise ServiceException(message='当前排队任务过多，请稍后再试')
+        task = AsyncTaskModel(
+            taskId=uuid.uuid4().hex,
+            taskType=task_type,
+            taskName=task_name,
+            status=AsyncTaskConstant.STATUS_PENDING,
+            createBy=current_user.user.user_id,
+            createTime=datetime.now(),
+        )
+        await cls.save_task(cls._redis, task)
+        user_task_key = cls._user_task_key(current_user.user.user_id)
+        async with cls._redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(user_task_key, {task.task_id: time.time()})
+            pipe.zremrangebyrank(user_task_key, 0, -AsyncTaskConstant.USER_TASK_LIMIT - 1)
+            pipe.expire(user_task_key, AsyncTaskConstant.EXPIRE_SECONDS)
+            await pipe.execute()
+        cls._queue.put_nowait((task, runner))
+        logger.info(f'异步任务{task.task_id}（{task_name}）已提交')
+
+        return task
+
+    @classmethod
+    async def submit_export_services(
+        cls,
+        current_user: CurrentUserModel,
+        task_name: str,
+        query_func: Callable[[AsyncSession], Awaitable[AsyncIterable[list[dict[str, Any]]]]],
+        export_func: Callable[[AsyncIterable[list[dict[str, Any]]]], Awaitable[AsyncIterator[bytes]]],
+    ) -> AsyncTaskModel:
+        """
+        提交异步导出任务service
+
+        :param current_user: 当前用户对象
+        :param task_name: 任务名称
+        :param query_func: 以数据库会话调用、分批流式获取导出数据的函数
+        :param export_func: 将数据批次转化为excel二进制数据分块的函数
+        :return: 已提交的任务信息
+        """
+
+        async def runner(query_db: AsyncSession, reporter: AsyncTaskReporter) -> None:
+            query_result = await query_func(query_db)
+            export_result = await export_func(reporter.count_batches(query_result))
+            await cls.write_result_file(reporter.result_file_name(), export_result)
+            reporter.task.message = f'导出完成，共{reporter.task.processed}条'
+
+        return await cls.submit_task_services(current_user, AsyncTaskConstant.TYPE_EXPORT, task_name, runner)
+
+    @classmethod
+    async def get_task_services(
+        cls, redis: aioredis.Redis, task_id: str, current_user: CurrentUserModel
+    ) -> AsyncTaskModel:
+        """
+        获取异步任务详情service
+
+        :param redis: redis对象
+        :param task_id: 任务ID
+        :param current_user: 当前用户对象
+        :return: 任务信息
+        """
+        cache_value = await redis.get(cls._task_key(task_id))
+        if not cache_value:
+            raise ServiceException(message='任务不存在或已过期')
+        task = AsyncTaskModel.model_validate_json(cache_value)
+        if task.create_by != current_user.user.user_id:
+            raise ServiceException(message='没有权限访问该任务')
+
+        return task
+
+    @classmethod
+    async def get_task_list_services(
+        cls, redis: aioredis.Redis, current_user: CurrentUserModel
+    ) -> list[AsyncTaskModel]:
+        """
+        获取当前用户最近提交的异步任务列表service
+
+        :param redis: redis对象
+        :param current_user: 当前用户对象
+        :return: 按提交时间倒序排列的任务信息列表
+        """
+        task_id_list = await redis.zrevrange(cls._user_task_key(current_user.user.user_id), 0, -1)
+        if not task_id_list:
+            return []
+        cache_value_list = await redis.mget([cls._task_key(task_id) for task_id in task_id_list])
+
+        return [AsyncTaskModel.model_validate_json(cache_value) for cache_value in cache_value_list if cache_value]
+
+    @classmethod
+    async def save_task(cls, redis: aioredis.Redis, task: AsyncTaskModel) -> None:
+        """
+        保存任务信息
+
+        :param redis: redis对象
+        :param task: 任务信息
+        :return: None
+        """
+        await redis.set(
+            cls._task_key(task.task_id), task.model_dump_json(by_alias=True), ex=AsyncTaskConstant.EXPIRE_SECONDS
+        )
+
+    @classmethod
+    async def write_result_file(cls, file_name: str, data: AsyncIterable[bytes] | bytes) -> None:
+        """
+        将任务结果写入异步任务结果文件目录，先写入临时文件再重命名，避免下载到未写完的文件
+
+        :param file_name: 结果文件名称
+        :param data: 文件二进制数据或二进制数据分块的异步迭代器
+        :return: None
+        """
+        filepath = os.path.join(UploadConfig.ASYNC_TASK_PATH, file_name)
+        temp_filepath = f'{filepath}.tmp'
+        async with aiofiles.open(temp_filepath, 'wb') as f:
+            if isinstance(data, bytes):
+                await f.write(data)
+            else:
+                async for chunk in data:
+                    await f.write(chunk)
+        os.replace(temp_filepath, filepath)
+
+    @classmethod
+    async def _finish_task(cls, task: AsyncTaskModel, status: str, message: str | None = None) -> None:
+        """
+        记录任务执行结果
+
+        :param task: 任务信息
+        :param status: 任务状态
+        :param message: 任务执行结果信息
+        :return: None
+        """
+        task.status = status
+        task.finish_time = datetime.now()
+        if message is not None:
+            task.message = message
+        try:
+            await cls.save_task(cls._redis, task)
+        except Exception as e:
+            logger.error(f'异步任务{task.task_id}状态保存失败：{e}')
+
+    @classmethod
+    async def _run_task(cls, task: AsyncTaskModel, runner: AsyncTaskRunner) -> None:
+        """
+        执行单个异步任务
+
+        :param task: 任务信息
+        :param runner: 任务执行函数
+        :return: None
+        """
+        task.status = AsyncTaskConstant.STATUS_RUNNING
+        await cls.save_task(cls._redis, task)
+        reporter = AsyncTaskReporter(cls._redis, task)
+        try:
+            async with AsyncSessionLocal() as query_db:
+                await runner(query_db, reporter)
+        except asyncio.CancelledError:
+            await cls._finish_task(task, AsyncTaskConstant.STATUS_FAILURE, '应用已停止，任务已中断')
+            raise
+        except ServiceException as e:
+            await cls._finish_task(task, AsyncTaskConstant.STATUS_FAILURE, e.message)
+        except Exception as e:
+            logger.exception(f'异步任务{task.task_id}（{task.task_name}）执行失败：{e}')
+            await cls._finish_task(task, AsyncTaskConstant.STATUS_FAILURE, '任务执行失败，请联系管理员')
+        else:
+            await cls._finish_task(task, AsyncTaskConstant.STATUS_SUCCESS)
+            logger.info(f'异步任务{task.task_id}（{task.task_name}）执行成功')
+
+    @classmethod
+    async def _worker(cls, queue: asyncio.Queue[tuple[AsyncTaskModel, AsyncTaskRunner]]) -> None:
+        """
+        异步任务工作协程，循环从队列中获取任务并执行
+
+        :param queue: 任务队列
+        :return: None
+        """
+        while True:
+            task, runner = await queue.get()
+            try:
+                await cls._run_task(task, runner)
+                await asyncio.to_thread(cls._clean_expired_files)
+            except Exception as e:
+                logger.error(f'异步任务{task.task_id}处理异常：{e}')
+            finally:
+                queue.task_done()
+
+    @classmethod
+    def _clean_expired_files(cls) -> None:
+        """
+        删除异步任务结果文件目录中超过保留时间的任务结果文件
+
+        :return: None
+        """
+        expire_time = time.time() - AsyncTaskConstant.EXPIRE_SECONDS
+        try:
+            with os.scandir(UploadConfig.ASYNC_TASK_PATH) as entries:
+                for entry in entries:
+                    if (
+                        entry.name.startswith(AsyncTaskConstant.FILE_PREFIX)
+                        and entry.is_file()
+                        and entry.stat().st_mtime < expire_time
+                    ):
+                        os.remove(entry.path)
+        except OSError as e:
+            logger.warning(f'清理过期的异步任务结果文件失败：{e}')
@@ -1,9 +1,13 @@
 from fastapi import Request
 
+from common.constant import CacheConstant
 from common.enums import RedisInitKeyConfig
 from common.vo import CrudResponseModel
 from config.get_redis import RedisUtil
 from module_admin.entity.vo.cache_vo import CacheInfoModel, CacheMonitorModel
+from module_admin.service.principal_cache_service import PrincipalCacheService
+from module_admin.service.sys_cache_service import SysCacheService
+from utils.redis_util import RedisKeyUtil
 
 
 class CacheService:
@@ -49,18 +53,24 @@ class CacheService:
         return name_list
 
     @classmethod
-    async def get_cache_monitor_cache_key_services(cls, request: Request, cache_name: str) -> list[str]:
+    async def get_cache_monitor_cache_key_services(
+        cls, request: Request, cache_name: str, cursor: int = 0, page_size: int = CacheConstant.CACHE_KEY_PAGE_SIZE
+    ) -> tuple[int, list[str]]:
         """
-        获取缓存键名列表信息service
+        分页获取缓存键名列表信息service
 
         :param request: Request对象
         :param cache_name: 缓存名称
-        :return: 缓存键名列表信息
+        :param cursor: 起始游标，首页为0
+        :param page_size: 每页键数量
+        :return: 下一页游标及缓存键名列表信息，游标为0时表示已获取全部键名
         """
-        cache_keys: list[str] = await request.app.state.redis.keys(f'{cache_name}*')
-        cache_key_list = [key.split(':', 1)[1] for key in cache_keys if key.startswith(f'{cache_name}:')]
+        next_cursor, cache_keys = await RedisKeyUtil.scan_page(
+            request.app.state.redis, f'{cache_name}:*', cursor=cursor, page_size=page_size
+        )
+        cache_key_list = [key.split(':', 1)[1] for key in cache_keys]
 
-        return cache_key_list
+        return next_cursor, cache_key_list
 
     @classmethod
     async def get_cache_monitor_cache_value_services(
@@ -87,9 +97,11 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys(f'{cache_name}*')
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        await RedisKeyUtil.unlink_by_pattern(request.app.state.redis, f'{cache_name}*')
+        # 清除的缓存可能包含字典或参数配置，同步清除各工作进程的进程内缓存
+        await SysCacheService.invalidate(request.app.state.redis)
+        # 清除的缓存可能包含权限版本号或用户认证信息，递增全局权限版本号使各工作进程的进程内缓存失效
+        await PrincipalCacheService.bump_global_version(request.app.state.redis)
 
         return CrudResponseModel(is_success=True, message=f'{cache_name}对应键值清除成功')
 
@@ -102,9 +114,9 @@ class CacheService:
         :param cache_key: 缓存键名
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys(f'*{cache_key}')
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        await RedisKeyUtil.unlink_by_pattern(request.app.state.redis, f'*{cache_key}')
+        await SysCacheService.invalidate(request.app.state.redis)
+        await PrincipalCacheService.bump_global_version(request.app.state.redis)
 
         return CrudResponseModel(is_success=True, message=f'{cache_key}清除成功')
 
@@ -116,9 +128,11 @@ class CacheService:
         :param request: Request对象
         :return: 操作缓存响应信息
         """
-        cache_keys = await request.app.state.redis.keys()
-        if cache_keys:
-            await request.app.state.redis.delete(*cache_keys)
+        # 权限版本号不属于缓存数据，需保留以保证版本戳不会重复
+        await RedisKeyUtil.unlink_by_pattern(
+            request.app.state.redis, exclude_prefixes=(PrincipalCacheService.get_version_key_prefix(),)
+        )
+        await PrincipalCacheService.bump_global_version(request.app.state.redis)
 
         await RedisUtil.init_sys_dict(request.app.state.redis)
         await RedisUtil.init_sys_config(request.app.state.redis)
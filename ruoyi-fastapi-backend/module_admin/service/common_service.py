@@ -4,10 +4,13 @@ from datetime import datetime
 import aiofiles
 from fastapi import BackgroundTasks, Request, UploadFile
 
+from common.constant import AsyncTaskConstant
 from common.vo import CrudResponseModel
 from config.env import UploadConfig
 from exceptions.exception import ServiceException
 from module_admin.entity.vo.common_vo import UploadResponseModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.async_task_service import AsyncTaskService
 from utils.upload_util import UploadUtil
 
 
@@ -58,7 +61,11 @@ class CommonService:
 
     @classmethod
     async def download_services(
-        cls, background_tasks: BackgroundTasks, file_name: str, delete: bool
+        cls,
+        background_tasks: BackgroundTasks,
+        file_name: str,
+        delete: bool,
+        base_path: str = UploadConfig.DOWNLOAD_PATH,
     ) -> CrudResponseModel:
         """
         下载下载目录文件service
@@ -66,17 +73,41 @@ class CommonService:
         :param background_tasks: 后台任务对象
         :param file_name: 下载的文件名称
         :param delete: 是否在下载完成后删除文件
+        :param base_path: 文件所在目录，默认为下载目录
         :return: 上传结果
         """
-        filepath = os.path.join(UploadConfig.DOWNLOAD_PATH, file_name)
-        if '..' in file_name:
+        if '..' in file_name or os.path.isabs(file_name):
             raise ServiceException(message='文件名称不合法')
+        filepath = os.path.join(base_path, file_name)
         if not UploadUtil.check_file_exists(filepath):
             raise ServiceException(message='文件不存在')
         if delete:
             background_tasks.add_task(UploadUtil.delete_file, filepath)
         return CrudResponseModel(is_success=True, result=UploadUtil.generate_file(filepath), message='下载成功')
 
+    @classmethod
+    async def download_task_result_services(
+        cls, request: Request, background_tasks: BackgroundTasks, task_id: str, current_user: CurrentUserModel
+    ) -> CrudResponseModel:
+        """
+        下载异步任务结果文件service
+
+        :param request: Request对象
+        :param background_tasks: 后台任务对象
+        :param task_id: 任务ID
+        :param current_user: 当前用户对象
+        :return: 下载结果，message为下载时使用的文件名称
+        """
+        task = await AsyncTaskService.get_task_services(request.app.state.redis, task_id, current_user)
+        if task.status != AsyncTaskConstant.STATUS_SUCCESS or not task.file_name:
+            raise ServiceException(message='任务未执行成功或没有结果文件')
+        download_result = await cls.download_services(
+            background_tasks, task.file_name, False, UploadConfig.ASYNC_TASK_PATH
+        )
+        download_result.message = f'{task.task_name}_{task.create_time.strftime("%Y%m%d%H%M%S")}.xlsx'
+
+        return download_result
+
     @classmethod
     async def download_resource_services(cls, resource: str) -> CrudResponseModel:
         """
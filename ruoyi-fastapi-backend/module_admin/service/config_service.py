@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
 from fastapi import Request
@@ -10,8 +11,10 @@ from common.vo import CrudResponseModel, PageModel
 from exceptions.exception import ServiceException
 from module_admin.dao.config_dao import ConfigDao
 from module_admin.entity.vo.config_vo import ConfigModel, ConfigPageQueryModel, DeleteConfigModel
+from module_admin.service.sys_cache_service import SysCacheService
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
+from utils.redis_util import RedisKeyUtil
 
 
 class ConfigService:
@@ -21,17 +24,18 @@ class ConfigService:
 
     @classmethod
     async def get_config_list_services(
-        cls, query_db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, query_db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取参数配置列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 参数配置列表信息对象
         """
-        config_list_result = await ConfigDao.get_config_list(query_db, query_object, is_page)
+        config_list_result = await ConfigDao.get_config_list(query_db, query_object, is_page, is_stream)
 
         return config_list_result
 
@@ -44,16 +48,21 @@ class ConfigService:
         :param redis: redis对象
         :return:
         """
-        # 获取以sys_config:开头的键列表
-        keys = await redis.keys(f'{RedisInitKeyConfig.SYS_CONFIG.key}:*')
-        # 删除匹配的键
-        if keys:
-            await redis.delete(*keys)
+        # 与现有缓存比对，仅写入发生变化的参数配置并删除已不存在的参数配置
         config_all = await ConfigDao.get_config_list(query_db, ConfigPageQueryModel(), is_page=False)
-        for config_obj in config_all:
-            await redis.set(
-                f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_obj.get("configKey")}',
-                config_obj.get('configValue'),
+        changed_keys = await RedisKeyUtil.sync_by_pattern(
+            redis,
+            f'{RedisInitKeyConfig.SYS_CONFIG.key}:*',
+            {
+                f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_obj.get("configKey")}': config_obj.get('configValue')
+                for config_obj in config_all
+            },
+        )
+        if changed_keys:
+            await SysCacheService.invalidate(
+                redis,
+                SysCacheService.CONFIG,
+                [key.removeprefix(f'{RedisInitKeyConfig.SYS_CONFIG.key}:') for key in changed_keys],
             )
 
     @classmethod
@@ -65,9 +74,11 @@ class ConfigService:
         :param config_key: 参数键名
         :return: 参数键名对应值
         """
-        result = await redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_key}')
 
-        return result
+        async def load_config_value() -> Any:
+            return await redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_key}')
+
+        return await SysCacheService.get(SysCacheService.CONFIG, config_key, load_config_value)
 
     @classmethod
     async def check_config_key_unique_services(cls, query_db: AsyncSession, page_object: ConfigModel) -> bool:
@@ -104,6 +115,7 @@ class ConfigService:
             await request.app.state.redis.set(
                 f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}', page_object.config_value
             )
+            await SysCacheService.invalidate(request.app.state.redis, SysCacheService.CONFIG, [page_object.config_key])
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
@@ -136,6 +148,11 @@ class ConfigService:
                 await request.app.state.redis.set(
                     f'{RedisInitKeyConfig.SYS_CONFIG.key}:{page_object.config_key}', page_object.config_value
                 )
+                await SysCacheService.invalidate(
+                    request.app.state.redis,
+                    SysCacheService.CONFIG,
+                    list({config_info.config_key, page_object.config_key}),
+                )
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -159,15 +176,20 @@ class ConfigService:
             config_id_list = page_object.config_ids.split(',')
             try:
                 delete_config_key_list = []
+                delete_config_name_list = []
                 for config_id in config_id_list:
                     config_info = await cls.config_detail_services(query_db, int(config_id))
                     if config_info.config_type == CommonConstant.YES:
                         raise ServiceException(message=f'内置参数{config_info.config_key}不能删除')
                     await ConfigDao.delete_config_dao(query_db, ConfigModel(configId=int(config_id)))
                     delete_config_key_list.append(f'{RedisInitKeyConfig.SYS_CONFIG.key}:{config_info.config_key}')
+                    delete_config_name_list.append(config_info.config_key)
                 await query_db.commit()
                 if delete_config_key_list:
                     await request.app.state.redis.delete(*delete_config_key_list)
+                    await SysCacheService.invalidate(
+                        request.app.state.redis, SysCacheService.CONFIG, delete_config_name_list
+                    )
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -190,12 +212,14 @@ class ConfigService:
         return result
 
     @staticmethod
-    async def export_config_list_services(config_list: list) -> bytes:
+    async def export_config_list_services(
+        config_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出参数配置信息service
 
-        :param config_list: 参数配置信息列表
-        :return: 参数配置信息对应excel的二进制数据
+        :param config_list: 参数配置信息列表或分批获取的异步迭代器
+        :return: 参数配置信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -211,14 +235,13 @@ class ConfigService:
             'remark': '备注',
         }
 
-        for item in config_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('configType') == 'Y':
                 item['configType'] = '是'
             else:
                 item['configType'] = '否'
-        binary_data = ExcelUtil.export_list2excel(config_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(config_list, mapping_dict, format_row)
 
     @classmethod
     async def refresh_sys_config_services(cls, request: Request, query_db: AsyncSession) -> CrudResponseModel:
@@ -1,6 +1,7 @@
 from collections.abc import Sequence
 from typing import Any
 
+from fastapi import Request
 from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,6 +11,7 @@ from exceptions.exception import ServiceException, ServiceWarning
 from module_admin.dao.dept_dao import DeptDao
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.vo.dept_vo import DeleteDeptModel, DeptModel, DeptTreeModel
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from utils.common_util import CamelCaseUtil
 
 
@@ -18,6 +20,8 @@ class DeptService:
     部门管理模块服务层
     """
 
+    CHILDREN_UPDATE_BATCH_SIZE = 1000
+
     @classmethod
     async def get_dept_tree_services(
         cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement
@@ -103,10 +107,13 @@ class DeptService:
         return CommonConstant.UNIQUE
 
     @classmethod
-    async def add_dept_services(cls, query_db: AsyncSession, page_object: DeptModel) -> CrudResponseModel:
+    async def add_dept_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeptModel
+    ) -> CrudResponseModel:
         """
         新增部门信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 新增部门对象
         :return: 新增部门校验结果
@@ -118,18 +125,24 @@ class DeptService:
             raise ServiceException(message=f'部门{parent_info.dept_name}停用，不允许新增')
         page_object.ancestors = f'{parent_info.ancestors},{page_object.parent_id}'
         try:
-            await DeptDao.add_dept_dao(query_db, page_object)
+            add_dept = await DeptDao.add_dept_dao(query_db, page_object)
+            await cls.add_dept_closure(query_db, add_dept.dept_id, page_object.parent_id)
             await query_db.commit()
+            # 新增子部门会改变本部门及以下数据权限的可见部门范围
+            await PrincipalCacheService.bump_global_version(request.app.state.redis)
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    async def edit_dept_services(cls, query_db: AsyncSession, page_object: DeptModel) -> CrudResponseModel:
+    async def edit_dept_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeptModel
+    ) -> CrudResponseModel:
         """
         编辑部门信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑部门对象
         :return: 编辑部门校验结果
@@ -151,6 +164,8 @@ class DeptService:
                 old_ancestors = old_dept.ancestors
                 page_object.ancestors = new_ancestors
                 await cls.update_dept_children(query_db, page_object.dept_id, new_ancestors, old_ancestors)
+                if old_dept.parent_id != page_object.parent_id:
+                    await cls.move_dept_closure(query_db, page_object.dept_id, page_object.parent_id)
             edit_dept = page_object.model_dump(exclude_unset=True)
             await DeptDao.edit_dept_dao(query_db, edit_dept)
             if (
@@ -160,16 +175,20 @@ class DeptService:
             ):
                 await cls.update_parent_dept_status_normal(query_db, page_object)
             await query_db.commit()
+            await PrincipalCacheService.bump_global_version(request.app.state.redis)
             return CrudResponseModel(is_success=True, message='更新成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    async def delete_dept_services(cls, query_db: AsyncSession, page_object: DeleteDeptModel) -> CrudResponseModel:
+    async def delete_dept_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeleteDeptModel
+    ) -> CrudResponseModel:
         """
         删除部门信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除部门对象
         :return: 删除部门校验结果
@@ -184,7 +203,9 @@ class DeptService:
                         raise ServiceWarning(message='部门存在用户,不允许删除')
 
                     await DeptDao.delete_dept_dao(query_db, DeptModel(deptId=dept_id))
+                    await DeptDao.delete_dept_closure_dao(query_db, [int(dept_id)])
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -237,20 +258,6 @@ class DeptService:
 
         return container
 
-    @classmethod
-    async def replace_first(cls, original_str: str, old_str: str, new_str: str) -> str:
-        """
-        工具方法：替换字符串
-
-        :param original_str: 需要替换的原始字符串
-        :param old_str: 用于匹配的字符串
-        :param new_str: 替换的字符串
-        :return: 替换后的字符串
-        """
-        if original_str.startswith(old_str):
-            return original_str.replace(old_str, new_str, 1)
-        return original_str
-
     @classmethod
     async def update_parent_dept_status_normal(cls, query_db: AsyncSession, dept: DeptModel) -> None:
         """
@@ -268,7 +275,8 @@ class DeptService:
         cls, query_db: AsyncSession, dept_id: int, new_ancestors: str, old_ancestors: str
     ) -> None:
         """
-        更新子部门信息
+        更新子部门信息，子部门祖先中以当前部门旧祖先开头的部分替换为新祖先。
+        MySQL及PostgreSQL在数据库中通过一条更新语句完成替换，其他数据库按部门id分批读取子部门祖先并批量更新
 
         :param query_db: orm对象
         :param dept_id: 部门id
@@ -276,10 +284,98 @@ class DeptService:
         :param old_ancestors: 旧的祖先
         :return:
         """
-        children = await DeptDao.get_children_dept_dao(query_db, dept_id)
-        update_children = []
-        for child in children:
-            child_ancestors = await cls.replace_first(child.ancestors, old_ancestors, new_ancestors)
-            update_children.append({'dept_id': child.dept_id, 'ancestors': child_ancestors})
-        if children:
-            await DeptDao.update_dept_children_dao(query_db, update_children)
+        if new_ancestors == old_ancestors:
+            return
+        if query_db.get_bind().dialect.name in ('mysql', 'postgresql'):
+            await DeptDao.replace_children_dept_ancestors_prefix_dao(query_db, dept_id, old_ancestors, new_ancestors)
+            return
+        last_dept_id = 0
+        while children := await DeptDao.get_children_dept_ancestors_dao(
+            query_db, dept_id, old_ancestors, last_dept_id, cls.CHILDREN_UPDATE_BATCH_SIZE
+        ):
+            await DeptDao.update_dept_children_dao(
+                query_db,
+                [
+                    {'dept_id': child_id, 'ancestors': new_ancestors + child_ancestors[len(old_ancestors) :]}
+                    for child_id, child_ancestors in children
+                ],
+            )
+            last_dept_id = children[-1][0]
+
+    @classmethod
+    async def add_dept_closure(cls, query_db: AsyncSession, dept_id: int, parent_id: int) -> None:
+        """
+        新增部门闭包关系
+
+        :param query_db: orm对象
+        :param dept_id: 新增的部门id
+        :param parent_id: 父部门id
+        :return:
+        """
+        parent_ancestors = await DeptDao.get_dept_ancestor_closure_dao(query_db, parent_id)
+        closure_list = [
+            {'ancestor_id': ancestor_id, 'descendant_id': dept_id, 'depth': depth + 1}
+            for ancestor_id, depth in parent_ancestors
+        ]
+        closure_list.append({'ancestor_id': dept_id, 'descendant_id': dept_id, 'depth': 0})
+        await DeptDao.add_dept_closure_dao(query_db, closure_list)
+
+    @classmethod
+    async def move_dept_closure(cls, query_db: AsyncSession, dept_id: int, new_parent_id: int) -> None:
+        """
+        部门变更父部门后更新以该部门为根的子树的闭包关系
+
+        :param query_db: orm对象
+        :param dept_id: 部门id
+        :param new_parent_id: 新的父部门id
+        :return:
+        """
+        subtree = await DeptDao.get_dept_descendant_closure_dao(query_db, dept_id)
+        subtree_id_list = [descendant_id for descendant_id, _ in subtree]
+        # 删除子树与原祖先部门之间的关系，子树内部的关系保持不变
+        await DeptDao.delete_dept_closure_dao(query_db, subtree_id_list, exclude_ancestor_id_list=subtree_id_list)
+        new_parent_ancestors = await DeptDao.get_dept_ancestor_closure_dao(query_db, new_parent_id)
+        closure_list = [
+            {'ancestor_id': ancestor_id, 'descendant_id': descendant_id, 'depth': ancestor_depth + descendant_depth + 1}
+            for ancestor_id, ancestor_depth in new_parent_ancestors
+            for descendant_id, descendant_depth in subtree
+        ]
+        await DeptDao.add_dept_closure_dao(query_db, closure_list)
+
+    @classmethod
+    async def init_dept_closure_services(cls, query_db: AsyncSession) -> int:
+        """
+        应用启动时根据部门父子关系计算闭包表，与现有闭包表的数量或校验值不一致时重建
+
+        :param query_db: orm对象
+        :return: 重建的闭包关系数量，无需重建时返回0
+        """
+        parent_mapping = dict(await DeptDao.get_dept_closure_source_dao(query_db))
+        closure_list = []
+        for dept_id in parent_mapping:
+            ancestor_id = dept_id
+            depth = 0
+            visited_id_set = set()
+            # 沿父部门逐级向上，父部门不存在或再次经过已访问的部门（出现环）时终止，避免生成重复的闭包关系
+            while ancestor_id in parent_mapping and ancestor_id not in visited_id_set:
+                visited_id_set.add(ancestor_id)
+                closure_list.append({'ancestor_id': ancestor_id, 'descendant_id': dept_id, 'depth': depth})
+                ancestor_id = parent_mapping[ancestor_id]
+                depth += 1
+        # 比对闭包关系数量及各字段合计，部门移动后闭包表未同步等关系错误时同样会触发重建
+        expected_checksum = (
+            len(closure_list),
+            sum(closure['ancestor_id'] for closure in closure_list),
+            sum(closure['descendant_id'] for closure in closure_list),
+            sum(closure['depth'] for closure in closure_list),
+        )
+        if expected_checksum == await DeptDao.get_dept_closure_checksum_dao(query_db):
+            return 0
+        try:
+            await DeptDao.clear_dept_closure_dao(query_db)
+            await DeptDao.add_dept_closure_dao(query_db, closure_list)
+            await query_db.commit()
+            return len(closure_list)
+        except Exception as e:
+            await query_db.rollback()
+            raise e
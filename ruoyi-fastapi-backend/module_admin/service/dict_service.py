@@ -1,5 +1,5 @@
 import json
-from collections.abc import Sequence
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
 from typing import Any
 
 from fastapi import Request
@@ -20,8 +20,10 @@ from module_admin.entity.vo.dict_vo import (
     DictTypeModel,
     DictTypePageQueryModel,
 )
+from module_admin.service.sys_cache_service import SysCacheService
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
+from utils.redis_util import RedisKeyUtil
 
 
 class DictTypeService:
@@ -31,17 +33,22 @@ class DictTypeService:
 
     @classmethod
     async def get_dict_type_list_services(
-        cls, query_db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls,
+        query_db: AsyncSession,
+        query_object: DictTypePageQueryModel,
+        is_page: bool = False,
+        is_stream: bool = False,
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取字典类型列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 字典类型列表信息对象
         """
-        dict_type_list_result = await DictTypeDao.get_dict_type_list(query_db, query_object, is_page)
+        dict_type_list_result = await DictTypeDao.get_dict_type_list(query_db, query_object, is_page, is_stream)
 
         return dict_type_list_result
 
@@ -80,6 +87,7 @@ class DictTypeService:
             await DictTypeDao.add_dict_type_dao(query_db, page_object)
             await query_db.commit()
             await request.app.state.redis.set(f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}', '')
+            await SysCacheService.invalidate(request.app.state.redis, SysCacheService.DICT, [page_object.dict_type])
             result = {'is_success': True, 'message': '新增成功'}
         except Exception as e:
             await query_db.rollback()
@@ -124,6 +132,9 @@ class DictTypeService:
                         f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                         json.dumps(dict_data, ensure_ascii=False, default=str),
                     )
+                    await SysCacheService.invalidate(
+                        request.app.state.redis, SysCacheService.DICT, [page_object.dict_type]
+                    )
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -147,15 +158,20 @@ class DictTypeService:
             dict_id_list = page_object.dict_ids.split(',')
             try:
                 delete_dict_type_list = []
+                delete_dict_type_name_list = []
                 for dict_id in dict_id_list:
                     dict_type_into = await cls.dict_type_detail_services(query_db, int(dict_id))
                     if (await DictDataDao.count_dict_data_dao(query_db, dict_type_into.dict_type)) > 0:
                         raise ServiceException(message=f'{dict_type_into.dict_name}已分配，不能删除')
                     await DictTypeDao.delete_dict_type_dao(query_db, DictTypeModel(dictId=int(dict_id)))
                     delete_dict_type_list.append(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type_into.dict_type}')
+                    delete_dict_type_name_list.append(dict_type_into.dict_type)
                 await query_db.commit()
                 if delete_dict_type_list:
                     await request.app.state.redis.delete(*delete_dict_type_list)
+                    await SysCacheService.invalidate(
+                        request.app.state.redis, SysCacheService.DICT, delete_dict_type_name_list
+                    )
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -178,12 +194,14 @@ class DictTypeService:
         return result
 
     @staticmethod
-    async def export_dict_type_list_services(dict_type_list: list) -> bytes:
+    async def export_dict_type_list_services(
+        dict_type_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出字典类型信息service
 
-        :param dict_type_list: 字典信息列表
-        :return: 字典信息对应excel的二进制数据
+        :param dict_type_list: 字典信息列表或分批获取的异步迭代器
+        :return: 字典信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -198,14 +216,13 @@ class DictTypeService:
             'remark': '备注',
         }
 
-        for item in dict_type_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
                 item['status'] = '停用'
-        binary_data = ExcelUtil.export_list2excel(dict_type_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(dict_type_list, mapping_dict, format_row)
 
     @classmethod
     async def refresh_sys_dict_services(cls, request: Request, query_db: AsyncSession) -> CrudResponseModel:
@@ -229,17 +246,22 @@ class DictDataService:
 
     @classmethod
     async def get_dict_data_list_services(
-        cls, query_db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls,
+        query_db: AsyncSession,
+        query_object: DictDataPageQueryModel,
+        is_page: bool = False,
+        is_stream: bool = False,
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取字典数据列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 字典数据列表信息对象
         """
-        dict_data_list_result = await DictDataDao.get_dict_data_list(query_db, query_object, is_page)
+        dict_data_list_result = await DictDataDao.get_dict_data_list(query_db, query_object, is_page, is_stream)
 
         return dict_data_list_result
 
@@ -265,19 +287,27 @@ class DictDataService:
         :param redis: redis对象
         :return:
         """
-        # 获取以sys_dict:开头的键列表
-        keys = await redis.keys(f'{RedisInitKeyConfig.SYS_DICT.key}:*')
-        # 删除匹配的键
-        if keys:
-            await redis.delete(*keys)
-        dict_type_all = await DictTypeDao.get_all_dict_type(query_db)
-        for dict_type_obj in [item for item in dict_type_all if item.status == '0']:
-            dict_type = dict_type_obj.dict_type
-            dict_data_list = await DictDataDao.query_dict_data_list(query_db, dict_type)
-            dict_data = [CamelCaseUtil.transform_result(row) for row in dict_data_list if row]
-            await redis.set(
-                f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}',
-                json.dumps(dict_data, ensure_ascii=False, default=str),
+        # 一次查询所有字典数据后在内存中按字典类型分组，再与现有缓存比对，仅写入发生变化的字典类型
+        dict_data_group: dict[str, list[dict[str, Any]]] = {}
+        for dict_type, dict_data in await DictDataDao.get_all_enabled_dict_data(query_db):
+            dict_data_list = dict_data_group.setdefault(dict_type, [])
+            if dict_data:
+                dict_data_list.append(CamelCaseUtil.transform_result(dict_data))
+        changed_keys = await RedisKeyUtil.sync_by_pattern(
+            redis,
+            f'{RedisInitKeyConfig.SYS_DICT.key}:*',
+            {
+                f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}': json.dumps(
+                    dict_data_list, ensure_ascii=False, default=str
+                )
+                for dict_type, dict_data_list in dict_data_group.items()
+            },
+        )
+        if changed_keys:
+            await SysCacheService.invalidate(
+                redis,
+                SysCacheService.DICT,
+                [key.removeprefix(f'{RedisInitKeyConfig.SYS_DICT.key}:') for key in changed_keys],
             )
 
     @classmethod
@@ -291,12 +321,16 @@ class DictDataService:
         :param dict_type: 字典类型
         :return: 字典数据列表信息对象
         """
-        result = []
-        dict_data_list_result = await redis.get(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}')
-        if dict_data_list_result:
-            result = json.loads(dict_data_list_result)
 
-        return CamelCaseUtil.transform_result(result)
+        async def load_dict_data_list() -> list[dict[str, Any]]:
+            result = []
+            dict_data_list_result = await redis.get(f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}')
+            if dict_data_list_result:
+                result = json.loads(dict_data_list_result)
+
+            return CamelCaseUtil.transform_result(result)
+
+        return await SysCacheService.get(SysCacheService.DICT, dict_type, load_dict_data_list)
 
     @classmethod
     async def check_dict_data_unique_services(cls, query_db: AsyncSession, page_object: DictDataModel) -> bool:
@@ -337,6 +371,7 @@ class DictDataService:
                 f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                 json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
             )
+            await SysCacheService.invalidate(request.app.state.redis, SysCacheService.DICT, [page_object.dict_type])
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
@@ -369,6 +404,7 @@ class DictDataService:
                     f'{RedisInitKeyConfig.SYS_DICT.key}:{page_object.dict_type}',
                     json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                 )
+                await SysCacheService.invalidate(request.app.state.redis, SysCacheService.DICT, [page_object.dict_type])
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -403,6 +439,9 @@ class DictDataService:
                         f'{RedisInitKeyConfig.SYS_DICT.key}:{dict_type}',
                         json.dumps(CamelCaseUtil.transform_result(dict_data_list), ensure_ascii=False, default=str),
                     )
+                await SysCacheService.invalidate(
+                    request.app.state.redis, SysCacheService.DICT, list(set(delete_dict_type_list))
+                )
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -425,12 +464,14 @@ class DictDataService:
         return result
 
     @staticmethod
-    async def export_dict_data_list_services(dict_data_list: list) -> bytes:
+    async def export_dict_data_list_services(
+        dict_data_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出字典数据信息service
 
-        :param dict_data_list: 字典数据信息列表
-        :return: 字典数据信息对应excel的二进制数据
+        :param dict_data_list: 字典数据信息列表或分批获取的异步迭代器
+        :return: 字典数据信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -450,7 +491,7 @@ class DictDataService:
             'remark': '备注',
         }
 
-        for item in dict_data_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -459,6 +500,5 @@ class DictDataService:
                 item['isDefault'] = '是'
             else:
                 item['isDefault'] = '否'
-        binary_data = ExcelUtil.export_list2excel(dict_data_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(dict_data_list, mapping_dict, format_row)
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
 from fastapi import Request
@@ -18,17 +19,18 @@ class JobLogService:
 
     @classmethod
     async def get_job_log_list_services(
-        cls, query_db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, query_db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取定时任务日志列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 定时任务日志列表信息对象
         """
-        job_log_list_result = await JobLogDao.get_job_log_list(query_db, query_object, is_page)
+        job_log_list_result = await JobLogDao.get_job_log_list(query_db, query_object, is_page, is_stream)
 
         return job_log_list_result
 
@@ -93,13 +95,15 @@ class JobLogService:
         return CrudResponseModel(**result)
 
     @staticmethod
-    async def export_job_log_list_services(request: Request, job_log_list: list) -> bytes:
+    async def export_job_log_list_services(
+        request: Request, job_log_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]]
+    ) -> AsyncIterator[bytes]:
         """
         导出定时任务日志信息service
 
         :param request: Request对象
-        :param job_log_list: 定时任务日志信息列表
-        :return: 定时任务日志信息对应excel的二进制数据
+        :param job_log_list: 定时任务日志信息列表或分批获取的异步迭代器
+        :return: 定时任务日志信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -130,7 +134,7 @@ class JobLogService:
         ]
         job_executor_option_dict = {item.get('value'): item for item in job_executor_option}
 
-        for item in job_log_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -139,6 +143,5 @@ class JobLogService:
                 item['jobGroup'] = job_group_option_dict.get(str(item.get('jobGroup'))).get('label')
             if str(item.get('jobExecutor')) in job_executor_option_dict:
                 item['jobExecutor'] = job_executor_option_dict.get(str(item.get('jobExecutor'))).get('label')
-        binary_data = ExcelUtil.export_list2excel(job_log_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(job_log_list, mapping_dict, format_row)
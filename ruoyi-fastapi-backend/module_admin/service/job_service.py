@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
 from fastapi import Request
@@ -23,17 +24,18 @@ class JobService:
 
     @classmethod
     async def get_job_list_services(
-        cls, query_db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, query_db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取定时任务列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 定时任务列表信息对象
         """
-        job_list_result = await JobDao.get_job_list(query_db, query_object, is_page)
+        job_list_result = await JobDao.get_job_list(query_db, query_object, is_page, is_stream)
 
         return job_list_result
 
@@ -208,13 +210,15 @@ class JobService:
         return result
 
     @staticmethod
-    async def export_job_list_services(request: Request, job_list: list) -> bytes:
+    async def export_job_list_services(
+        request: Request, job_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]]
+    ) -> AsyncIterator[bytes]:
         """
         导出定时任务信息service
 
         :param request: Request对象
-        :param job_list: 定时任务信息列表
-        :return: 定时任务信息对应excel的二进制数据
+        :param job_list: 定时任务信息列表或分批获取的异步迭代器
+        :return: 定时任务信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -249,7 +253,7 @@ class JobService:
         ]
         job_executor_option_dict = {item.get('value'): item for item in job_executor_option}
 
-        for item in job_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -268,6 +272,5 @@ class JobService:
                 item['concurrent'] = '允许'
             else:
                 item['concurrent'] = '禁止'
-        binary_data = ExcelUtil.export_list2excel(job_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(job_list, mapping_dict, format_row)
@@ -1,8 +1,11 @@
 import asyncio
 import hashlib
 import json
+import math
 import os
+import time
 import uuid
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
 from fastapi import Request
@@ -11,7 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import CrudResponseModel, PageModel
 from config.database import AsyncSessionLocal
-from config.env import LogConfig
+from config.env import AppConfig, LogConfig
 from exceptions.exception import ServiceException
 from middlewares.trace_middleware.ctx import TraceCtx
 from module_admin.dao.log_dao import LoginLogDao, OperationLogDao
@@ -24,9 +27,12 @@ from module_admin.entity.vo.log_vo import (
     OperLogPageQueryModel,
     UnlockUser,
 )
+from module_admin.entity.vo.server_vo import LogAggregatorMetricsModel
 from module_admin.service.dict_service import DictDataService
 from utils.excel_util import ExcelUtil
+from utils.ip_location_util import UNKNOWN_LOCATION, IpLocationUtil
 from utils.log_util import logger
+from utils.redis_util import RedisKeyUtil
 
 
 class OperationLogService:
@@ -36,17 +42,20 @@ class OperationLogService:
 
     @classmethod
     async def get_operation_log_list_services(
-        cls, query_db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, query_db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取操作日志列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 操作日志列表信息对象
         """
-        operation_log_list_result = await OperationLogDao.get_operation_log_list(query_db, query_object, is_page)
+        operation_log_list_result = await OperationLogDao.get_operation_log_list(
+            query_db, query_object, is_page, is_stream
+        )
 
         return operation_log_list_result
 
@@ -108,13 +117,15 @@ class OperationLogService:
             raise e
 
     @classmethod
-    async def export_operation_log_list_services(cls, request: Request, operation_log_list: list) -> bytes:
+    async def export_operation_log_list_services(
+        cls, request: Request, operation_log_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]]
+    ) -> AsyncIterator[bytes]:
         """
         导出操作日志信息service
 
         :param request: Request对象
-        :param operation_log_list: 操作日志信息列表
-        :return: 操作日志信息对应excel的二进制数据
+        :param operation_log_list: 操作日志信息列表或分批获取的异步迭代器
+        :return: 操作日志信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -144,16 +155,15 @@ class OperationLogService:
         ]
         operation_type_option_dict = {item.get('value'): item for item in operation_type_option}
 
-        for item in operation_log_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == 0:
                 item['status'] = '成功'
             else:
                 item['status'] = '失败'
             if str(item.get('businessType')) in operation_type_option_dict:
                 item['businessType'] = operation_type_option_dict.get(str(item.get('businessType'))).get('label')
-        binary_data = ExcelUtil.export_list2excel(operation_log_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(operation_log_list, mapping_dict, format_row)
 
 
 class LoginLogService:
@@ -163,17 +173,22 @@ class LoginLogService:
 
     @classmethod
     async def get_login_log_list_services(
-        cls, query_db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls,
+        query_db: AsyncSession,
+        query_object: LoginLogPageQueryModel,
+        is_page: bool = False,
+        is_stream: bool = False,
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取登录日志列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 登录日志列表信息对象
         """
-        operation_log_list_result = await LoginLogDao.get_login_log_list(query_db, query_object, is_page)
+        operation_log_list_result = await LoginLogDao.get_login_log_list(query_db, query_object, is_page, is_stream)
 
         return operation_log_list_result
 
@@ -243,12 +258,14 @@ class LoginLogService:
         raise ServiceException(message='该用户未锁定')
 
     @staticmethod
-    async def export_login_log_list_services(login_log_list: list) -> bytes:
+    async def export_login_log_list_services(
+        login_log_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出登录日志信息service
 
-        :param login_log_list: 登录日志信息列表
-        :return: 登录日志信息对应excel的二进制数据
+        :param login_log_list: 登录日志信息列表或分批获取的异步迭代器
+        :return: 登录日志信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -263,14 +280,13 @@ class LoginLogService:
             'loginTime': '登录日期',
         }
 
-        for item in login_log_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '成功'
             else:
                 item['status'] = '失败'
-        binary_data = ExcelUtil.export_list2excel(login_log_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(login_log_list, mapping_dict, format_row)
 
 
 class LogQueueService:
@@ -349,6 +365,61 @@ class LogQueueService:
         await cls._xadd_event(request.app.state.redis, 'operation', payload, source)
 
 
+class LogAggregatorMetrics:
+    """
+    日志聚合消费指标
+    """
+
+    def __init__(self) -> None:
+        self.processed_count = 0
+        self.flush_count = 0
+        self.flush_latency_total_ms = 0.0
+        self.flush_latency_max_ms = 0.0
+        self.batch_size = LogConfig.log_stream_batch_size
+        self._window_processed_count = 0
+        self._window_start = time.monotonic()
+
+    def record_flush(self, message_count: int, latency_ms: float) -> None:
+        """
+        记录一次落库结果
+
+        :param message_count: 本次处理的消息数量
+        :param latency_ms: 本次落库耗时（毫秒）
+        :return: None
+        """
+        self.processed_count += message_count
+        self._window_processed_count += message_count
+        self.flush_count += 1
+        self.flush_latency_total_ms += latency_ms
+        self.flush_latency_max_ms = max(self.flush_latency_max_ms, latency_ms)
+
+    def snapshot(self, lag: int, pending: int, consumer_count: int) -> dict[str, Any]:
+        """
+        生成当前统计窗口的指标快照并开启新的统计窗口
+
+        :param lag: 消费组积压消息数量
+        :param pending: 消费组已读取未确认的消息数量
+        :param consumer_count: 当前消费者数量
+        :return: 指标快照
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._window_start, 1e-6)
+        metrics = {
+            'lag': lag,
+            'pending': pending,
+            'consumer_count': consumer_count,
+            'batch_size': self.batch_size,
+            'throughput': round(self._window_processed_count / elapsed, 2),
+            'processed_count': self.processed_count,
+            'flush_latency_avg_ms': round(self.flush_latency_total_ms / self.flush_count, 2) if self.flush_count else 0,
+            'flush_latency_max_ms': round(self.flush_latency_max_ms, 2),
+        }
+        self._window_processed_count = 0
+        self._window_start = now
+        self.flush_latency_max_ms = 0.0
+        return metrics
+
+
 class LogAggregatorService:
     """
     日志聚合消费服务
@@ -374,39 +445,44 @@ class LogAggregatorService:
                 raise
 
     @classmethod
-    async def _acquire_dedup(cls, redis: aioredis.Redis, event_id: str) -> bool:
+    async def _acquire_dedup_batch(cls, redis: aioredis.Redis, event_id_list: list[str]) -> list[bool]:
         """
-        获取去重锁
+        批量获取去重锁，所有SET NX命令通过一次管道往返完成
 
         :param redis: Redis连接对象
-        :param event_id: 事件唯一标识
-        :return: 是否获取成功
-        """
-        if not event_id:
-            return False
-        key = f'{LogConfig.log_stream_dedup_prefix}:{event_id}'
-        return await redis.set(key, '1', nx=True, ex=LogConfig.log_stream_dedup_ttl)
+        :param event_id_list: 事件唯一标识列表
+        :return: 与事件唯一标识列表一一对应的获取结果
+        """
+        if not event_id_list:
+            return []
+        async with redis.pipeline(transaction=False) as pipe:
+            for event_id in event_id_list:
+                pipe.set(
+                    f'{LogConfig.log_stream_dedup_prefix}:{event_id}', '1', nx=True, ex=LogConfig.log_stream_dedup_ttl
+                )
+            return [bool(acquired) for acquired in await pipe.execute()]
 
     @classmethod
-    async def _release_dedup(cls, redis: aioredis.Redis, event_id: str) -> None:
+    async def _release_dedup_batch(cls, redis: aioredis.Redis, event_id_list: list[str]) -> None:
         """
-        释放去重锁
+        批量释放去重锁
 
         :param redis: Redis连接对象
-        :param event_id: 事件唯一标识
+        :param event_id_list: 事件唯一标识列表
         :return: None
         """
-        if not event_id:
+        if not event_id_list:
             return
-        await redis.delete(f'{LogConfig.log_stream_dedup_prefix}:{event_id}')
+        await redis.delete(*[f'{LogConfig.log_stream_dedup_prefix}:{event_id}' for event_id in event_id_list])
 
     @classmethod
-    async def _claim_pending(cls, redis: aioredis.Redis, consumer_name: str) -> None:
+    async def _claim_pending(cls, redis: aioredis.Redis, consumer_name: str, metrics: LogAggregatorMetrics) -> None:
         """
         认领并处理超时未确认的消息
 
         :param redis: Redis连接对象
         :param consumer_name: 消费者名称
+        :param metrics: 消费指标对象
         :return: None
         """
         if LogConfig.log_stream_claim_idle_ms <= 0:
@@ -425,7 +501,7 @@ class LogAggregatorService:
                 return
             next_start_id, messages = result[0], result[1]
             if messages:
-                await cls._process_messages(redis, LogConfig.log_stream_key, messages)
+                await cls._flush_messages(redis, LogConfig.log_stream_key, messages, metrics)
             if not messages or next_start_id == start_id:
                 return
             start_id = next_start_id
@@ -435,34 +511,207 @@ class LogAggregatorService:
         """
         消费日志队列
 
+        根据消费组积压情况在1到log_stream_max_consumers之间动态调整消费者数量，
+        并定期将积压、吞吐量及落库耗时等指标写入Redis
+
         :param redis: Redis连接对象
         :return: None
         """
         await cls._ensure_group(redis)
-        consumer_name = f'{LogConfig.log_stream_consumer_prefix}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+        worker_name = f'{LogConfig.log_stream_consumer_prefix}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+        metrics = LogAggregatorMetrics()
+        consumers: list[tuple[asyncio.Task, asyncio.Event]] = []
+        try:
+            while True:
+                # 清理异常退出的消费者，下一轮按需重新创建
+                consumers = [(task, stop_event) for task, stop_event in consumers if not task.done()]
+                try:
+                    lag, pending = await cls._get_group_backlog(redis)
+                    target_count = min(
+                        max(LogConfig.log_stream_max_consumers, 1),
+                        max(math.ceil(lag / max(LogConfig.log_stream_scale_lag, 1)), 1),
+                    )
+                    while len(consumers) < target_count:
+                        stop_event = asyncio.Event()
+                        # 仅首个消费者负责认领超时未确认的消息，避免多个消费者重复认领
+                        task = asyncio.create_task(
+                            cls._consume(redis, f'{worker_name}-{len(consumers)}', not consumers, metrics, stop_event)
+                        )
+                        consumers.append((task, stop_event))
+                    while len(consumers) > target_count:
+                        # 缩容时通知消费者在处理完当前批次后退出，避免处理中的消息被取消
+                        consumers.pop()[1].set()
+                    await cls._publish_metrics(redis, worker_name, metrics.snapshot(lag, pending, len(consumers)))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.error(f'日志聚合消费者调度异常: {exc}')
+                    if not consumers:
+                        stop_event = asyncio.Event()
+                        task = asyncio.create_task(cls._consume(redis, f'{worker_name}-0', True, metrics, stop_event))
+                        consumers.append((task, stop_event))
+                await asyncio.sleep(LogConfig.log_stream_scale_interval_ms / 1000)
+        finally:
+            for _, stop_event in consumers:
+                stop_event.set()
+            running_tasks = {task for task, _ in consumers}
+            if running_tasks:
+                # 等待消费者处理完当前批次后退出，超时仍未退出的再取消
+                _, running_tasks = await asyncio.wait(running_tasks, timeout=LogConfig.log_stream_block_ms / 1000 + 1)
+            for task in running_tasks:
+                task.cancel()
+            await asyncio.gather(*running_tasks, return_exceptions=True)
+
+    @classmethod
+    async def _consume(
+        cls,
+        redis: aioredis.Redis,
+        consumer_name: str,
+        claim_enabled: bool,
+        metrics: LogAggregatorMetrics,
+        stop_event: asyncio.Event,
+    ) -> None:
+        """
+        单个消费者的消费循环，每次读取的消息数量根据上一批次是否读满自适应调整
+
+        :param redis: Redis连接对象
+        :param consumer_name: 消费者名称
+        :param claim_enabled: 是否负责认领超时未确认的消息
+        :param metrics: 消费指标对象
+        :param stop_event: 停止消费事件
+        :return: None
+        """
+        batch_size = LogConfig.log_stream_batch_size
         last_claim_time = 0.0
+        retry_delay = 1
         while True:
+            if stop_event.is_set():
+                return
             try:
                 now = asyncio.get_running_loop().time()
-                if now - last_claim_time >= LogConfig.log_stream_claim_interval_ms / 1000:
-                    await cls._claim_pending(redis, consumer_name)
+                if claim_enabled and now - last_claim_time >= LogConfig.log_stream_claim_interval_ms / 1000:
+                    await cls._claim_pending(redis, consumer_name, metrics)
                     last_claim_time = now
                 result = await redis.xreadgroup(
                     groupname=LogConfig.log_stream_group,
                     consumername=consumer_name,
                     streams={LogConfig.log_stream_key: '>'},
-                    count=LogConfig.log_stream_batch_size,
+                    count=batch_size,
                     block=LogConfig.log_stream_block_ms,
                 )
-                if not result:
-                    continue
-                for stream_name, messages in result:
-                    await cls._process_messages(redis, stream_name, messages)
+                message_count = 0
+                for stream_name, messages in result or []:
+                    await cls._flush_messages(redis, stream_name, messages, metrics)
+                    message_count += len(messages)
+                if message_count >= batch_size:
+                    batch_size = min(batch_size * 2, max(LogConfig.log_stream_max_batch_size, batch_size))
+                elif message_count < batch_size // 2:
+                    batch_size = max(batch_size // 2, LogConfig.log_stream_batch_size)
+                metrics.batch_size = batch_size
+                retry_delay = 1
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
                 logger.error(f'日志聚合消费异常: {exc}')
-                await asyncio.sleep(1)
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+    @classmethod
+    async def _get_group_backlog(cls, redis: aioredis.Redis) -> tuple[int, int]:
+        """
+        获取消费组积压情况
+
+        :param redis: Redis连接对象
+        :return: 尚未投递的消息数量及已投递未确认的消息数量
+        """
+        for group in await redis.xinfo_groups(LogConfig.log_stream_key):
+            if group.get('name') == LogConfig.log_stream_group:
+                # lag字段需要Redis 7.0及以上版本，低版本时仅根据pending判断
+                return int(group.get('lag') or 0), int(group.get('pending') or 0)
+        return 0, 0
+
+    @classmethod
+    async def _publish_metrics(cls, redis: aioredis.Redis, worker_name: str, metrics: dict[str, Any]) -> None:
+        """
+        上报消费指标到Redis
+
+        :param redis: Redis连接对象
+        :param worker_name: 消费进程名称
+        :param metrics: 指标快照
+        :return: None
+        """
+        metrics_key = f'{LogConfig.log_stream_metrics_prefix}:{worker_name}'
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(metrics_key, mapping=metrics)
+            pipe.pexpire(metrics_key, LogConfig.log_stream_scale_interval_ms * 3)
+            await pipe.execute()
+
+    @classmethod
+    async def get_metrics(cls, redis: aioredis.Redis) -> list[LogAggregatorMetricsModel]:
+        """
+        获取所有消费进程上报的消费指标，各消费进程的指标通过一次管道往返读取
+
+        :param redis: Redis连接对象
+        :return: 消费指标列表
+        """
+        metrics_prefix = f'{LogConfig.log_stream_metrics_prefix}:'
+        metrics_keys = sorted(await RedisKeyUtil.scan_keys(redis, f'{metrics_prefix}*'))
+        if not metrics_keys:
+            return []
+        async with redis.pipeline(transaction=False) as pipe:
+            for metrics_key in metrics_keys:
+                pipe.hgetall(metrics_key)
+            metrics_list = await pipe.execute()
+        # 指标键在扫描与读取之间可能已过期，过期的键读取结果为空
+        return [
+            LogAggregatorMetricsModel(worker=metrics_key.removeprefix(metrics_prefix), **metrics)
+            for metrics_key, metrics in zip(metrics_keys, metrics_list, strict=False)
+            if metrics
+        ]
+
+    @classmethod
+    async def _flush_messages(
+        cls, redis: aioredis.Redis, stream_name: str, messages: list[tuple[str, dict]], metrics: LogAggregatorMetrics
+    ) -> None:
+        """
+        处理消息并记录落库耗时
+
+        :param redis: Redis连接对象
+        :param stream_name: Stream名称
+        :param messages: 消息列表
+        :param metrics: 消费指标对象
+        :return: None
+        """
+        if not messages:
+            return
+        start_time = time.perf_counter()
+        await cls._process_messages(redis, stream_name, messages)
+        metrics.record_flush(len(messages), (time.perf_counter() - start_time) * 1000)
+
+    @classmethod
+    async def _fill_ip_location(
+        cls, login_log_list: list[LogininforModel], operation_log_list: list[OperLogModel]
+    ) -> None:
+        """
+        补充请求时未查询的IP归属区域，同一批次内相同ip只查询一次
+
+        :param login_log_list: 登录日志列表
+        :param operation_log_list: 操作日志列表
+        :return: None
+        """
+        if not AppConfig.app_ip_location_query:
+            return
+        login_logs = [log for log in login_log_list if log.login_location is None]
+        operation_logs = [log for log in operation_log_list if log.oper_location is None]
+        if not login_logs and not operation_logs:
+            return
+        location_dict = await IpLocationUtil.resolve_batch(
+            [log.ipaddr for log in login_logs] + [log.oper_ip for log in operation_logs]
+        )
+        for login_log in login_logs:
+            login_log.login_location = location_dict.get(login_log.ipaddr, UNKNOWN_LOCATION)
+        for operation_log in operation_logs:
+            operation_log.oper_location = location_dict.get(operation_log.oper_ip, UNKNOWN_LOCATION)
 
     @classmethod
     async def _process_messages(cls, redis: aioredis.Redis, stream_name: str, messages: list[tuple[str, dict]]) -> None:
@@ -476,33 +725,39 @@ class LogAggregatorService:
         """
         if not messages:
             return
+        ack_ids: list[str] = []
+        candidate_list: list[tuple[str, str, str, str]] = []
+        for message_id, data in messages:
+            event_type = data.get('event_type')
+            event_id = data.get('event_id')
+            if event_type not in {'login', 'operation'} or not event_id:
+                ack_ids.append(message_id)
+                continue
+            candidate_list.append((message_id, event_type, event_id, data.get('payload') or '{}'))
+        acquired_list = await cls._acquire_dedup_batch(redis, [event_id for _, _, event_id, _ in candidate_list])
+        dedup_event_ids: list[str] = []
+        login_log_list: list[LogininforModel] = []
+        operation_log_list: list[OperLogModel] = []
         async with AsyncSessionLocal() as session:
-            ack_ids: list[str] = []
-            dedup_event_ids: list[str] = []
             try:
-                for message_id, data in messages:
-                    event_type = data.get('event_type')
-                    event_id = data.get('event_id')
-                    payload_raw = data.get('payload') or '{}'
-                    if event_type not in {'login', 'operation'}:
-                        ack_ids.append(message_id)
-                        continue
-                    acquired = await cls._acquire_dedup(redis, event_id)
-                    if not acquired:
-                        ack_ids.append(message_id)
-                        continue
-                    dedup_event_ids.append(event_id)
-                    payload = json.loads(payload_raw)
-                    if event_type == 'login':
-                        await LoginLogDao.add_login_log_dao(session, LogininforModel(**payload))
-                    elif event_type == 'operation':
-                        await OperationLogDao.add_operation_log_dao(session, OperLogModel(**payload))
+                for (message_id, event_type, event_id, payload_raw), acquired in zip(
+                    candidate_list, acquired_list, strict=True
+                ):
+                    if acquired:
+                        dedup_event_ids.append(event_id)
+                        payload = json.loads(payload_raw)
+                        if event_type == 'login':
+                            login_log_list.append(LogininforModel(**payload))
+                        else:
+                            operation_log_list.append(OperLogModel(**payload))
                     ack_ids.append(message_id)
+                await cls._fill_ip_location(login_log_list, operation_log_list)
+                await LoginLogDao.add_login_log_batch_dao(session, login_log_list)
+                await OperationLogDao.add_operation_log_batch_dao(session, operation_log_list)
                 if ack_ids:
                     await session.commit()
                     await redis.xack(stream_name, LogConfig.log_stream_group, *ack_ids)
             except Exception:
                 await session.rollback()
-                for event_id in dedup_event_ids:
-                    await cls._release_dedup(redis, event_id)
+                await cls._release_dedup_batch(redis, dedup_event_ids)
                 raise
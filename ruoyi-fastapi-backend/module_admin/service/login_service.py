@@ -18,12 +18,18 @@ from config.env import AppConfig, JwtConfig
 from config.get_db import get_db
 from exceptions.exception import AuthException, LoginException, ServiceException
 from module_admin.dao.login_dao import login_by_account
+from module_admin.dao.menu_dao import MenuDao
 from module_admin.dao.user_dao import UserDao
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.do.user_do import SysUser
-from module_admin.entity.vo.login_vo import MenuTreeModel, MetaModel, RouterModel, SmsCode, UserLogin, UserRegister
+from module_admin.entity.vo.login_vo import MetaModel, RouterModel, SmsCode, UserLogin, UserRegister
 from module_admin.entity.vo.user_vo import AddUserModel, CurrentUserModel, ResetUserModel, TokenData, UserInfoModel
+from module_admin.service.config_service import ConfigService
+from module_admin.service.menu_service import MenuService
+from module_admin.service.online_service import OnlineService
+from module_admin.service.principal_cache_service import PrincipalCacheService
+from module_admin.service.role_menu_index_service import RoleMenuIndexService
 from module_admin.service.user_service import UserService
 from utils.common_util import CamelCaseUtil
 from utils.log_util import logger
@@ -80,13 +86,6 @@ class LoginService:
         :param login_user: 登录用户对象
         :return: 校验结果
         """
-        await cls.__check_login_ip(request)
-        account_lock = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}'
-        )
-        if login_user.user_name == account_lock:
-            logger.warning('账号已锁定，请稍后再试')
-            raise LoginException(data='', message='账号已锁定，请稍后再试')
         # 判断请求是否来自于api文档，如果是返回指定格式的结果，用于修复api文档认证成功后token显示undefined的bug
         request_from_swagger = (
             request.headers.get('referer').endswith('docs') if request.headers.get('referer') else False
@@ -95,38 +94,42 @@ class LoginService:
             request.headers.get('referer').endswith('redoc') if request.headers.get('referer') else False
         )
         # 判断是否开启验证码，开启则验证，否则不验证（dev模式下来自API文档的登录请求不检验）
-        if not login_user.captcha_enabled or (
+        captcha_check_enabled = login_user.captcha_enabled and not (
             (request_from_swagger or request_from_redoc) and AppConfig.app_env == 'dev'
-        ):
-            pass
-        else:
-            await cls.__check_login_captcha(request, login_user)
+        )
+        # 登录ip黑名单读取进程内缓存，账号锁定状态及验证码合并为一次批量读取
+        black_ip_value = await ConfigService.query_config_list_from_cache_services(
+            request.app.state.redis, 'sys.login.blackIPList'
+        )
+        account_lock, captcha_value = await request.app.state.redis.mget(
+            f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}',
+            f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{login_user.uuid}',
+        )
+        cls.__check_login_ip(request, black_ip_value)
+        if login_user.user_name == account_lock:
+            logger.warning('账号已锁定，请稍后再试')
+            raise LoginException(data='', message='账号已锁定，请稍后再试')
+        if captcha_check_enabled:
+            cls.__check_login_captcha(login_user, captcha_value)
         user = await login_by_account(query_db, login_user.user_name)
         if not user:
             logger.warning('用户不存在')
             raise LoginException(data='', message='用户不存在')
-        if not PwdUtil.verify_password(login_user.password, user[0].password):
-            cache_password_error_count = await request.app.state.redis.get(
-                f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
-            )
-            password_error_counted = 0
-            if cache_password_error_count:
-                password_error_counted = cache_password_error_count
-            password_error_count = int(password_error_counted) + 1
-            await request.app.state.redis.set(
-                f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}',
-                password_error_count,
-                ex=timedelta(minutes=10),
-            )
+        if not await PwdUtil.verify_password(login_user.password, user[0].password):
+            password_error_count_key = f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
+            async with request.app.state.redis.pipeline(transaction=False) as pipe:
+                pipe.incr(password_error_count_key)
+                pipe.expire(password_error_count_key, timedelta(minutes=10))
+                password_error_count, _ = await pipe.execute()
             if password_error_count > CommonConstant.PASSWORD_ERROR_COUNT:
-                await request.app.state.redis.delete(
-                    f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
-                )
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}',
-                    login_user.user_name,
-                    ex=timedelta(minutes=10),
-                )
+                async with request.app.state.redis.pipeline(transaction=False) as pipe:
+                    pipe.delete(password_error_count_key)
+                    pipe.set(
+                        f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}',
+                        login_user.user_name,
+                        ex=timedelta(minutes=10),
+                    )
+                    await pipe.execute()
                 logger.warning('10分钟内密码已输错超过5次，账号已锁定，请10分钟后再试')
                 raise LoginException(data='', message='10分钟内密码已输错超过5次，账号已锁定，请10分钟后再试')
             logger.warning('密码错误')
@@ -138,14 +141,14 @@ class LoginService:
         return user
 
     @classmethod
-    async def __check_login_ip(cls, request: Request) -> bool:
+    def __check_login_ip(cls, request: Request, black_ip_value: str | None) -> bool:
         """
         校验用户登录ip是否在黑名单内
 
         :param request: Request对象
+        :param black_ip_value: 参数配置sys.login.blackIPList的值
         :return: 校验结果
         """
-        black_ip_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList')
         black_ip_list = black_ip_value.split(',') if black_ip_value else []
         if request.headers.get('X-Forwarded-For') in black_ip_list:
             logger.warning('当前IP禁止登录')
@@ -153,15 +156,14 @@ class LoginService:
         return True
 
     @classmethod
-    async def __check_login_captcha(cls, request: Request, login_user: UserLogin) -> bool:
+    def __check_login_captcha(cls, login_user: UserLogin, captcha_value: str | None) -> bool:
         """
         校验用户登录验证码
 
-        :param request: Request对象
         :param login_user: 登录用户对象
+        :param captcha_value: 缓存中的验证码
         :return: 校验结果
         """
-        captcha_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{login_user.uuid}')
         if not captcha_value:
             logger.warning('验证码已失效')
             raise LoginException(data='', message='验证码已失效')
@@ -217,91 +219,115 @@ class LoginService:
         except InvalidTokenError as e:
             logger.warning('用户token已失效，请重新登录')
             raise AuthException(data='', message='用户token已失效，请重新登录') from e
-        query_user = await UserDao.get_user_by_id(query_db, user_id=token_data.user_id)
-        if query_user.get('user_basic_info') is None:
+        # 此方法可实现同一账号同一时间只能登录一次
+        token_id = session_id if AppConfig.app_same_time_login else str(token_data.user_id)
+        token_key = f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}'
+        # 令牌及权限版本号合并为一次往返读取，令牌校验通过后再续期，被拒绝的令牌不会延长会话有效期
+        async with request.app.state.redis.pipeline(transaction=False) as pipe:
+            pipe.get(token_key)
+            pipe.mget(*PrincipalCacheService.get_permission_version_keys(token_data.user_id))
+            redis_token, (global_version, user_version) = await pipe.execute()
+        if token != redis_token:
+            logger.warning('用户token已失效，请重新登录')
+            raise AuthException(data='', message='用户token已失效，请重新登录')
+        # 密码相关参数配置读取进程内缓存
+        init_password_is_modify = await ConfigService.query_config_list_from_cache_services(
+            request.app.state.redis, 'sys.account.initPasswordModify'
+        )
+        password_validate_days = await ConfigService.query_config_list_from_cache_services(
+            request.app.state.redis, 'sys.account.passwordValidateDays'
+        )
+        if global_version is None:
+            global_version = await PrincipalCacheService.init_global_version(request.app.state.redis)
+        permission_stamp = PrincipalCacheService.build_permission_stamp(global_version, user_version)
+        current_user = await cls.__get_current_user_principal(
+            request, query_db, token_data.user_id, global_version, permission_stamp
+        )
+        if current_user is None:
             logger.warning('用户token不合法')
             raise AuthException(data='', message='用户token不合法')
-        if AppConfig.app_same_time_login:
-            redis_token = await request.app.state.redis.get(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}')
-        else:
-            # 此方法可实现同一账号同一时间只能登录一次
-            redis_token = await request.app.state.redis.get(
-                f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get("user_basic_info").user_id}'
-            )
-        if token == redis_token:
-            if AppConfig.app_same_time_login:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
-            else:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get("user_basic_info").user_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
+        # 令牌有效期续期及在线会话续期合并为一次往返
+        async with request.app.state.redis.pipeline(transaction=False) as pipe:
+            pipe.expire(token_key, timedelta(minutes=JwtConfig.jwt_redis_expire_minutes))
+            OnlineService.refresh_session(pipe, token_id)
+            await pipe.execute()
+        is_default_modify_pwd = cls.__init_password_is_modify(
+            init_password_is_modify, current_user.user.pwd_update_date
+        )
+        is_password_expired = cls.__password_is_expired(password_validate_days, current_user.user.pwd_update_date)
+        # 缓存中的用户认证信息为多个请求共享，此处复制后再设置与时间及参数配置相关的字段
+        current_user = current_user.model_copy(
+            update={'is_default_modify_pwd': is_default_modify_pwd, 'is_password_expired': is_password_expired}
+        )
+        # 设置当前用户信息及权限版本戳到上下文
+        RequestContext.set_current_user(current_user)
+        RequestContext.set_current_permission_stamp(permission_stamp)
+        return current_user
 
-            role_id_list = [item.role_id for item in query_user.get('user_role_info')]
-            if 1 in role_id_list:  # noqa: SIM108
-                permissions = ['*:*:*']
-            else:
-                permissions = [row.perms for row in query_user.get('user_menu_info')]
-            post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
-            role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
-            roles = [row.role_key for row in query_user.get('user_role_info')]
-            is_default_modify_pwd = await cls.__init_password_is_modify(
-                request, query_user.get('user_basic_info').pwd_update_date
-            )
-            is_password_expired = await cls.__password_is_expired(
-                request, query_user.get('user_basic_info').pwd_update_date
-            )
+    @classmethod
+    async def __get_current_user_principal(
+        cls, request: Request, query_db: AsyncSession, user_id: int, global_version: str | None, permission_stamp: str
+    ) -> CurrentUserModel | None:
+        """
+        获取当前用户认证信息，优先读取缓存，缓存未命中时查询数据库并回写缓存，权限标识由角色菜单位图索引解析
 
-            current_user = CurrentUserModel(
-                permissions=permissions,
-                roles=roles,
-                user=UserInfoModel(
-                    **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
-                    postIds=post_ids,
-                    roleIds=role_ids,
-                    dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
-                    role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
-                ),
-                isDefaultModifyPwd=is_default_modify_pwd,
-                isPasswordExpired=is_password_expired,
-            )
-            # 设置当前用户信息到上下文
-            RequestContext.set_current_user(current_user)
+        :param request: Request对象
+        :param query_db: orm对象
+        :param user_id: 用户id
+        :param global_version: 全局权限版本号
+        :param permission_stamp: 权限版本戳，需在查询数据库之前获取，保证回写的缓存不会比版本戳更旧
+        :return: 当前用户认证信息，用户不存在或已停用时返回None
+        """
+        current_user = await PrincipalCacheService.get_principal(request.app.state.redis, user_id, permission_stamp)
+        if current_user is not None:
             return current_user
-        logger.warning('用户token已失效，请重新登录')
-        raise AuthException(data='', message='用户token已失效，请重新登录')
+        query_user = await UserDao.get_user_by_id(query_db, user_id=user_id)
+        if query_user.get('user_basic_info') is None:
+            return None
+        role_id_list = [item.role_id for item in query_user.get('user_role_info')]
+        if 1 in role_id_list:
+            permissions = ['*:*:*']
+        else:
+            role_menu_index = await RoleMenuIndexService.get_index(request.app.state.redis, query_db, global_version)
+            permissions = role_menu_index.get_perms(role_id_list)
+        post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
+        role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
+        roles = [row.role_key for row in query_user.get('user_role_info')]
+        current_user = CurrentUserModel(
+            permissions=permissions,
+            roles=roles,
+            user=UserInfoModel(
+                **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
+                postIds=post_ids,
+                roleIds=role_ids,
+                dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
+                role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
+            ),
+        )
+        await PrincipalCacheService.set_principal(request.app.state.redis, user_id, permission_stamp, current_user)
+
+        return current_user
 
     @classmethod
-    async def __init_password_is_modify(cls, request: Request, pwd_update_date: datetime) -> bool:
+    def __init_password_is_modify(cls, init_password_is_modify: str | None, pwd_update_date: datetime) -> bool:
         """
         判断当前用户是否初始密码登录
 
-        :param request: Request对象
+        :param init_password_is_modify: 参数配置sys.account.initPasswordModify的值
         :param pwd_update_date: 密码最后更新时间
         :return: 是否初始密码登录
         """
-        init_password_is_modify = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.initPasswordModify'
-        )
         return init_password_is_modify == '1' and pwd_update_date is None
 
     @classmethod
-    async def __password_is_expired(cls, request: Request, pwd_update_date: datetime) -> bool:
+    def __password_is_expired(cls, password_validate_days: str | None, pwd_update_date: datetime) -> bool:
         """
         判断当前用户密码是否过期
 
-        :param request: Request对象
+        :param password_validate_days: 参数配置sys.account.passwordValidateDays的值
         :param pwd_update_date: 密码最后更新时间
         :return: 密码是否过期
         """
-        password_validate_days = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.passwordValidateDays'
-        )
         if password_validate_days and int(password_validate_days) > 0:
             if pwd_update_date is None:
                 return True
@@ -311,57 +337,48 @@ class LoginService:
         return False
 
     @classmethod
-    async def get_current_user_routers(cls, user_id: int, query_db: AsyncSession) -> list[dict[str, Any]]:
+    async def get_current_user_routers(
+        cls, request: Request, current_user: CurrentUserModel, query_db: AsyncSession
+    ) -> list[dict[str, Any]]:
         """
-        根据用户id获取当前用户路由信息
+        获取当前用户路由信息，路由信息只与角色组合有关，拥有相同角色组合的用户共用同一份缓存
 
-        :param user_id: 用户id
+        :param request: Request对象
+        :param current_user: 当前用户对象
         :param query_db: orm对象
         :return: 当前用户路由信息对象
         """
-        query_user = await UserDao.get_user_by_id(query_db, user_id=user_id)
-        user_router_menu = sorted(
-            [
-                row
-                for row in query_user.get('user_menu_info')
-                if row.menu_type in [MenuConstant.TYPE_DIR, MenuConstant.TYPE_MENU]
-            ],
-            key=lambda x: x.order_num,
-        )
-        menus = cls.__generate_menus(0, user_router_menu)
-        user_router = cls.__generate_user_router_menu(menus)
-        return [router.model_dump(exclude_unset=True, by_alias=True) for router in user_router]
-
-    @classmethod
-    def __generate_menus(cls, pid: int, permission_list: list[SysMenu]) -> list[MenuTreeModel]:
-        """
-        工具方法：根据菜单信息生成菜单信息树形嵌套数据
-
-        :param pid: 菜单id
-        :param permission_list: 菜单列表信息
-        :return: 菜单信息树形嵌套数据
-        """
-        menu_list: list[MenuTreeModel] = []
-        for permission in permission_list:
-            if permission.parent_id == pid:
-                children = cls.__generate_menus(permission.menu_id, permission_list)
-                menu_list_data = MenuTreeModel(**CamelCaseUtil.transform_result(permission))
-                if children:
-                    menu_list_data.children = children
-                menu_list.append(menu_list_data)
+        redis = request.app.state.redis
+        role_id_list = [role.role_id for role in current_user.user.role]
+        role_key = PrincipalCacheService.build_role_key(role_id_list)
+        # 需在查询数据库之前获取版本号，保证回写的缓存不会比版本号更旧
+        global_version = await PrincipalCacheService.get_global_version(redis)
+        user_router = await PrincipalCacheService.get_role_routers(redis, role_key, global_version)
+        if user_router is None:
+            role_menu_index = await RoleMenuIndexService.get_index(redis, query_db, global_version)
+            user_router_menu = await MenuDao.get_menu_list_by_ids(
+                query_db,
+                role_menu_index.get_menu_ids(role_id_list, [MenuConstant.TYPE_DIR, MenuConstant.TYPE_MENU]),
+            )
+            user_router = [
+                router.model_dump(exclude_unset=True, by_alias=True)
+                for router in cls.__generate_user_router_menu(0, MenuService.group_by_parent(user_router_menu))
+            ]
+            await PrincipalCacheService.set_role_routers(redis, role_key, global_version, user_router)
 
-        return menu_list
+        return user_router
 
     @classmethod
-    def __generate_user_router_menu(cls, permission_list: list[MenuTreeModel]) -> list[RouterModel]:
+    def __generate_user_router_menu(cls, pid: int, children_mapping: dict[int, list[SysMenu]]) -> list[RouterModel]:
         """
-        工具方法：根据菜单树信息生成路由信息树形嵌套数据
+        工具方法：根据父菜单id索引生成路由信息树形嵌套数据，每个菜单只访问一次
 
-        :param permission_list: 菜单树列表信息
+        :param pid: 父菜单id
+        :param children_mapping: 以父菜单id为键、子菜单列表为值的字典
         :return: 路由信息树形嵌套数据
         """
         router_list: list[RouterModel] = []
-        for permission in permission_list:
+        for permission in children_mapping.get(pid, []):
             router = RouterModel(
                 hidden=permission.visible == '1',
                 name=RouterUtil.get_router_name(permission),
@@ -375,11 +392,10 @@ class LoginService:
                     link=permission.path if RouterUtil.is_http(permission.path) else None,
                 ),
             )
-            c_menus = permission.children
-            if c_menus and permission.menu_type == MenuConstant.TYPE_DIR:
+            if permission.menu_id in children_mapping and permission.menu_type == MenuConstant.TYPE_DIR:
                 router.always_show = True
                 router.redirect = 'noRedirect'
-                router.children = cls.__generate_user_router_menu(c_menus)
+                router.children = cls.__generate_user_router_menu(permission.menu_id, children_mapping)
             elif RouterUtil.is_menu_frame(permission):
                 router.meta = None
                 children_list: list[RouterModel] = []
@@ -432,10 +448,15 @@ class LoginService:
         :return: 注册结果
         """
         register_enabled = (
-            await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.registerUser') == 'true'
+            await ConfigService.query_config_list_from_cache_services(
+                request.app.state.redis, 'sys.account.registerUser'
+            )
+            == 'true'
         )
         captcha_enabled = (
-            await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.captchaEnabled')
+            await ConfigService.query_config_list_from_cache_services(
+                request.app.state.redis, 'sys.account.captchaEnabled'
+            )
             == 'true'
         )
         if user_register.password == user_register.confirm_password:
@@ -451,7 +472,7 @@ class LoginService:
                 add_user = AddUserModel(
                     userName=user_register.username,
                     nickName=user_register.username,
-                    password=PwdUtil.get_password_hash(user_register.password),
+                    password=await PwdUtil.get_password_hash(user_register.password),
                     pwdUpdateDate=datetime.now(),
                 )
                 result = await UserService.add_user_services(query_db, add_user)
@@ -502,9 +523,9 @@ class LoginService:
             f'{RedisInitKeyConfig.SMS_CODE.key}:{forget_user.session_id}'
         )
         if forget_user.sms_code == redis_sms_result:
-            forget_user.password = PwdUtil.get_password_hash(forget_user.password)
+            forget_user.password = await PwdUtil.get_password_hash(forget_user.password)
             forget_user.user_id = (await UserDao.get_user_by_name(query_db, forget_user.user_name)).user_id
-            edit_result = await UserService.reset_user_services(query_db, forget_user)
+            edit_result = await UserService.reset_user_services(request, query_db, forget_user)
             result = edit_result.dict()
         elif not redis_sms_result:
             result = {'is_success': False, 'message': '短信验证码已过期'}
@@ -524,6 +545,7 @@ class LoginService:
         :return: 退出登录结果
         """
         await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+        await OnlineService.remove_sessions(request.app.state.redis, [token_id])
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_access_token')
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_session_id')
 
@@ -536,7 +558,7 @@ class RouterUtil:
     """
 
     @classmethod
-    def get_router_name(cls, menu: MenuTreeModel) -> str:
+    def get_router_name(cls, menu: SysMenu) -> str:
         """
         获取路由名称
 
@@ -562,7 +584,7 @@ class RouterUtil:
         return router_name.capitalize()
 
     @classmethod
-    def get_router_path(cls, menu: MenuTreeModel) -> str | None:
+    def get_router_path(cls, menu: SysMenu) -> str | None:
         """
         获取路由地址
 
@@ -582,7 +604,7 @@ class RouterUtil:
         return router_path
 
     @classmethod
-    def get_component(cls, menu: MenuTreeModel) -> str:
+    def get_component(cls, menu: SysMenu) -> str:
         """
         获取组件信息
 
@@ -599,7 +621,7 @@ class RouterUtil:
         return component
 
     @classmethod
-    def is_menu_frame(cls, menu: MenuTreeModel) -> bool:
+    def is_menu_frame(cls, menu: SysMenu) -> bool:
         """
         判断是否为菜单内部跳转
 
@@ -611,7 +633,7 @@ class RouterUtil:
         )
 
     @classmethod
-    def is_inner_link(cls, menu: MenuTreeModel) -> bool:
+    def is_inner_link(cls, menu: SysMenu) -> bool:
         """
         判断是否为内链组件
 
@@ -621,7 +643,7 @@ class RouterUtil:
         return menu.is_frame == MenuConstant.NO_FRAME and cls.is_http(menu.path)
 
     @classmethod
-    def is_parent_view(cls, menu: MenuTreeModel) -> bool:
+    def is_parent_view(cls, menu: SysMenu) -> bool:
         """
         判断是否为parent_view组件
 
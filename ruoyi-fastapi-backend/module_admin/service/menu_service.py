@@ -1,6 +1,7 @@
 from collections.abc import Sequence
 from typing import Any
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.constant import CommonConstant, MenuConstant
@@ -12,6 +13,8 @@ from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.vo.menu_vo import DeleteMenuModel, MenuModel, MenuQueryModel, MenuTreeModel
 from module_admin.entity.vo.role_vo import RoleMenuQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.principal_cache_service import PrincipalCacheService
+from module_admin.service.role_menu_index_service import RoleMenuIndexService
 from utils.common_util import CamelCaseUtil
 from utils.string_util import StringUtil
 
@@ -23,18 +26,17 @@ class MenuService:
 
     @classmethod
     async def get_menu_tree_services(
-        cls, query_db: AsyncSession, current_user: CurrentUserModel | None = None
+        cls, request: Request, query_db: AsyncSession, current_user: CurrentUserModel | None = None
     ) -> list[dict[str, Any]]:
         """
         获取菜单树信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param current_user: 当前用户对象
         :return: 菜单树信息对象
         """
-        menu_list_result = await MenuDao.get_menu_list_for_tree(
-            query_db, current_user.user.user_id, current_user.user.role
-        )
+        menu_list_result = await cls.__get_user_menu_list(request, query_db, current_user)
         menu_tree_model_result = cls.list_to_tree(menu_list_result)
         menu_tree_result = [menu.model_dump(exclude_unset=True, by_alias=True) for menu in menu_tree_model_result]
 
@@ -42,19 +44,18 @@ class MenuService:
 
     @classmethod
     async def get_role_menu_tree_services(
-        cls, query_db: AsyncSession, role_id: int, current_user: CurrentUserModel | None = None
+        cls, request: Request, query_db: AsyncSession, role_id: int, current_user: CurrentUserModel | None = None
     ) -> RoleMenuQueryModel:
         """
         根据角色id获取菜单树信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param role_id: 角色id
         :param current_user: 当前用户对象
         :return: 当前角色id的菜单树信息对象
         """
-        menu_list_result = await MenuDao.get_menu_list_for_tree(
-            query_db, current_user.user.user_id, current_user.user.role
-        )
+        menu_list_result = await cls.__get_user_menu_list(request, query_db, current_user)
         menu_tree_result = cls.list_to_tree(menu_list_result)
         role = await RoleDao.get_role_detail_by_id(query_db, role_id)
         role_menu_list = await RoleDao.get_role_menu_dao(query_db, role)
@@ -63,6 +64,24 @@ class MenuService:
 
         return result
 
+    @classmethod
+    async def __get_user_menu_list(
+        cls, request: Request, query_db: AsyncSession, current_user: CurrentUserModel
+    ) -> Sequence[SysMenu]:
+        """
+        根据角色菜单位图索引获取当前用户所有在用菜单列表信息
+
+        :param request: Request对象
+        :param query_db: orm对象
+        :param current_user: 当前用户对象
+        :return: 菜单列表信息
+        """
+        global_version = await PrincipalCacheService.get_global_version(request.app.state.redis)
+        role_menu_index = await RoleMenuIndexService.get_index(request.app.state.redis, query_db, global_version)
+        menu_id_list = role_menu_index.get_menu_ids([role.role_id for role in current_user.user.role])
+
+        return await MenuDao.get_menu_list_by_ids(query_db, menu_id_list)
+
     @classmethod
     async def get_menu_list_services(
         cls, query_db: AsyncSession, page_object: MenuQueryModel, current_user: CurrentUserModel | None = None
@@ -97,10 +116,13 @@ class MenuService:
         return CommonConstant.UNIQUE
 
     @classmethod
-    async def add_menu_services(cls, query_db: AsyncSession, page_object: MenuModel) -> CrudResponseModel:
+    async def add_menu_services(
+        cls, request: Request, query_db: AsyncSession, page_object: MenuModel
+    ) -> CrudResponseModel:
         """
         新增菜单信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 新增菜单对象
         :return: 新增菜单校验结果
@@ -112,16 +134,20 @@ class MenuService:
         try:
             await MenuDao.add_menu_dao(query_db, page_object)
             await query_db.commit()
+            await PrincipalCacheService.bump_global_version(request.app.state.redis)
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    async def edit_menu_services(cls, query_db: AsyncSession, page_object: MenuModel) -> CrudResponseModel:
+    async def edit_menu_services(
+        cls, request: Request, query_db: AsyncSession, page_object: MenuModel
+    ) -> CrudResponseModel:
         """
         编辑菜单信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑部门对象
         :return: 编辑菜单校验结果
@@ -138,6 +164,7 @@ class MenuService:
             try:
                 await MenuDao.edit_menu_dao(query_db, edit_menu)
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -146,10 +173,13 @@ class MenuService:
             raise ServiceException(message='菜单不存在')
 
     @classmethod
-    async def delete_menu_services(cls, query_db: AsyncSession, page_object: DeleteMenuModel) -> CrudResponseModel:
+    async def delete_menu_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeleteMenuModel
+    ) -> CrudResponseModel:
         """
         删除菜单信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除菜单对象
         :return: 删除菜单校验结果
@@ -164,6 +194,7 @@ class MenuService:
                         raise ServiceWarning(message='菜单已分配,不允许删除')
                     await MenuDao.delete_menu_dao(query_db, MenuModel(menuId=menu_id))
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -185,6 +216,20 @@ class MenuService:
 
         return result
 
+    @classmethod
+    def group_by_parent(cls, permission_list: Sequence[Any]) -> dict[int, list[Any]]:
+        """
+        工具方法：一次遍历菜单列表信息，按父菜单id建立子菜单索引，子菜单保持列表中的原有顺序
+
+        :param permission_list: 菜单列表信息，元素需包含parent_id属性
+        :return: 以父菜单id为键、子菜单列表为值的字典
+        """
+        children_mapping: dict[int, list[Any]] = {}
+        for permission in permission_list:
+            children_mapping.setdefault(permission.parent_id, []).append(permission)
+
+        return children_mapping
+
     @classmethod
     def list_to_tree(cls, permission_list: Sequence[SysMenu]) -> list[MenuTreeModel]:
         """
@@ -196,22 +241,15 @@ class MenuService:
         _permission_list = [
             MenuTreeModel(id=item.menu_id, label=item.menu_name, parentId=item.parent_id) for item in permission_list
         ]
-        # 转成id为key的字典
-        mapping: dict[int, MenuTreeModel] = dict(zip([i.id for i in _permission_list], _permission_list, strict=False))
+        children_mapping = cls.group_by_parent(_permission_list)
+        menu_id_set = {item.id for item in _permission_list}
 
-        # 树容器
+        # 树容器，找不到父级项的为根节点
         container: list[MenuTreeModel] = []
-
         for d in _permission_list:
-            # 如果找不到父级项，则是根节点
-            parent = mapping.get(d.parent_id)
-            if parent is None:
+            if d.id in children_mapping:
+                d.children = children_mapping[d.id]
+            if d.parent_id not in menu_id_set:
                 container.append(d)
-            else:
-                children: list[MenuTreeModel] = parent.children
-                if not children:
-                    children = []
-                children.append(d)
-                parent.children = children
 
         return container
@@ -1,65 +1,204 @@
+import json
+import math
+import time
 from typing import Any
 
-import jwt
 from fastapi import Request
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
 from common.enums import RedisInitKeyConfig
-from common.vo import CrudResponseModel
-from config.env import AppConfig, JwtConfig
+from common.vo import CrudResponseModel, PageModel
+from config.env import JwtConfig
 from exceptions.exception import ServiceException
-from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineQueryModel
+from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlinePageQueryModel
 from utils.common_util import CamelCaseUtil
+from utils.ip_location_util import IpLocationUtil
 
 
 class OnlineService:
     """
     在线用户管理模块服务层
+
+    在线会话在登录时写入会话注册表：每个会话对应一个Redis哈希，另以登录时间为分值维护全部会话、按用户名称及按登录IP划分的有序集合索引，
+    以过期时间为分值维护过期索引，查询在线用户时只需读取索引的一页及对应的会话哈希，无需遍历及解析全部令牌
     """
 
     @classmethod
-    async def get_online_list_services(cls, request: Request, query_object: OnlineQueryModel) -> list[dict[str, Any]]:
+    def _session_key(cls, token_id: str) -> str:
+        """
+        获取会话信息键名
+
+        :param token_id: 会话编号
+        :return: 会话信息键名
+        """
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}:{token_id}'
+
+    @classmethod
+    def _index_key(cls, index_name: str, value: str | None = None) -> str:
+        """
+        获取会话索引键名
+
+        :param index_name: 索引名称（time全部会话 user用户名称 ip登录IP expire过期时间 owner会话所属用户及IP）
+        :param value: 索引值，为None时表示该类索引只有一个键
+        :return: 会话索引键名
+        """
+        index_key = f'{RedisInitKeyConfig.ONLINE_SESSION.key}_index:{index_name}'
+        return index_key if value is None else f'{index_key}:{value}'
+
+    @classmethod
+    def _session_ttl(cls) -> int:
+        """
+        获取会话有效期，与令牌在Redis中的有效期保持一致
+
+        :return: 会话有效期（秒）
+        """
+        return JwtConfig.jwt_redis_expire_minutes * 60
+
+    @classmethod
+    async def register_session(cls, redis: aioredis.Redis, token_id: str, session_info: dict[str, Any]) -> None:
+        """
+        登录成功后注册在线会话，会话编号已存在时（不允许同一账号同时登录）替换原会话
+
+        :param redis: redis对象
+        :param token_id: 会话编号
+        :param session_info: 会话信息，包含user_name、dept_name、ipaddr、login_location、browser、os、login_time
+        :return: None
+        """
+        await cls.remove_sessions(redis, [token_id])
+        now = time.time()
+        user_name = session_info.get('user_name') or ''
+        ipaddr = session_info.get('ipaddr') or ''
+        session_key = cls._session_key(token_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                session_key,
+                mapping={
+                    key: str(value)
+                    for key, value in {**session_info, 'token_id': token_id}.items()
+                    if value is not None
+                },
+            )
+            pipe.expire(session_key, cls._session_ttl())
+            pipe.zadd(cls._index_key('time'), {token_id: now})
+            pipe.zadd(cls._index_key('user', user_name), {token_id: now})
+            pipe.zadd(cls._index_key('ip', ipaddr), {token_id: now})
+            pipe.zadd(cls._index_key('expire'), {token_id: now + cls._session_ttl()})
+            pipe.hset(cls._index_key('owner'), token_id, json.dumps([user_name, ipaddr], ensure_ascii=False))
+            await pipe.execute()
+
+    @classmethod
+    def refresh_session(cls, pipe: Pipeline, token_id: str) -> None:
+        """
+        将会话续期命令追加到管道中，与令牌续期合并为一次往返，会话已被移除时不会重新写入索引
+
+        :param pipe: redis管道对象
+        :param token_id: 会话编号
+        :return: None
+        """
+        pipe.expire(cls._session_key(token_id), cls._session_ttl())
+        pipe.zadd(cls._index_key('expire'), {token_id: time.time() + cls._session_ttl()}, xx=True)
+
+    @classmethod
+    async def remove_sessions(cls, redis: aioredis.Redis, token_ids: list[str]) -> None:
+        """
+        移除在线会话及其索引
+
+        :param redis: redis对象
+        :param token_ids: 会话编号列表
+        :return: None
+        """
+        if not token_ids:
+            return
+        owner_list = await redis.hmget(cls._index_key('owner'), token_ids)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*[cls._session_key(token_id) for token_id in token_ids])
+            pipe.zrem(cls._index_key('time'), *token_ids)
+            pipe.zrem(cls._index_key('expire'), *token_ids)
+            pipe.hdel(cls._index_key('owner'), *token_ids)
+            for token_id, owner in zip(token_ids, owner_list, strict=True):
+                if owner is None:
+                    continue
+                user_name, ipaddr = json.loads(owner)
+                pipe.zrem(cls._index_key('user', user_name), token_id)
+                pipe.zrem(cls._index_key('ip', ipaddr), token_id)
+            await pipe.execute()
+
+    @classmethod
+    async def _prune_expired_sessions(cls, redis: aioredis.Redis) -> None:
+        """
+        清理已过期会话的索引
+
+        :param redis: redis对象
+        :return: None
+        """
+        expired_token_ids = await redis.zrangebyscore(cls._index_key('expire'), '-inf', time.time())
+        await cls.remove_sessions(redis, expired_token_ids)
+
+    @classmethod
+    async def _get_sessions(cls, redis: aioredis.Redis, token_ids: list[str]) -> list[dict[str, Any]]:
+        """
+        批量获取会话信息，会话信息已不存在时同时移除其索引
+
+        :param redis: redis对象
+        :param token_ids: 会话编号列表
+        :return: 会话信息列表
+        """
+        if not token_ids:
+            return []
+        async with redis.pipeline(transaction=False) as pipe:
+            for token_id in token_ids:
+                pipe.hgetall(cls._session_key(token_id))
+            session_list = await pipe.execute()
+        missing_token_ids = [token_id for token_id, session in zip(token_ids, session_list, strict=True) if not session]
+        await cls.remove_sessions(redis, missing_token_ids)
+        for session in session_list:
+            # 开启IP归属区域延迟查询时登录信息中可能未记录登录地点，此时尝试从查询缓存中获取
+            if session and not session.get('login_location'):
+                session['login_location'] = IpLocationUtil.get_cached_location(session.get('ipaddr'))
+        return [session for session in session_list if session]
+
+    @classmethod
+    async def get_online_list_services(cls, request: Request, query_object: OnlinePageQueryModel) -> PageModel:
         """
         获取在线用户表信息service
 
         :param request: Request对象
         :param query_object: 查询参数对象
-        :return: 在线用户列表信息
-        """
-        access_token_keys = await request.app.state.redis.keys(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}*')
-        if not access_token_keys:
-            access_token_keys = []
-        access_token_values_list = [await request.app.state.redis.get(key) for key in access_token_keys]
-        online_info_list = []
-        for item in access_token_values_list:
-            payload = jwt.decode(item, JwtConfig.jwt_secret_key, algorithms=[JwtConfig.jwt_algorithm])
-            online_dict = {
-                'token_id': payload.get('session_id') if AppConfig.app_same_time_login else payload.get('user_id'),
-                'user_name': payload.get('user_name'),
-                'dept_name': payload.get('dept_name'),
-                'ipaddr': payload.get('login_info').get('ipaddr'),
-                'login_location': payload.get('login_info').get('loginLocation'),
-                'browser': payload.get('login_info').get('browser'),
-                'os': payload.get('login_info').get('os'),
-                'login_time': payload.get('login_info').get('loginTime'),
-            }
-            if query_object.user_name and not query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name'):
-                    online_info_list = [online_dict]
-                    break
-            elif not query_object.user_name and query_object.ipaddr:
-                if query_object.ipaddr == payload.get('login_info').get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            elif query_object.user_name and query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name') and query_object.ipaddr == payload.get(
-                    'login_info'
-                ).get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            else:
-                online_info_list.append(online_dict)
-
-        return CamelCaseUtil.transform_result(online_info_list)
+        :return: 在线用户分页列表信息
+        """
+        redis = request.app.state.redis
+        await cls._prune_expired_sessions(redis)
+        page_num, page_size = query_object.page_num, query_object.page_size
+        start = (page_num - 1) * page_size
+        if query_object.user_name:
+            index_key = cls._index_key('user', query_object.user_name)
+        elif query_object.ipaddr:
+            index_key = cls._index_key('ip', query_object.ipaddr)
+        else:
+            index_key = cls._index_key('time')
+        if query_object.user_name and query_object.ipaddr:
+            # 同一用户的会话数量很少，取出该用户的全部会话后再按登录IP过滤
+            session_list = [
+                session
+                for session in await cls._get_sessions(redis, await redis.zrevrange(index_key, 0, -1))
+                if session.get('ipaddr') == query_object.ipaddr
+            ]
+            total = len(session_list)
+            session_list = session_list[start : start + page_size]
+        else:
+            total = await redis.zcard(index_key)
+            session_list = await cls._get_sessions(
+                redis, await redis.zrevrange(index_key, start, start + page_size - 1)
+            )
+
+        return PageModel[Any](
+            rows=CamelCaseUtil.transform_result(session_list),
+            pageNum=page_num,
+            pageSize=page_size,
+            total=total,
+            hasNext=math.ceil(total / page_size) > page_num,
+        )
 
     @classmethod
     async def delete_online_services(cls, request: Request, page_object: DeleteOnlineModel) -> CrudResponseModel:
@@ -72,7 +211,9 @@ class OnlineService:
         """
         if page_object.token_ids:
             token_id_list = page_object.token_ids.split(',')
-            for token_id in token_id_list:
-                await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+            await request.app.state.redis.delete(
+                *[f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}' for token_id in token_id_list]
+            )
+            await cls.remove_sessions(request.app.state.redis, token_id_list)
             return CrudResponseModel(is_success=True, message='强退成功')
         raise ServiceException(message='传入session_id为空')
@@ -1,5 +1,7 @@
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.constant import CommonConstant
@@ -7,6 +9,7 @@ from common.vo import CrudResponseModel, PageModel
 from exceptions.exception import ServiceException
 from module_admin.dao.post_dao import PostDao
 from module_admin.entity.vo.post_vo import DeletePostModel, PostModel, PostPageQueryModel
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
 
@@ -18,17 +21,18 @@ class PostService:
 
     @classmethod
     async def get_post_list_services(
-        cls, query_db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any]]:
+        cls, query_db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False, is_stream: bool = False
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取岗位列表信息service
 
         :param query_db: orm对象
         :param query_object: 查询参数对象
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 岗位列表信息对象
         """
-        post_list_result = await PostDao.get_post_list(query_db, query_object, is_page)
+        post_list_result = await PostDao.get_post_list(query_db, query_object, is_page, is_stream)
 
         return post_list_result
 
@@ -84,10 +88,13 @@ class PostService:
             raise e
 
     @classmethod
-    async def edit_post_services(cls, query_db: AsyncSession, page_object: PostModel) -> CrudResponseModel:
+    async def edit_post_services(
+        cls, request: Request, query_db: AsyncSession, page_object: PostModel
+    ) -> CrudResponseModel:
         """
         编辑岗位信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑岗位对象
         :return: 编辑岗位校验结果
@@ -102,6 +109,7 @@ class PostService:
             try:
                 await PostDao.edit_post_dao(query_db, edit_post)
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -149,12 +157,14 @@ class PostService:
         return result
 
     @staticmethod
-    async def export_post_list_services(post_list: list) -> bytes:
+    async def export_post_list_services(
+        post_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出岗位信息service
 
-        :param post_list: 岗位信息列表
-        :return: 岗位信息对应excel的二进制数据
+        :param post_list: 岗位信息列表或分批获取的异步迭代器
+        :return: 岗位信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -170,11 +180,10 @@ class PostService:
             'remark': '备注',
         }
 
-        for item in post_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
                 item['status'] = '停用'
-        binary_data = ExcelUtil.export_list2excel(post_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(post_list, mapping_dict, format_row)
@@ -0,0 +1,324 @@
+import json
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from redis import asyncio as aioredis
+
+from common.constant import CacheConstant
+from common.enums import RedisInitKeyConfig
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from utils.cache_util import LRUCache
+
+
+class PrincipalCacheService:
+    """
+    用户认证信息缓存服务层
+
+    用户认证信息及数据权限可见部门均采用进程内LRU缓存 + Redis序列化缓存的二级结构，缓存键由用户id及权限版本号组成，
+    用户、角色、菜单、部门、岗位发生变更时递增对应的权限版本号即可使旧缓存失效。
+    权限版本号不存在时以当前时间（微秒）为初始值，版本号键被删除后重新生成的版本号大于之前的所有版本号，
+    不会与仍留在进程内缓存中的旧版本戳重复。
+    用户路由信息只与角色组合有关，按角色id组合及全局权限版本号缓存，拥有相同角色组合的用户共用同一份路由信息
+    """
+
+    _local_cache = LRUCache(
+        maxsize=CacheConstant.PRINCIPAL_LOCAL_CACHE_SIZE, ttl=CacheConstant.PRINCIPAL_LOCAL_CACHE_TTL
+    )
+    _data_scope_local_cache = LRUCache(
+        maxsize=CacheConstant.DATA_SCOPE_LOCAL_CACHE_SIZE, ttl=CacheConstant.DATA_SCOPE_LOCAL_CACHE_TTL
+    )
+    _router_local_cache = LRUCache(
+        maxsize=CacheConstant.ROUTER_LOCAL_CACHE_SIZE, ttl=CacheConstant.ROUTER_LOCAL_CACHE_TTL
+    )
+
+    @classmethod
+    def _global_version_key(cls) -> str:
+        """
+        获取全局权限版本号键名
+
+        :return: 全局权限版本号键名
+        """
+        return f'{RedisInitKeyConfig.PERMISSION_VERSION.key}:global'
+
+    @classmethod
+    def _user_version_key(cls, user_id: int) -> str:
+        """
+        获取用户权限版本号键名
+
+        :param user_id: 用户id
+        :return: 用户权限版本号键名
+        """
+        return f'{RedisInitKeyConfig.PERMISSION_VERSION.key}:user:{user_id}'
+
+    @classmethod
+    def _principal_key(cls, user_id: int, stamp: str) -> str:
+        """
+        获取用户认证信息缓存键名
+
+        :param user_id: 用户id
+        :param stamp: 权限版本戳
+        :return: 用户认证信息缓存键名
+        """
+        return f'{RedisInitKeyConfig.USER_PRINCIPAL.key}:{user_id}:{stamp}'
+
+    @classmethod
+    def get_permission_version_keys(cls, user_id: int) -> list[str]:
+        """
+        获取计算权限版本戳所需的版本号键名，便于调用方与其他键合并为一次批量读取
+
+        :param user_id: 用户id
+        :return: 全局权限版本号键名及用户权限版本号键名
+        """
+        return [cls._global_version_key(), cls._user_version_key(user_id)]
+
+    @classmethod
+    def build_permission_stamp(cls, global_version: str | None, user_version: str | None) -> str:
+        """
+        根据版本号生成权限版本戳
+
+        :param global_version: 全局权限版本号
+        :param user_version: 用户权限版本号
+        :return: 权限版本戳，格式为`全局版本号.用户版本号`
+        """
+        return f'{global_version or 0}.{user_version or 0}'
+
+    @classmethod
+    def _data_scope_dept_key(cls, user_id: int, stamp: str) -> str:
+        """
+        获取数据权限部门缓存键名
+
+        :param user_id: 用户id
+        :param stamp: 权限版本戳
+        :return: 数据权限部门缓存键名
+        """
+        return f'{RedisInitKeyConfig.DATA_SCOPE_DEPT.key}:{user_id}:{stamp}'
+
+    @classmethod
+    def _role_router_key(cls, role_key: str, global_version: str) -> str:
+        """
+        获取角色组合路由缓存键名
+
+        :param role_key: 角色组合标识
+        :param global_version: 全局权限版本号
+        :return: 角色组合路由缓存键名
+        """
+        return f'{RedisInitKeyConfig.ROLE_ROUTER.key}:{global_version}:{role_key}'
+
+    @classmethod
+    def build_role_key(cls, role_ids: Iterable[int]) -> str:
+        """
+        根据角色id生成与顺序无关的角色组合标识
+
+        :param role_ids: 角色id
+        :return: 角色组合标识，格式为按升序排列并以逗号分隔的角色id
+        """
+        return ','.join(str(role_id) for role_id in sorted(set(role_ids)))
+
+    @classmethod
+    def _initial_version(cls) -> str:
+        """
+        获取权限版本号的初始值
+
+        :return: 以当前时间（微秒）表示的初始版本号
+        """
+        return str(time.time_ns() // 1000)
+
+    @classmethod
+    async def get_global_version(cls, redis: aioredis.Redis) -> str:
+        """
+        获取当前的全局权限版本号，版本号不存在时先以当前时间初始化
+
+        :param redis: redis对象
+        :return: 全局权限版本号
+        """
+        return await redis.get(cls._global_version_key()) or await cls.init_global_version(redis)
+
+    @classmethod
+    async def init_global_version(cls, redis: aioredis.Redis) -> str:
+        """
+        全局权限版本号不存在时以当前时间初始化，已存在时保持不变
+
+        :param redis: redis对象
+        :return: 全局权限版本号
+        """
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(cls._global_version_key(), cls._initial_version(), nx=True)
+            pipe.get(cls._global_version_key())
+            _, global_version = await pipe.execute()
+        return global_version
+
+    @classmethod
+    async def get_permission_stamp(cls, redis: aioredis.Redis, user_id: int) -> str:
+        """
+        获取用户当前的权限版本戳
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :return: 权限版本戳，格式为`全局版本号.用户版本号`
+        """
+        global_version, user_version = await redis.mget(cls.get_permission_version_keys(user_id))
+        if global_version is None:
+            global_version = await cls.init_global_version(redis)
+        return cls.build_permission_stamp(global_version, user_version)
+
+    @classmethod
+    async def get_principal(cls, redis: aioredis.Redis, user_id: int, stamp: str) -> CurrentUserModel | None:
+        """
+        根据用户id及权限版本戳获取缓存的用户认证信息，优先读取进程内缓存
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param stamp: 权限版本戳
+        :return: 用户认证信息，未命中时返回None
+        """
+        principal = cls._local_cache.get((user_id, stamp))
+        if principal is not None:
+            return principal
+        cache_value = await redis.get(cls._principal_key(user_id, stamp))
+        if not cache_value:
+            return None
+        principal = CurrentUserModel.model_validate_json(cache_value)
+        cls._local_cache.set((user_id, stamp), principal)
+        return principal
+
+    @classmethod
+    async def set_principal(cls, redis: aioredis.Redis, user_id: int, stamp: str, principal: CurrentUserModel) -> None:
+        """
+        缓存用户认证信息
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param stamp: 权限版本戳
+        :param principal: 用户认证信息
+        :return: None
+        """
+        cls._local_cache.set((user_id, stamp), principal)
+        await redis.set(
+            cls._principal_key(user_id, stamp),
+            principal.model_dump_json(by_alias=True),
+            ex=CacheConstant.PRINCIPAL_REDIS_CACHE_TTL,
+        )
+
+    @classmethod
+    async def get_data_scope_dept_ids(cls, redis: aioredis.Redis, user_id: int, stamp: str) -> frozenset[int] | None:
+        """
+        根据用户id及权限版本戳获取缓存的数据权限可见部门id集合，优先读取进程内缓存
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param stamp: 权限版本戳
+        :return: 可见部门id集合，未命中时返回None
+        """
+        dept_ids = cls._data_scope_local_cache.get((user_id, stamp))
+        if dept_ids is not None:
+            return dept_ids
+        cache_value = await redis.get(cls._data_scope_dept_key(user_id, stamp))
+        if cache_value is None:
+            return None
+        dept_ids = frozenset(json.loads(cache_value))
+        cls._data_scope_local_cache.set((user_id, stamp), dept_ids)
+        return dept_ids
+
+    @classmethod
+    async def set_data_scope_dept_ids(
+        cls, redis: aioredis.Redis, user_id: int, stamp: str, dept_ids: frozenset[int]
+    ) -> None:
+        """
+        缓存数据权限可见部门id集合
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param stamp: 权限版本戳
+        :param dept_ids: 可见部门id集合
+        :return: None
+        """
+        cls._data_scope_local_cache.set((user_id, stamp), dept_ids)
+        await redis.set(
+            cls._data_scope_dept_key(user_id, stamp),
+            json.dumps(sorted(dept_ids)),
+            ex=CacheConstant.DATA_SCOPE_REDIS_CACHE_TTL,
+        )
+
+    @classmethod
+    async def get_role_routers(
+        cls, redis: aioredis.Redis, role_key: str, global_version: str
+    ) -> list[dict[str, Any]] | None:
+        """
+        根据角色组合标识及全局权限版本号获取缓存的路由信息，优先读取进程内缓存
+
+        :param redis: redis对象
+        :param role_key: 角色组合标识
+        :param global_version: 全局权限版本号
+        :return: 路由信息，未命中时返回None
+        """
+        routers = cls._router_local_cache.get((role_key, global_version))
+        if routers is not None:
+            return routers
+        cache_value = await redis.get(cls._role_router_key(role_key, global_version))
+        if cache_value is None:
+            return None
+        routers = json.loads(cache_value)
+        cls._router_local_cache.set((role_key, global_version), routers)
+        return routers
+
+    @classmethod
+    async def set_role_routers(
+        cls, redis: aioredis.Redis, role_key: str, global_version: str, routers: list[dict[str, Any]]
+    ) -> None:
+        """
+        缓存角色组合对应的路由信息
+
+        :param redis: redis对象
+        :param role_key: 角色组合标识
+        :param global_version: 全局权限版本号，需在查询数据库之前获取，保证回写的缓存不会比版本号更旧
+        :param routers: 路由信息
+        :return: None
+        """
+        cls._router_local_cache.set((role_key, global_version), routers)
+        await redis.set(
+            cls._role_router_key(role_key, global_version),
+            json.dumps(routers, ensure_ascii=False),
+            ex=CacheConstant.ROUTER_REDIS_CACHE_TTL,
+        )
+
+    @classmethod
+    async def bump_global_version(cls, redis: aioredis.Redis) -> None:
+        """
+        递增全局权限版本号，使所有用户的认证信息、数据权限及路由缓存失效，用于角色、菜单、部门、岗位变更及清除缓存
+
+        :param redis: redis对象
+        :return: None
+        """
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(cls._global_version_key(), cls._initial_version(), nx=True)
+            pipe.incr(cls._global_version_key())
+            await pipe.execute()
+
+    @classmethod
+    async def bump_user_version(cls, redis: aioredis.Redis, user_ids: list[int | str]) -> None:
+        """
+        递增指定用户的权限版本号，使对应用户的认证信息缓存失效，用于用户信息及用户角色关联变更
+
+        :param redis: redis对象
+        :param user_ids: 用户id列表
+        :return: None
+        """
+        user_id_list = [user_id for user_id in user_ids if user_id not in (None, '')]
+        if not user_id_list:
+            return
+        initial_version = cls._initial_version()
+        async with redis.pipeline(transaction=False) as pipe:
+            for user_id in user_id_list:
+                pipe.set(cls._user_version_key(int(user_id)), initial_version, nx=True)
+                pipe.incr(cls._user_version_key(int(user_id)))
+            await pipe.execute()
+
+    @classmethod
+    def get_version_key_prefix(cls) -> str:
+        """
+        获取权限版本号键名前缀，清除全部缓存时需保留权限版本号
+
+        :return: 权限版本号键名前缀
+        """
+        return f'{RedisInitKeyConfig.PERMISSION_VERSION.key}:'
@@ -0,0 +1,178 @@
+import json
+from collections.abc import Collection, Iterable
+from typing import Any
+
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.constant import CacheConstant
+from common.enums import RedisInitKeyConfig
+from module_admin.dao.menu_dao import MenuDao
+from module_admin.dao.role_dao import RoleDao
+from utils.cache_util import LRUCache
+
+
+class RoleMenuIndex:
+    """
+    角色菜单位图索引
+
+    在用菜单按显示顺序编号，每个角色拥有的菜单集合以整数位图表示，第n位为1表示拥有编号为n的菜单，
+    用户的菜单集合即为其所有角色位图的按位或，超级管理员拥有所有菜单
+    """
+
+    def __init__(self, menus: list[tuple[int, str | None, str | None]], role_bits: dict[int, int]) -> None:
+        """
+        初始化角色菜单位图索引
+
+        :param menus: 按显示顺序排列的菜单id、菜单类型及权限标识列表，列表下标即为菜单编号
+        :param role_bits: 以角色id为键、菜单位图为值的字典
+        """
+        self.menus = menus
+        self.role_bits = role_bits
+        self.all_bits = (1 << len(menus)) - 1
+
+    @classmethod
+    def build(cls, menu_rows: Iterable[Any], role_menu_rows: Iterable[Any]) -> 'RoleMenuIndex':
+        """
+        根据菜单信息及角色菜单关联信息构建位图索引
+
+        :param menu_rows: 按显示顺序排列的菜单id、菜单类型及权限标识列表
+        :param role_menu_rows: 角色id及菜单id列表
+        :return: 角色菜单位图索引
+        """
+        menus = [(menu_id, menu_type, perms) for menu_id, menu_type, perms in menu_rows]
+        ordinal_mapping = {menu[0]: ordinal for ordinal, menu in enumerate(menus)}
+        role_bits: dict[int, int] = {}
+        for role_id, menu_id in role_menu_rows:
+            ordinal = ordinal_mapping.get(menu_id)
+            # 停用的菜单不参与编号
+            if ordinal is not None:
+                role_bits[role_id] = role_bits.get(role_id, 0) | (1 << ordinal)
+        return cls(menus, role_bits)
+
+    @classmethod
+    def loads(cls, value: str) -> 'RoleMenuIndex':
+        """
+        从序列化字符串还原位图索引
+
+        :param value: 序列化字符串
+        :return: 角色菜单位图索引
+        """
+        data = json.loads(value)
+        return cls(
+            [tuple(menu) for menu in data['menus']],
+            {int(role_id): int(bits, 16) for role_id, bits in data['roles'].items()},
+        )
+
+    def dumps(self) -> str:
+        """
+        将位图索引序列化为字符串，位图以十六进制表示
+
+        :return: 序列化字符串
+        """
+        return json.dumps(
+            {'menus': self.menus, 'roles': {role_id: format(bits, 'x') for role_id, bits in self.role_bits.items()}},
+            ensure_ascii=False,
+        )
+
+    def get_menu_bits(self, role_ids: Iterable[int]) -> int:
+        """
+        获取角色组合拥有的菜单位图
+
+        :param role_ids: 角色id
+        :return: 菜单位图
+        """
+        bits = 0
+        for role_id in role_ids:
+            if role_id == 1:
+                return self.all_bits
+            bits |= self.role_bits.get(role_id, 0)
+        return bits
+
+    def iter_menus(self, role_ids: Iterable[int]) -> Iterable[tuple[int, str | None, str | None]]:
+        """
+        按显示顺序遍历角色组合拥有的菜单
+
+        :param role_ids: 角色id
+        :return: 菜单id、菜单类型及权限标识的迭代器
+        """
+        bits = self.get_menu_bits(role_ids)
+        while bits:
+            lowest_bit = bits & -bits
+            yield self.menus[lowest_bit.bit_length() - 1]
+            bits ^= lowest_bit
+
+    def get_menu_ids(self, role_ids: Iterable[int], menu_types: Collection[str] | None = None) -> list[int]:
+        """
+        获取角色组合拥有的菜单id列表
+
+        :param role_ids: 角色id
+        :param menu_types: 菜单类型，为None时不限制菜单类型
+        :return: 按显示顺序排列的菜单id列表
+        """
+        return [
+            menu_id
+            for menu_id, menu_type, _ in self.iter_menus(role_ids)
+            if menu_types is None or menu_type in menu_types
+        ]
+
+    def get_perms(self, role_ids: Iterable[int]) -> list[str | None]:
+        """
+        获取角色组合拥有的权限标识列表
+
+        :param role_ids: 角色id
+        :return: 按显示顺序排列的权限标识列表
+        """
+        return [perms for _, _, perms in self.iter_menus(role_ids)]
+
+
+class RoleMenuIndexService:
+    """
+    角色菜单位图索引服务层
+
+    角色菜单位图索引按全局权限版本号缓存于进程内及Redis，角色或菜单发生变更时递增全局权限版本号即可使旧索引失效，
+    解析用户权限标识及过滤菜单树时只需对用户角色的位图做按位或，无需关联查询用户、角色及菜单表
+    """
+
+    _local_cache = LRUCache(
+        maxsize=CacheConstant.ROLE_MENU_INDEX_LOCAL_CACHE_SIZE, ttl=CacheConstant.ROLE_MENU_INDEX_LOCAL_CACHE_TTL
+    )
+
+    @classmethod
+    def _index_key(cls, global_version: str) -> str:
+        """
+        获取角色菜单位图索引缓存键名
+
+        :param global_version: 全局权限版本号
+        :return: 角色菜单位图索引缓存键名
+        """
+        return f'{RedisInitKeyConfig.ROLE_MENU_INDEX.key}:{global_version}'
+
+    @classmethod
+    async def get_index(
+        cls, redis: aioredis.Redis, query_db: AsyncSession, global_version: str | None
+    ) -> RoleMenuIndex:
+        """
+        获取全局权限版本号对应的角色菜单位图索引，优先读取进程内缓存，均未命中时查询数据库构建并回写缓存
+
+        :param redis: redis对象
+        :param query_db: orm对象
+        :param global_version: 全局权限版本号，需在查询数据库之前获取，保证回写的缓存不会比版本号更旧
+        :return: 角色菜单位图索引
+        """
+        global_version = str(global_version or 0)
+        index = cls._local_cache.get(global_version)
+        if index is not None:
+            return index
+        cache_value = await redis.get(cls._index_key(global_version))
+        if cache_value is not None:
+            index = RoleMenuIndex.loads(cache_value)
+        else:
+            index = RoleMenuIndex.build(
+                await MenuDao.get_menu_index_list(query_db), await RoleDao.get_role_menu_index_list(query_db)
+            )
+            await redis.set(
+                cls._index_key(global_version), index.dumps(), ex=CacheConstant.ROLE_MENU_INDEX_REDIS_CACHE_TTL
+            )
+        cls._local_cache.set(global_version, index)
+        return index
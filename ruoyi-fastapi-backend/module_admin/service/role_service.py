@@ -1,5 +1,7 @@
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
+from fastapi import Request
 from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,6 +20,7 @@ from module_admin.entity.vo.role_vo import (
     RolePageQueryModel,
 )
 from module_admin.entity.vo.user_vo import UserInfoModel, UserRolePageQueryModel
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
 
@@ -62,7 +65,8 @@ class RoleService:
         query_object: RolePageQueryModel,
         data_scope_sql: ColumnElement,
         is_page: bool = False,
-    ) -> PageModel | list[dict[str, Any]]:
+        is_stream: bool = False,
+    ) -> PageModel | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取角色列表信息service
 
@@ -70,9 +74,10 @@ class RoleService:
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 角色列表信息对象
         """
-        role_list_result = await RoleDao.get_role_list(query_db, query_object, data_scope_sql, is_page)
+        role_list_result = await RoleDao.get_role_list(query_db, query_object, data_scope_sql, is_page, is_stream)
 
         return role_list_result
 
@@ -141,10 +146,13 @@ class RoleService:
         return CommonConstant.UNIQUE
 
     @classmethod
-    async def add_role_services(cls, query_db: AsyncSession, page_object: AddRoleModel) -> CrudResponseModel:
+    async def add_role_services(
+        cls, request: Request, query_db: AsyncSession, page_object: AddRoleModel
+    ) -> CrudResponseModel:
         """
         新增角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 新增角色对象
         :return: 新增角色校验结果
@@ -161,16 +169,20 @@ class RoleService:
                 for menu in page_object.menu_ids:
                     await RoleDao.add_role_menu_dao(query_db, RoleMenuModel(roleId=role_id, menuId=menu))
             await query_db.commit()
+            await PrincipalCacheService.bump_global_version(request.app.state.redis)
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    async def edit_role_services(cls, query_db: AsyncSession, page_object: AddRoleModel) -> CrudResponseModel:
+    async def edit_role_services(
+        cls, request: Request, query_db: AsyncSession, page_object: AddRoleModel
+    ) -> CrudResponseModel:
         """
         编辑角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑角色对象
         :return: 编辑角色校验结果
@@ -197,6 +209,7 @@ class RoleService:
                                 query_db, RoleMenuModel(roleId=page_object.role_id, menuId=menu)
                             )
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -205,10 +218,13 @@ class RoleService:
             raise ServiceException(message='角色不存在')
 
     @classmethod
-    async def role_datascope_services(cls, query_db: AsyncSession, page_object: AddRoleModel) -> CrudResponseModel:
+    async def role_datascope_services(
+        cls, request: Request, query_db: AsyncSession, page_object: AddRoleModel
+    ) -> CrudResponseModel:
         """
         分配角色数据权限service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 角色数据权限对象
         :return: 分配角色数据权限结果
@@ -225,6 +241,7 @@ class RoleService:
                             query_db, RoleDeptModel(roleId=page_object.role_id, deptId=dept)
                         )
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='分配成功')
             except Exception as e:
                 await query_db.rollback()
@@ -233,10 +250,13 @@ class RoleService:
             raise ServiceException(message='角色不存在')
 
     @classmethod
-    async def delete_role_services(cls, query_db: AsyncSession, page_object: DeleteRoleModel) -> CrudResponseModel:
+    async def delete_role_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeleteRoleModel
+    ) -> CrudResponseModel:
         """
         删除角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除角色对象
         :return: 删除角色校验结果
@@ -257,6 +277,7 @@ class RoleService:
                     await RoleDao.delete_role_dept_dao(query_db, RoleDeptModel(**role_id_dict))
                     await RoleDao.delete_role_dao(query_db, RoleModel(**role_id_dict))
                 await query_db.commit()
+                await PrincipalCacheService.bump_global_version(request.app.state.redis)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -279,11 +300,13 @@ class RoleService:
         return result
 
     @staticmethod
-    async def export_role_list_services(role_list: list) -> bytes:
+    async def export_role_list_services(
+        role_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出角色列表信息service
 
-        :param role_list: 角色信息列表
+        :param role_list: 角色信息列表或分批获取的异步迭代器
         :return: 角色列表信息对象
         """
         # 创建一个映射字典，将英文键映射到中文键
@@ -300,14 +323,13 @@ class RoleService:
             'remark': '备注',
         }
 
-        for item in role_list:
+        def format_row(item: dict[str, Any]) -> None:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
                 item['status'] = '停用'
-        binary_data = ExcelUtil.export_list2excel(role_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(role_list, mapping_dict, format_row)
 
     @classmethod
     async def get_role_user_allocated_list_services(
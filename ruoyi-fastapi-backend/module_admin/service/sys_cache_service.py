@@ -0,0 +1,129 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any, ClassVar
+
+from redis import asyncio as aioredis
+
+from common.constant import CacheConstant
+from utils.cache_util import LRUCache
+from utils.log_util import logger
+
+_MISSING = object()
+
+
+class SysCacheService:
+    """
+    字典及参数配置进程内缓存服务层
+
+    字典数据及参数配置读多写少，读取时优先命中进程内缓存，未命中时再从Redis加载并回填。
+    数据变更后通过Redis发布订阅通知所有工作进程清除对应的进程内缓存，每个命名空间维护一个本地版本号，
+    加载期间收到失效通知时版本号发生变化，加载结果不再回填，避免旧数据覆盖失效操作。
+    进程内缓存同时设置过期时间，订阅连接中断期间遗漏的失效通知最迟在过期后生效
+    """
+
+    DICT = 'dict'
+    CONFIG = 'config'
+
+    _caches: ClassVar[dict[str, LRUCache]] = {
+        namespace: LRUCache(maxsize=CacheConstant.SYS_CACHE_LOCAL_SIZE, ttl=CacheConstant.SYS_CACHE_LOCAL_TTL)
+        for namespace in (DICT, CONFIG)
+    }
+    _versions: ClassVar[dict[str, int]] = dict.fromkeys((DICT, CONFIG), 0)
+
+    @classmethod
+    async def get(cls, namespace: str, key: str, loader: Callable[[], Awaitable[Any]], default: Any = None) -> Any:
+        """
+        读取缓存值，进程内缓存未命中时调用加载函数加载并回填
+
+        :param namespace: 缓存命名空间
+        :param key: 缓存键
+        :param loader: 加载函数
+        :param default: 加载结果为None时返回的默认值
+        :return: 缓存值
+        """
+        cache = cls._caches[namespace]
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            version = cls._versions[namespace]
+            value = await loader()
+            # 加载期间收到失效通知时不回填，下次读取重新加载
+            if cls._versions[namespace] == version:
+                cache.set(key, value)
+        return default if value is None else value
+
+    @classmethod
+    def clear_local(cls, namespace: str | None = None, keys: list[str] | None = None) -> None:
+        """
+        清除进程内缓存
+
+        :param namespace: 缓存命名空间，为None时清除所有命名空间
+        :param keys: 缓存键列表，为None时清除命名空间下的所有缓存
+        :return: None
+        """
+        for name in [namespace] if namespace else list(cls._caches):
+            cls._versions[name] += 1
+            if keys is None:
+                cls._caches[name].clear()
+            else:
+                for key in keys:
+                    cls._caches[name].pop(key)
+
+    @classmethod
+    async def invalidate(
+        cls, redis: aioredis.Redis, namespace: str | None = None, keys: list[str] | None = None
+    ) -> None:
+        """
+        清除当前进程的进程内缓存并通知其他工作进程清除，需在Redis中的缓存更新后调用
+
+        :param redis: redis对象
+        :param namespace: 缓存命名空间，为None时清除所有命名空间
+        :param keys: 缓存键列表，为None时清除命名空间下的所有缓存
+        :return: None
+        """
+        cls.clear_local(namespace, keys)
+        await redis.publish(
+            CacheConstant.SYS_CACHE_INVALIDATE_CHANNEL,
+            json.dumps({'namespace': namespace, 'keys': keys}, ensure_ascii=False),
+        )
+
+    @classmethod
+    async def listen_invalidation(cls, redis: aioredis.Redis) -> None:
+        """
+        订阅缓存失效通知，应用启动时作为后台任务运行，连接中断后自动重连
+
+        :param redis: redis对象
+        :return: None
+        """
+        backoff = 1
+        while True:
+            pubsub = redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(CacheConstant.SYS_CACHE_INVALIDATE_CHANNEL)
+                # 订阅建立前可能遗漏了失效通知，重新订阅后清空进程内缓存
+                cls.clear_local()
+                backoff = 1
+                async for message in pubsub.listen():
+                    cls._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'字典及参数配置缓存失效通知订阅异常，{backoff}秒后重试：{e}')
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                await pubsub.aclose()
+
+    @classmethod
+    def _handle_message(cls, message: dict[str, Any]) -> None:
+        """
+        处理缓存失效通知
+
+        :param message: 订阅消息
+        :return: None
+        """
+        try:
+            payload = json.loads(message.get('data'))
+            cls.clear_local(payload.get('namespace'), payload.get('keys'))
+        except (TypeError, ValueError):
+            logger.warning(f'无法解析的字典及参数配置缓存失效通知：{message}')
@@ -0,0 +1,247 @@
+import html
+import io
+import re
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from pydantic_validation_decorator import Xss
+from sqlalchemy import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.vo import CrudResponseModel
+from exceptions.exception import ServiceException
+from module_admin.dao.dept_dao import DeptDao
+from module_admin.dao.user_dao import UserDao
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from utils.log_util import logger
+
+ImportProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+class UserImportService:
+    """
+    用户批量导入服务层
+
+    导入数据先在pandas中按列整体校验，再通过IN查询一次性解析已存在的用户，数据权限校验改为与预先计算的可见部门及可见用户集合比对，
+    校验通过的数据按批次以多行语句写入并分批提交，校验失败的行记录到逐行错误报告中，不影响其他行的导入
+    """
+
+    IMPORT_BATCH_SIZE = 1000
+    HEADER_DICT = {
+        '部门编号': 'dept_id',
+        '登录名称': 'user_name',
+        '用户名称': 'nick_name',
+        '用户邮箱': 'email',
+        '手机号码': 'phonenumber',
+        '用户性别': 'sex',
+        '帐号状态': 'status',
+    }
+    SEX_DICT = {'男': '0', '女': '1', '未知': '2'}
+    STATUS_DICT = {'正常': '0', '停用': '1'}
+    FIELD_MAX_LENGTH_DICT = {
+        'user_name': ('用户账号', 30),
+        'nick_name': ('用户昵称', 30),
+        'email': ('邮箱', 50),
+        'phonenumber': ('手机号码', 11),
+    }
+    _email_adapter = TypeAdapter(EmailStr)
+    _xss_pattern = re.compile(Xss.HTML_PATTERN)
+
+    @classmethod
+    def read_user_dataframe(cls, contents: bytes) -> pd.DataFrame:
+        """
+        读取用户导入文件，所有列均按字符串读取，去除首尾空白后空字符串视为空值
+
+        :param contents: 用户导入文件二进制数据
+        :return: 列名已转换为字段名的用户数据
+        """
+        df = pd.read_excel(io.BytesIO(contents), dtype=str)
+        missing_header_list = [header for header in cls.HEADER_DICT if header not in df.columns]
+        if missing_header_list:
+            raise ServiceException(message=f'导入文件缺少列：{"、".join(missing_header_list)}，请使用导入模板')
+        df = df.rename(columns=cls.HEADER_DICT)[list(cls.HEADER_DICT.values())]
+        df = df.apply(lambda column: column.str.strip())
+        df = df.mask(df.eq('') | df.isna(), None)
+        # 行号从1开始，与导入文件中的数据行对应
+        df.index = pd.RangeIndex(1, len(df) + 1)
+
+        return df
+
+    @classmethod
+    def _mark_error(cls, errors: pd.Series, mask: pd.Series, message: str | pd.Series) -> None:
+        """
+        为尚未记录错误的行记录错误信息，每行只保留第一条错误
+
+        :param errors: 逐行错误信息
+        :param mask: 需要记录错误的行
+        :param message: 错误信息
+        :return: None
+        """
+        mask = mask & errors.isna()
+        if mask.any():
+            errors[mask] = message[mask] if isinstance(message, pd.Series) else message
+
+    @classmethod
+    def _is_valid_email(cls, email: str) -> bool:
+        """
+        判断邮箱格式是否正确
+
+        :param email: 邮箱
+        :return: 邮箱格式是否正确
+        """
+        try:
+            cls._email_adapter.validate_python(email)
+        except ValidationError:
+            return False
+        return True
+
+    @classmethod
+    def _validate_columns(cls, df: pd.DataFrame) -> pd.Series:
+        """
+        按列整体校验用户数据并转换性别、帐号状态及部门编号，校验规则与用户模型的字段校验一致
+
+        :param df: 用户数据
+        :return: 逐行错误信息，校验通过的行为空值
+        """
+        errors = pd.Series(None, index=df.index, dtype=object)
+        cls._mark_error(errors, df['user_name'].isna(), '用户账号不能为空')
+        cls._mark_error(errors, df['user_name'].duplicated() & df['user_name'].notna(), '用户账号在导入文件中重复')
+        cls._mark_error(errors, df['nick_name'].isna(), '用户昵称不能为空')
+        for field_name, (field_label, max_length) in cls.FIELD_MAX_LENGTH_DICT.items():
+            cls._mark_error(
+                errors, df[field_name].str.len() > max_length, f'{field_label}长度不能超过{max_length}个字符'
+            )
+        for field_name, field_label in (('user_name', '用户账号'), ('nick_name', '用户昵称')):
+            cls._mark_error(
+                errors,
+                df[field_name].map(lambda value: value is not None and cls._xss_pattern.search(value) is not None),
+                f'{field_label}不能包含脚本字符',
+            )
+        # 邮箱格式校验只对去重后的邮箱执行
+        valid_email_set = {email for email in df['email'].dropna().unique() if cls._is_valid_email(email)}
+        cls._mark_error(errors, df['email'].notna() & ~df['email'].isin(valid_email_set), '邮箱格式不正确')
+        # 性别及帐号状态兼容中文及编码两种写法，未填写时分别默认为未知及正常
+        df['sex'] = df['sex'].replace(cls.SEX_DICT).fillna('2')
+        cls._mark_error(errors, ~df['sex'].isin(cls.SEX_DICT.values()), '用户性别不正确')
+        df['status'] = df['status'].replace(cls.STATUS_DICT).fillna('0')
+        cls._mark_error(errors, ~df['status'].isin(cls.STATUS_DICT.values()), '帐号状态不正确')
+        dept_id = pd.to_numeric(df['dept_id'], errors='coerce')
+        cls._mark_error(errors, df['dept_id'].notna() & (dept_id.isna() | (dept_id % 1 != 0)), '部门编号格式不正确')
+        df['dept_id'] = dept_id.where(errors.isna()).astype('Int64')
+
+        return errors
+
+    @classmethod
+    async def _resolve_existing_user_ids(cls, query_db: AsyncSession, user_names: list[str]) -> dict[str, int]:
+        """
+        分批通过IN查询解析已存在的用户
+
+        :param query_db: orm对象
+        :param user_names: 用户账号列表
+        :return: 以用户账号为键、用户id为值的字典
+        """
+        user_id_mapping: dict[str, int] = {}
+        for start in range(0, len(user_names), cls.IMPORT_BATCH_SIZE):
+            user_id_mapping.update(
+                await UserDao.get_user_id_map_by_user_names(query_db, user_names[start : start + cls.IMPORT_BATCH_SIZE])
+            )
+
+        return user_id_mapping
+
+    @classmethod
+    async def import_users(
+        cls,
+        query_db: AsyncSession,
+        df: pd.DataFrame,
+        update_support: bool,
+        init_password_hash: str,
+        current_user: CurrentUserModel,
+        user_data_scope_sql: ColumnElement,
+        dept_data_scope_sql: ColumnElement,
+        progress_callback: ImportProgressCallback | None = None,
+    ) -> tuple[CrudResponseModel, list[int]]:
+        """
+        批量导入用户数据
+
+        :param query_db: orm对象
+        :param df: 通过read_user_dataframe读取的用户数据
+        :param update_support: 用户存在时是否更新
+        :param init_password_hash: 加密后的用户初始密码
+        :param current_user: 当前用户对象
+        :param user_data_scope_sql: 用户数据权限sql
+        :param dept_data_scope_sql: 部门数据权限sql
+        :param progress_callback: 进度回调函数，每批次提交后以已处理行数及总行数调用
+        :return: 导入结果及被更新的用户id列表，导入结果的result为逐行错误报告
+        """
+        total = len(df)
+        errors = cls._validate_columns(df)
+        user_id_mapping = await cls._resolve_existing_user_ids(query_db, df.loc[errors.isna(), 'user_name'].tolist())
+        user_id = df['user_name'].map(user_id_mapping).astype('Int64')
+        is_exist = user_id.notna()
+        if not update_support:
+            cls._mark_error(errors, is_exist, '用户账号' + df['user_name'].fillna('') + '已存在')
+        cls._mark_error(errors, user_id.eq(1).fillna(False), '不允许操作超级管理员用户')
+        if not current_user.user.admin:
+            dept_id_set = await DeptDao.get_dept_ids_by_data_scope(query_db, dept_data_scope_sql)
+            cls._mark_error(errors, df['dept_id'].notna() & ~df['dept_id'].isin(dept_id_set), '没有权限访问部门数据')
+            scope_user_id_set = await UserDao.get_user_ids_by_data_scope(
+                query_db, user_id[is_exist & errors.isna()].astype(int).tolist(), user_data_scope_sql
+            )
+            cls._mark_error(errors, is_exist & ~user_id.isin(scope_user_id_set), '没有权限访问用户数据')
+
+        now = datetime.now()
+        operator = current_user.user.user_name
+        valid_df = df[errors.isna()].assign(user_id=user_id).astype(object).where(lambda x: x.notna(), None)
+        valid_records = valid_df.to_dict('records')
+        add_count = 0
+        edit_user_id_list: list[int] = []
+        processed = total - len(valid_records)
+        for start in range(0, len(valid_records), cls.IMPORT_BATCH_SIZE):
+            add_user_list: list[dict[str, Any]] = []
+            edit_user_list: list[dict[str, Any]] = []
+            for record in valid_records[start : start + cls.IMPORT_BATCH_SIZE]:
+                if record['user_id'] is None:
+                    record.pop('user_id')
+                    add_user_list.append(
+                        {
+                            **record,
+                            'password': init_password_hash,
+                            'create_by': operator,
+                            'create_time': now,
+                            'update_by': operator,
+                            'update_time': now,
+                        }
+                    )
+                else:
+                    edit_user_list.append({**record, 'update_by': operator, 'update_time': now})
+            try:
+                await UserDao.add_user_batch_dao(query_db, add_user_list)
+                await UserDao.edit_user_batch_dao(query_db, edit_user_list)
+                await query_db.commit()
+            except Exception as e:
+                await query_db.rollback()
+                raise e
+            add_count += len(add_user_list)
+            edit_user_id_list.extend(user['user_id'] for user in edit_user_list)
+            processed += len(add_user_list) + len(edit_user_list)
+            logger.info(f'用户导入进度：{processed}/{total}')
+            if progress_callback:
+                await progress_callback(processed, total)
+        if progress_callback and not valid_records:
+            await progress_callback(total, total)
+
+        error_report = [
+            {'rowNum': row_num, 'userName': df.at[row_num, 'user_name'], 'message': message}
+            for row_num, message in errors.dropna().items()
+        ]
+        message_list = [
+            f'导入完成，共{total}条，新增{add_count}条，更新{len(edit_user_id_list)}条，失败{len(error_report)}条'
+        ]
+        message_list.extend(f'{row["rowNum"]}.{html.escape(row["message"])}' for row in error_report)
+
+        return CrudResponseModel(
+            is_success=True, message='<br/>'.join(message_list), result=error_report
+        ), edit_user_id_list
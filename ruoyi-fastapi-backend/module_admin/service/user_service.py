@@ -1,17 +1,18 @@
-import io
-from datetime import datetime
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
 from typing import Any
 
-import pandas as pd
 from fastapi import Request, UploadFile
+from redis import asyncio as aioredis
 from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.constant import CommonConstant
+from common.constant import AsyncTaskConstant, CommonConstant
 from common.vo import CrudResponseModel, PageModel
 from exceptions.exception import ServiceException
 from module_admin.dao.user_dao import UserDao
 from module_admin.entity.do.user_do import SysUserRole
+from module_admin.entity.vo.common_vo import AsyncTaskModel
 from module_admin.entity.vo.post_vo import PostPageQueryModel
 from module_admin.entity.vo.user_vo import (
     AddUserModel,
@@ -32,10 +33,12 @@ from module_admin.entity.vo.user_vo import (
     UserRoleResponseModel,
     UserRowModel,
 )
+from module_admin.service.async_task_service import AsyncTaskReporter, AsyncTaskService
 from module_admin.service.config_service import ConfigService
-from module_admin.service.dept_service import DeptService
 from module_admin.service.post_service import PostService
+from module_admin.service.principal_cache_service import PrincipalCacheService
 from module_admin.service.role_service import RoleService
+from module_admin.service.user_import_service import ImportProgressCallback, UserImportService
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
 from utils.pwd_util import PwdUtil
@@ -53,7 +56,8 @@ class UserService:
         query_object: UserPageQueryModel,
         data_scope_sql: ColumnElement,
         is_page: bool = False,
-    ) -> PageModel[UserRowModel] | list[dict[str, Any]]:
+        is_stream: bool = False,
+    ) -> PageModel[UserRowModel] | list[dict[str, Any]] | AsyncIterator[list[Any]]:
         """
         获取用户列表信息service
 
@@ -61,9 +65,12 @@ class UserService:
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
         :param is_page: 是否开启分页
+        :param is_stream: 不分页时是否分批流式获取
         :return: 用户列表信息对象
         """
-        query_result = await UserDao.get_user_list(query_db, query_object, data_scope_sql, is_page)
+        query_result = await UserDao.get_user_list(query_db, query_object, data_scope_sql, is_page, is_stream)
+        if is_stream and not is_page:
+            return cls.__merge_user_dept_batches(query_result)
         if is_page:
             user_list_result = PageModel[UserRowModel](
                 **{
@@ -78,6 +85,19 @@ class UserService:
 
         return user_list_result
 
+    @classmethod
+    async def __merge_user_dept_batches(
+        cls, query_result: AsyncIterator[list[list[dict[str, Any]]]]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        将流式获取的用户及部门信息合并为用户列表格式
+
+        :param query_result: 用户及部门信息批次的异步迭代器
+        :return: 用户列表批次的异步迭代器
+        """
+        async for batch in query_result:
+            yield [{**row[0], 'dept': row[1]} for row in batch]
+
     @classmethod
     async def check_user_allowed_services(cls, check_user: UserModel) -> CrudResponseModel:
         """
@@ -200,10 +220,13 @@ class UserService:
             del edit_user['type']
 
     @classmethod
-    async def edit_user_services(cls, query_db: AsyncSession, page_object: EditUserModel) -> CrudResponseModel:
+    async def edit_user_services(
+        cls, request: Request, query_db: AsyncSession, page_object: EditUserModel
+    ) -> CrudResponseModel:
         """
         编辑用户信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑用户对象
         :return: 编辑用户校验结果
@@ -235,6 +258,7 @@ class UserService:
                                 query_db, UserPostModel(userId=page_object.user_id, postId=post)
                             )
                 await query_db.commit()
+                await PrincipalCacheService.bump_user_version(request.app.state.redis, [page_object.user_id])
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -243,10 +267,13 @@ class UserService:
             raise ServiceException(message='用户不存在')
 
     @classmethod
-    async def delete_user_services(cls, query_db: AsyncSession, page_object: DeleteUserModel) -> CrudResponseModel:
+    async def delete_user_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeleteUserModel
+    ) -> CrudResponseModel:
         """
         删除用户信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除用户对象
         :return: 删除用户校验结果
@@ -264,6 +291,7 @@ class UserService:
                     await UserDao.delete_user_post_dao(query_db, UserPostModel(**user_id_dict))
                     await UserDao.delete_user_dao(query_db, UserModel(**user_id_dict))
                 await query_db.commit()
+                await PrincipalCacheService.bump_user_version(request.app.state.redis, user_id_list)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -333,10 +361,13 @@ class UserService:
         )
 
     @classmethod
-    async def reset_user_services(cls, query_db: AsyncSession, page_object: ResetUserModel) -> CrudResponseModel:
+    async def reset_user_services(
+        cls, request: Request, query_db: AsyncSession, page_object: ResetUserModel
+    ) -> CrudResponseModel:
         """
         重置用户密码service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 重置用户对象
         :return: 重置用户校验结果
@@ -344,152 +375,157 @@ class UserService:
         reset_user = page_object.model_dump(exclude_unset=True, exclude={'admin'})
         if page_object.old_password:
             user = (await UserDao.get_user_detail_by_id(query_db, user_id=page_object.user_id)).get('user_basic_info')
-            if not PwdUtil.verify_password(page_object.old_password, user.password):
+            if not await PwdUtil.verify_password(page_object.old_password, user.password):
                 raise ServiceException(message='修改密码失败，旧密码错误')
-            if PwdUtil.verify_password(page_object.password, user.password):
+            if await PwdUtil.verify_password(page_object.password, user.password):
                 raise ServiceException(message='新密码不能与旧密码相同')
             del reset_user['old_password']
         if page_object.sms_code and page_object.session_id:
             del reset_user['sms_code']
             del reset_user['session_id']
         try:
-            reset_user['password'] = PwdUtil.get_password_hash(page_object.password)
+            reset_user['password'] = await PwdUtil.get_password_hash(page_object.password)
             await UserDao.edit_user_dao(query_db, reset_user)
             await query_db.commit()
+            await PrincipalCacheService.bump_user_version(request.app.state.redis, [page_object.user_id])
             return CrudResponseModel(is_success=True, message='重置成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    def _set_row_sex_value(cls, row: pd.Series) -> None:
+    async def batch_import_user_services(
+        cls,
+        request: Request,
+        query_db: AsyncSession,
+        file: UploadFile,
+        update_support: bool,
+        current_user: CurrentUserModel,
+        user_data_scope_sql: ColumnElement,
+        dept_data_scope_sql: ColumnElement,
+        progress_callback: ImportProgressCallback | None = None,
+    ) -> CrudResponseModel:
         """
-        设置行性别值
+        批量导入用户service
 
-        :param row: 行数据
-        :return: None
+        :param request: Request对象
+        :param query_db: orm对象
+        :param file: 用户导入文件对象
+        :param update_support: 用户存在时是否更新
+        :param current_user: 当前用户对象
+        :param user_data_scope_sql: 用户数据权限sql
+        :param dept_data_scope_sql: 部门数据权限sql
+        :param progress_callback: 进度回调函数，每批次提交后以已处理行数及总行数调用
+        :return: 批量导入用户结果，result为逐行错误报告
         """
-        if row['sex'] == '男':
-            row['sex'] = '0'
-        if row['sex'] == '女':
-            row['sex'] = '1'
-        if row['sex'] == '未知':
-            row['sex'] = '2'
+        contents = await file.read()
+        await file.close()
+
+        return await cls.import_user_contents_services(
+            request.app.state.redis,
+            query_db,
+            contents,
+            update_support,
+            current_user,
+            user_data_scope_sql,
+            dept_data_scope_sql,
+            progress_callback,
+        )
 
     @classmethod
-    def _set_row_status_value(cls, row: pd.Series) -> None:
+    async def import_user_contents_services(
+        cls,
+        redis: aioredis.Redis,
+        query_db: AsyncSession,
+        contents: bytes,
+        update_support: bool,
+        current_user: CurrentUserModel,
+        user_data_scope_sql: ColumnElement,
+        dept_data_scope_sql: ColumnElement,
+        progress_callback: ImportProgressCallback | None = None,
+    ) -> CrudResponseModel:
         """
-        设置行状态值
+        根据用户导入文件内容批量导入用户service，供同步导入接口及异步导入任务共用
 
-        :param row: 行数据
-        :return: None
+        :param redis: redis对象
+        :param query_db: orm对象
+        :param contents: 用户导入文件二进制数据
+        :param update_support: 用户存在时是否更新
+        :param current_user: 当前用户对象
+        :param user_data_scope_sql: 用户数据权限sql
+        :param dept_data_scope_sql: 部门数据权限sql
+        :param progress_callback: 进度回调函数，每批次提交后以已处理行数及总行数调用
+        :return: 批量导入用户结果，result为逐行错误报告
         """
-        if row['status'] == '正常':
-            row['status'] = '0'
-        if row['status'] == '停用':
-            row['status'] = '1'
+        df = UserImportService.read_user_dataframe(contents)
+        # 导入用户的初始密码均相同，只需加密一次，避免逐行执行bcrypt计算
+        init_password_hash = await PwdUtil.get_password_hash(
+            await ConfigService.query_config_list_from_cache_services(redis, 'sys.user.initPassword')
+        )
+        import_result, edit_user_id_list = await UserImportService.import_users(
+            query_db,
+            df,
+            update_support,
+            init_password_hash,
+            current_user,
+            user_data_scope_sql,
+            dept_data_scope_sql,
+            progress_callback,
+        )
+        await PrincipalCacheService.bump_user_version(redis, edit_user_id_list)
+
+        return import_result
 
     @classmethod
-    async def batch_import_user_services(
+    async def submit_batch_import_user_task_services(
         cls,
         request: Request,
-        query_db: AsyncSession,
         file: UploadFile,
         update_support: bool,
         current_user: CurrentUserModel,
         user_data_scope_sql: ColumnElement,
         dept_data_scope_sql: ColumnElement,
-    ) -> CrudResponseModel:
+    ) -> AsyncTaskModel:
         """
-        批量导入用户service
+        提交异步批量导入用户任务service，导入失败的行写入错误报告excel作为任务结果文件
 
         :param request: Request对象
-        :param query_db: orm对象
         :param file: 用户导入文件对象
         :param update_support: 用户存在时是否更新
         :param current_user: 当前用户对象
         :param user_data_scope_sql: 用户数据权限sql
         :param dept_data_scope_sql: 部门数据权限sql
-        :return: 批量导入用户结果
-        """
-        header_dict = {
-            '部门编号': 'dept_id',
-            '登录名称': 'user_name',
-            '用户名称': 'nick_name',
-            '用户邮箱': 'email',
-            '手机号码': 'phonenumber',
-            '用户性别': 'sex',
-            '帐号状态': 'status',
-        }
+        :return: 已提交的任务信息
+        """
+        # 上传文件在请求结束后关闭，需在提交任务前读取文件内容
         contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
         await file.close()
-        df.rename(columns=header_dict, inplace=True)
-        add_error_result = []
-        count = 0
-        try:
-            for _index, row in df.iterrows():
-                count = count + 1
-                cls._set_row_sex_value(row)
-                cls._set_row_status_value(row)
-                add_user = UserModel(
-                    deptId=row['dept_id'],
-                    userName=row['user_name'],
-                    password=PwdUtil.get_password_hash(
-                        await ConfigService.query_config_list_from_cache_services(
-                            request.app.state.redis, 'sys.user.initPassword'
-                        )
-                    ),
-                    nickName=row['nick_name'],
-                    email=row['email'],
-                    phonenumber=str(row['phonenumber']),
-                    sex=row['sex'],
-                    status=row['status'],
-                    createBy=current_user.user.user_name,
-                    createTime=datetime.now(),
-                    updateBy=current_user.user.user_name,
-                    updateTime=datetime.now(),
+        redis = request.app.state.redis
+
+        async def runner(query_db: AsyncSession, reporter: AsyncTaskReporter) -> None:
+            import_result = await cls.import_user_contents_services(
+                redis,
+                query_db,
+                contents,
+                update_support,
+                current_user,
+                user_data_scope_sql,
+                dept_data_scope_sql,
+                reporter.progress,
+            )
+            if import_result.result:
+                error_report_data = await asyncio.to_thread(
+                    ExcelUtil.export_list2excel,
+                    import_result.result,
+                    {'rowNum': '行号', 'userName': '登录名称', 'message': '错误信息'},
                 )
-                user_info = await UserDao.get_user_by_info(query_db, UserModel(userName=row['user_name']))
-                if user_info:
-                    if update_support:
-                        edit_user_model = UserModel(
-                            userId=user_info.user_id,
-                            deptId=row['dept_id'],
-                            userName=row['user_name'],
-                            nickName=row['nick_name'],
-                            email=row['email'],
-                            phonenumber=str(row['phonenumber']),
-                            sex=row['sex'],
-                            status=row['status'],
-                            updateBy=current_user.user.user_name,
-                            updateTime=datetime.now(),
-                        )
-                        edit_user_model.validate_fields()
-                        await cls.check_user_allowed_services(edit_user_model)
-                        if not current_user.user.admin:
-                            await cls.check_user_data_scope_services(
-                                query_db, edit_user_model.user_id, user_data_scope_sql
-                            )
-                            await DeptService.check_dept_data_scope_services(
-                                query_db, edit_user_model.dept_id, dept_data_scope_sql
-                            )
-                        edit_user = edit_user_model.model_dump(exclude_unset=True)
-                        await UserDao.edit_user_dao(query_db, edit_user)
-                    else:
-                        add_error_result.append(f'{count}.用户账号{row["user_name"]}已存在')
-                else:
-                    add_user.validate_fields()
-                    if not current_user.user.admin:
-                        await DeptService.check_dept_data_scope_services(
-                            query_db, add_user.dept_id, dept_data_scope_sql
-                        )
-                    await UserDao.add_user_dao(query_db, add_user)
-            await query_db.commit()
-            return CrudResponseModel(is_success=True, message='\n'.join(add_error_result))
-        except Exception as e:
-            await query_db.rollback()
-            raise e
+                await AsyncTaskService.write_result_file(reporter.result_file_name(), error_report_data)
+            # 逐行错误信息已写入错误报告，任务信息只保留导入结果汇总
+            reporter.task.message = import_result.message.split('<br/>', 1)[0]
+
+        return await AsyncTaskService.submit_task_services(
+            current_user, AsyncTaskConstant.TYPE_IMPORT, '用户数据导入', runner
+        )
 
     @staticmethod
     async def get_user_import_template_services() -> bytes:
@@ -508,12 +544,14 @@ class UserService:
         return binary_data
 
     @staticmethod
-    async def export_user_list_services(user_list: list) -> bytes:
+    async def export_user_list_services(
+        user_list: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+    ) -> AsyncIterator[bytes]:
         """
         导出用户信息service
 
-        :param user_list: 用户信息列表
-        :return: 用户信息对应excel的二进制数据
+        :param user_list: 用户信息列表或分批获取的异步迭代器
+        :return: 用户信息对应excel二进制数据分块的异步迭代器
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -532,7 +570,7 @@ class UserService:
             'remark': '备注',
         }
 
-        for item in user_list:
+        def format_row(item: dict[str, Any]) -> None:
             item['deptName'] = item.get('dept').get('deptName')
             if item.get('status') == '0':
                 item['status'] = '正常'
@@ -544,9 +582,8 @@ class UserService:
                 item['sex'] = '女'
             else:
                 item['sex'] = '未知'
-        binary_data = ExcelUtil.export_list2excel(user_list, mapping_dict)
 
-        return binary_data
+        return ExcelUtil.export_stream2excel(user_list, mapping_dict, format_row)
 
     @classmethod
     async def get_user_role_allocated_list_services(
@@ -581,10 +618,13 @@ class UserService:
         return result
 
     @classmethod
-    async def add_user_role_services(cls, query_db: AsyncSession, page_object: CrudUserRoleModel) -> CrudResponseModel:
+    async def add_user_role_services(
+        cls, request: Request, query_db: AsyncSession, page_object: CrudUserRoleModel
+    ) -> CrudResponseModel:
         """
         新增用户关联角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 新增用户关联角色对象
         :return: 新增用户关联角色校验结果
@@ -596,6 +636,7 @@ class UserService:
                 for role_id in role_id_list:
                     await UserDao.add_user_role_dao(query_db, UserRoleModel(userId=page_object.user_id, roleId=role_id))
                 await query_db.commit()
+                await PrincipalCacheService.bump_user_version(request.app.state.redis, [page_object.user_id])
                 return CrudResponseModel(is_success=True, message='分配成功')
             except Exception as e:
                 await query_db.rollback()
@@ -604,6 +645,7 @@ class UserService:
             try:
                 await UserDao.delete_user_role_by_user_and_role_dao(query_db, UserRoleModel(userId=page_object.user_id))
                 await query_db.commit()
+                await PrincipalCacheService.bump_user_version(request.app.state.redis, [page_object.user_id])
                 return CrudResponseModel(is_success=True, message='分配成功')
             except Exception as e:
                 await query_db.rollback()
@@ -619,6 +661,7 @@ class UserService:
                         continue
                     await UserDao.add_user_role_dao(query_db, UserRoleModel(userId=user_id, roleId=page_object.role_id))
                 await query_db.commit()
+                await PrincipalCacheService.bump_user_version(request.app.state.redis, user_id_list)
                 return CrudResponseModel(is_success=True, message='新增成功')
             except Exception as e:
                 await query_db.rollback()
@@ -628,11 +671,12 @@ class UserService:
 
     @classmethod
     async def delete_user_role_services(
-        cls, query_db: AsyncSession, page_object: CrudUserRoleModel
+        cls, request: Request, query_db: AsyncSession, page_object: CrudUserRoleModel
     ) -> CrudResponseModel:
         """
         删除用户关联角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除用户关联角色对象
         :return: 删除用户关联角色校验结果
@@ -644,6 +688,7 @@ class UserService:
                         query_db, UserRoleModel(userId=page_object.user_id, roleId=page_object.role_id)
                     )
                     await query_db.commit()
+                    await PrincipalCacheService.bump_user_version(request.app.state.redis, [page_object.user_id])
                     return CrudResponseModel(is_success=True, message='删除成功')
                 except Exception as e:
                     await query_db.rollback()
@@ -656,6 +701,7 @@ class UserService:
                             query_db, UserRoleModel(userId=user_id, roleId=page_object.role_id)
                         )
                     await query_db.commit()
+                    await PrincipalCacheService.bump_user_version(request.app.state.redis, user_id_list)
                     return CrudResponseModel(is_success=True, message='删除成功')
                 except Exception as e:
                     await query_db.rollback()
@@ -6,16 +6,20 @@ from fastapi import FastAPI
 
 from common.constant import LockConstant
 from common.router import auto_register_routers
-from config.env import AppConfig
-from config.get_db import close_async_engine, init_create_table
+from config.env import AppConfig, LogConfig
+from config.get_db import close_async_engine, init_create_table, init_dept_closure
 from config.get_redis import RedisUtil
 from config.get_scheduler import SchedulerUtil
 from exceptions.handle import handle_exception
 from middlewares.handle import handle_middleware
+from module_admin.service.async_task_service import AsyncTaskService
 from module_admin.service.log_service import LogAggregatorService
+from module_admin.service.sys_cache_service import SysCacheService
 from sub_applications.handle import handle_sub_applications
 from utils.common_util import worship
+from utils.ip_location_util import IpLocationUtil
 from utils.log_util import logger
+from utils.pwd_util import PwdUtil
 from utils.server_util import APIDocsUtil, IPUtil, StartupUtil
 
 
@@ -27,7 +31,11 @@ async def _start_background_tasks(app: FastAPI) -> None:
     :return: None
     """
     await SchedulerUtil.init_system_scheduler(app.state.redis)
-    app.state.log_aggregator_task = asyncio.create_task(LogAggregatorService.consume_stream(app.state.redis))
+    await AsyncTaskService.start_workers(app.state.redis)
+    app.state.sys_cache_task = asyncio.create_task(SysCacheService.listen_invalidation(app.state.redis))
+    # 使用独立进程（python -m module_admin.log_worker）消费日志时，应用进程不再运行日志聚合消费者
+    if LogConfig.log_aggregator_embedded:
+        app.state.log_aggregator_task = asyncio.create_task(LogAggregatorService.consume_stream(app.state.redis))
 
 
 async def _stop_background_tasks(app: FastAPI) -> None:
@@ -37,6 +45,7 @@ async def _stop_background_tasks(app: FastAPI) -> None:
     :param app: FastAPI对象
     :return: None
     """
+    await AsyncTaskService.stop_workers()
     log_task = getattr(app.state, 'log_aggregator_task', None)
     if log_task:
         log_task.cancel()
@@ -44,6 +53,13 @@ async def _stop_background_tasks(app: FastAPI) -> None:
             await log_task
         except asyncio.CancelledError:
             pass
+    sys_cache_task = getattr(app.state, 'sys_cache_task', None)
+    if sys_cache_task:
+        sys_cache_task.cancel()
+        try:
+            await sys_cache_task
+        except asyncio.CancelledError:
+            pass
     lock_task = getattr(app.state, 'lock_renewal_task', None)
     if lock_task:
         lock_task.cancel()
@@ -90,6 +106,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if startup_log_enabled:
             worship()
         await init_create_table()
+        # 部门闭包表只由持有启动锁的worker重建
+        if startup_log_enabled:
+            await init_dept_closure()
         await RedisUtil.check_redis_connection(app.state.redis, log_enabled=startup_log_enabled)
         await RedisUtil.init_sys_dict(app.state.redis)
         await RedisUtil.init_sys_config(app.state.redis)
@@ -129,6 +148,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     shutdown_log_enabled = getattr(app.state, 'startup_log_enabled', False)
     with logger.contextualize(startup_phase=True, startup_log_enabled=shutdown_log_enabled):
         await _stop_background_tasks(app)
+        await IpLocationUtil.close()
+        PwdUtil.shutdown()
 
 
 def create_app() -> FastAPI:
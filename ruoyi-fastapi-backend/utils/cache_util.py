@@ -0,0 +1,85 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class LRUCache:
+    """
+    进程内LRU缓存工具类，支持条目数上限及过期时间
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        """
+        初始化进程内LRU缓存
+
+        :param maxsize: 最大缓存条目数
+        :param ttl: 缓存过期时间（秒），为None时表示不过期
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取缓存值，命中时将其标记为最近使用
+
+        :param key: 缓存键
+        :param default: 未命中时的默认值
+        :return: 缓存值
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expire_at, value = item
+        if expire_at is not None and expire_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        设置缓存值，超出条目数上限时淘汰最久未使用的条目
+
+        :param key: 缓存键
+        :param value: 缓存值
+        :param ttl: 当前条目的过期时间（秒），为None时使用默认过期时间
+        :return: None
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expire_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        移除缓存值
+
+        :param key: 缓存键
+        :param default: 不存在时的默认值
+        :return: 被移除的缓存值
+        """
+        item = self._data.pop(key, None)
+        if item is None:
+            return default
+        return item[1]
+
+    def clear(self) -> None:
+        """
+        清空缓存
+
+        :return: None
+        """
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
@@ -1,14 +1,16 @@
 import io
 import os
 import re
-from collections.abc import Generator, Sequence
-from typing import Any, Literal, overload
+from collections.abc import Callable, Generator, Sequence
+from functools import lru_cache
+from typing import Any, ClassVar, Literal, overload
 
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
+from sqlalchemy import inspect
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.collections import InstrumentedList
 from sqlalchemy.sql.expression import TextClause, null
@@ -45,11 +47,77 @@ def worship() -> None:
     """)
 
 
+@lru_cache(maxsize=4096)
+def _snake_to_camel(snake_str: str) -> str:
+    """
+    下划线形式字符串(snake_case)转换为小驼峰形式字符串(camelCase)，键名种类有限，转换结果缓存复用
+
+    :param snake_str: 下划线形式字符串
+    :return: 小驼峰形式字符串
+    """
+    # 分割字符串
+    words = snake_str.split('_')
+    # 小驼峰命名，第一个词首字母小写，其余词首字母大写
+    return words[0] + ''.join(word.capitalize() for word in words[1:])
+
+
+@lru_cache(maxsize=4096)
+def _camel_to_snake(camel_str: str) -> str:
+    """
+    小驼峰形式字符串(camelCase)转换为下划线形式字符串(snake_case)，键名种类有限，转换结果缓存复用
+
+    :param camel_str: 小驼峰形式字符串
+    :return: 下划线形式字符串
+    """
+    # 在大写字母前添加一个下划线，然后将整个字符串转为小写
+    words = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', camel_str)
+    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', words).lower()
+
+
 class SqlalchemyUtil:
     """
     sqlalchemy工具类
+
+    模型对象转换为字典时，按模型类缓存由映射列名预先计算的键名映射，逐行转换时只需查表，
+    并直接读取对象的__dict__生成结果，不再先复制__dict__再逐个转换键名
     """
 
+    _key_map_cache: ClassVar[dict[tuple[type, str], dict[str, str]]] = {}
+
+    @classmethod
+    def _get_key_converter(
+        cls, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake']
+    ) -> Callable[[str], str] | None:
+        """
+        获取键名转换函数
+
+        :param transform_case: 转换得到的结果形式
+        :return: 键名转换函数，不转换时返回None
+        """
+        if transform_case == 'snake_to_camel':
+            return CamelCaseUtil.snake_to_camel
+        if transform_case == 'camel_to_snake':
+            return SnakeCaseUtil.camel_to_snake
+        return None
+
+    @classmethod
+    def _get_key_map(
+        cls, model: type[Base], transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake']
+    ) -> dict[str, str]:
+        """
+        获取模型类映射列名对应的转换后键名，首次获取时根据模型映射信息计算并缓存
+
+        :param model: sqlalchemy模型类
+        :param transform_case: 转换得到的结果形式
+        :return: 属性名与转换后键名的映射
+        """
+        key_map = cls._key_map_cache.get((model, transform_case))
+        if key_map is None:
+            converter = cls._get_key_converter(transform_case)
+            key_map = {attr.key: converter(attr.key) if converter else attr.key for attr in inspect(model).column_attrs}
+            cls._key_map_cache[(model, transform_case)] = key_map
+        return key_map
+
     @classmethod
     def base_to_dict(
         cls, obj: Base | dict, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake'] = 'no_case'
@@ -61,20 +129,26 @@ class SqlalchemyUtil:
         :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)，默认为'no_case'
         :return: 字典结果
         """
+        converter = cls._get_key_converter(transform_case)
         if isinstance(obj, Base):
-            base_dict = obj.__dict__.copy()
-            base_dict.pop('_sa_instance_state', None)
-            for name, value in base_dict.items():
-                if isinstance(value, InstrumentedList):
-                    base_dict[name] = cls.serialize_result(value, 'snake_to_camel')
-        elif isinstance(obj, dict):
-            base_dict = obj.copy()
-        if transform_case == 'snake_to_camel':
-            return {CamelCaseUtil.snake_to_camel(k): v for k, v in base_dict.items()}
-        if transform_case == 'camel_to_snake':
-            return {SnakeCaseUtil.camel_to_snake(k): v for k, v in base_dict.items()}
-
-        return base_dict
+            key_map = cls._get_key_map(type(obj), transform_case)
+            base_dict = {}
+            for name, value in obj.__dict__.items():
+                if name == '_sa_instance_state':
+                    continue
+                key = key_map.get(name)
+                if key is not None:
+                    base_dict[key] = value
+                # 非映射列属性（如已加载的关联关系）
+                elif isinstance(value, InstrumentedList):
+                    base_dict[converter(name) if converter else name] = cls.serialize_result(value, 'snake_to_camel')
+                else:
+                    base_dict[converter(name) if converter else name] = value
+            return base_dict
+        if converter:
+            return {converter(k): v for k, v in obj.items()}
+
+        return obj.copy()
 
     @classmethod
     @overload
@@ -145,10 +219,9 @@ class SqlalchemyUtil:
             if any(isinstance(row, Base) for row in result):
                 return [cls.serialize_result(row, transform_case) for row in result]
             result_dict = result._asdict()
-            if transform_case == 'snake_to_camel':
-                return {CamelCaseUtil.snake_to_camel(k): v for k, v in result_dict.items()}
-            if transform_case == 'camel_to_snake':
-                return {SnakeCaseUtil.camel_to_snake(k): v for k, v in result_dict.items()}
+            converter = cls._get_key_converter(transform_case)
+            if converter:
+                return {converter(k): v for k, v in result_dict.items()}
             return result_dict
         return result
 
@@ -179,10 +252,7 @@ class CamelCaseUtil:
         :param snake_str: 下划线形式字符串
         :return: 小驼峰形式字符串
         """
-        # 分割字符串
-        words = snake_str.split('_')
-        # 小驼峰命名，第一个词首字母小写，其余词首字母大写
-        return words[0] + ''.join(word.capitalize() for word in words[1:])
+        return _snake_to_camel(snake_str)
 
     @classmethod
     @overload
@@ -240,9 +310,7 @@ class SnakeCaseUtil:
         :param camel_str: 小驼峰形式字符串
         :return: 下划线形式字符串
         """
-        # 在大写字母前添加一个下划线，然后将整个字符串转为小写
-        words = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', camel_str)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', words).lower()
+        return _camel_to_snake(camel_str)
 
     @classmethod
     @overload
@@ -1,8 +1,13 @@
+import asyncio
 import io
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from typing import Any
 
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Alignment, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 
@@ -12,6 +17,8 @@ class ExcelUtil:
     Excel操作类
     """
 
+    STREAM_CHUNK_SIZE = 1024 * 1024
+
     @classmethod
     def __mapping_list(cls, list_data: list, mapping_dict: dict) -> list[dict]:
         """
@@ -42,6 +49,61 @@ class ExcelUtil:
 
         return binary_data
 
+    @classmethod
+    async def __iter_batches(
+        cls, data: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        工具方法：将数据列表或数据批次的异步迭代器统一为数据批次的异步迭代器
+
+        :param data: 数据列表或数据批次的异步迭代器
+        :return: 数据批次的异步迭代器
+        """
+        if isinstance(data, list):
+            yield data
+        else:
+            async for batch in data:
+                yield batch
+
+    @classmethod
+    async def export_stream2excel(
+        cls,
+        data: AsyncIterable[list[dict[str, Any]]] | list[dict[str, Any]],
+        mapping_dict: dict,
+        row_formatter: Callable[[dict[str, Any]], None] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        工具方法：将分批获取的数据转化为excel的二进制数据，使用openpyxl只写模式逐行写入，
+        工作表内容写入临时文件，内存占用与总行数无关。
+        xlsx需在全部数据写入并压缩保存后才能输出，首个分块要等所有批次读取完成后才返回，响应耗时随总行数增长，
+        数据量较大时应使用异步导出任务（isAsync=true）在后台生成文件
+
+        :param data: 数据列表或数据批次的异步迭代器
+        :param mapping_dict: 映射字典
+        :param row_formatter: 可选，写入前对每行数据进行格式化的函数
+        :return: excel二进制数据分块的异步迭代器
+        """
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Sheet1')
+        header_row = []
+        for header in mapping_dict.values():
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = Font(bold=True)
+            cell.alignment = Alignment(horizontal='center')
+            header_row.append(cell)
+        worksheet.append(header_row)
+        async for batch in cls.__iter_batches(data):
+            for item in batch:
+                if row_formatter:
+                    row_formatter(item)
+                worksheet.append([item.get(key) for key in mapping_dict])
+        with tempfile.TemporaryFile() as file:
+            # 压缩生成xlsx文件耗时较长，放到线程中执行避免阻塞事件循环
+            await asyncio.to_thread(workbook.save, file)
+            file.seek(0)
+            while chunk := file.read(cls.STREAM_CHUNK_SIZE):
+                yield chunk
+
     @classmethod
     def get_excel_template(cls, header_list: list, selector_header_list: list, option_list: list[dict]) -> bytes:
         """
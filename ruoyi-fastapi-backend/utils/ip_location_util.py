@@ -0,0 +1,308 @@
+import asyncio
+import ipaddress
+import mmap
+import os
+import struct
+from typing import ClassVar
+
+import httpx
+from starlette.status import HTTP_200_OK
+
+from config.env import AppConfig
+from utils.cache_util import LRUCache
+from utils.log_util import logger
+
+INTERNAL_LOCATION = '内网IP'
+UNKNOWN_LOCATION = '未知'
+
+
+class IpLocationBackend:
+    """
+    IP归属区域查询后端基类
+    """
+
+    async def query(self, ip: str) -> str | None:
+        """
+        查询ip归属区域
+
+        :param ip: 需要查询的ip
+        :return: ip归属区域，查询不到时返回None
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        释放查询后端持有的资源
+
+        :return: None
+        """
+
+
+class HttpIpLocationBackend(IpLocationBackend):
+    """
+    基于在线接口的IP归属区域查询后端，所有查询共用同一个连接池
+    """
+
+    _api_url = 'https://qifu-api.baidubce.com/ip/geo/v1/district'
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        获取共用的http客户端，首次使用时创建
+
+        :return: http客户端
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=AppConfig.app_ip_location_timeout,
+                limits=httpx.Limits(
+                    max_connections=AppConfig.app_ip_location_max_connections,
+                    max_keepalive_connections=AppConfig.app_ip_location_max_connections,
+                ),
+            )
+        return self._client
+
+    async def query(self, ip: str) -> str | None:
+        ip_result = await self._get_client().get(self._api_url, params={'ip': ip})
+        if ip_result.status_code != HTTP_200_OK:
+            return None
+        data = ip_result.json().get('data') or {}
+        prov = data.get('prov')
+        city = data.get('city')
+        if prov or city:
+            return f'{prov}-{city}'
+        return None
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class LocalIpLocationBackend(IpLocationBackend):
+    """
+    基于本地ip2region xdb数据文件的IP归属区域查询后端
+
+    数据文件以内存映射方式打开，先通过IP前两段定位向量索引得到分段索引区间，再在区间内二分查找，
+    单次查询仅需少量内存读取，无需网络请求，目前仅支持IPv4
+    """
+
+    _HEADER_SIZE = 256
+    _VECTOR_INDEX_COLS = 256
+    _VECTOR_INDEX_SIZE = 8
+    _SEGMENT_INDEX_SIZE = 14
+
+    def __init__(self, db_path: str) -> None:
+        """
+        初始化本地查询后端
+
+        :param db_path: ip2region xdb数据文件路径
+        """
+        self._db_path = db_path
+        self._file = None
+        self._buffer: mmap.mmap | None = None
+        self._load_failed = False
+
+    def _get_buffer(self) -> mmap.mmap | None:
+        """
+        获取数据文件的内存映射，首次使用时打开
+
+        :return: 数据文件的内存映射，数据文件不可用时返回None
+        """
+        if self._buffer is None and not self._load_failed:
+            try:
+                self._file = open(self._db_path, 'rb')  # noqa: SIM115
+                self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                self._load_failed = True
+                logger.error(f'IP归属区域数据文件{os.path.abspath(self._db_path)}加载失败：{e}')
+        return self._buffer
+
+    def search(self, ip: str) -> str | None:
+        """
+        在数据文件中查找ip对应的区域信息
+
+        :param ip: 需要查询的ip
+        :return: 区域信息，格式为`国家|区域|省份|城市|ISP`，查询不到时返回None
+        """
+        buffer = self._get_buffer()
+        if buffer is None:
+            return None
+        try:
+            ip_address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        if not isinstance(ip_address, ipaddress.IPv4Address):
+            return None
+        ip_value = int(ip_address)
+        vector_offset = (
+            self._HEADER_SIZE
+            + (((ip_value >> 24) & 0xFF) * self._VECTOR_INDEX_COLS + ((ip_value >> 16) & 0xFF))
+            * self._VECTOR_INDEX_SIZE
+        )
+        start_ptr, end_ptr = struct.unpack_from('<II', buffer, vector_offset)
+        low, high = 0, (end_ptr - start_ptr) // self._SEGMENT_INDEX_SIZE
+        while low <= high:
+            middle = (low + high) >> 1
+            start_ip, end_ip, data_len, data_ptr = struct.unpack_from(
+                '<IIHI', buffer, start_ptr + middle * self._SEGMENT_INDEX_SIZE
+            )
+            if ip_value < start_ip:
+                high = middle - 1
+            elif ip_value > end_ip:
+                low = middle + 1
+            else:
+                return buffer[data_ptr : data_ptr + data_len].decode('utf-8')
+        return None
+
+    async def query(self, ip: str) -> str | None:
+        region = self.search(ip)
+        if not region:
+            return None
+        country, _, prov, city, *_ = [*region.split('|'), '0', '0', '0', '0']
+        location = '-'.join(item for item in (prov, city) if item != '0')
+        if location:
+            return location
+        return None if country == '0' else country
+
+    async def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class IpLocationUtil:
+    """
+    IP归属区域查询工具类
+
+    查询结果缓存在有条目数上限及过期时间的进程内缓存中，同一ip的并发查询只会向后端发起一次请求
+    """
+
+    _backend_classes: ClassVar[dict[str, type[IpLocationBackend]]] = {
+        'http': HttpIpLocationBackend,
+        'local': LocalIpLocationBackend,
+    }
+    _backend: IpLocationBackend | None = None
+    _cache = LRUCache(maxsize=AppConfig.app_ip_location_cache_size, ttl=AppConfig.app_ip_location_cache_ttl)
+    _pending: ClassVar[dict[str, asyncio.Future]] = {}
+    # 查询失败的结果只短暂缓存，避免后端异常时反复请求
+    _failure_cache_ttl = 60
+
+    @classmethod
+    def register_backend(cls, name: str, backend_class: type[IpLocationBackend]) -> None:
+        """
+        注册自定义查询后端，通过APP_IP_LOCATION_BACKEND配置项选择使用
+
+        :param name: 后端名称
+        :param backend_class: 后端类
+        :return: None
+        """
+        cls._backend_classes[name] = backend_class
+
+    @classmethod
+    def get_backend(cls) -> IpLocationBackend:
+        """
+        获取当前配置的查询后端
+
+        :return: 查询后端对象
+        """
+        if cls._backend is None:
+            backend_name = AppConfig.app_ip_location_backend
+            backend_class = cls._backend_classes.get(backend_name)
+            if backend_class is None:
+                raise ValueError(f'不支持的IP归属区域查询后端：{backend_name}')
+            if backend_class is LocalIpLocationBackend:
+                cls._backend = LocalIpLocationBackend(AppConfig.app_ip_location_db_path)
+            else:
+                cls._backend = backend_class()
+        return cls._backend
+
+    @classmethod
+    def is_internal_ip(cls, ip: str | None) -> bool:
+        """
+        判断ip是否为内网ip
+
+        :param ip: 需要判断的ip
+        :return: 是否为内网ip
+        """
+        if ip == 'localhost':
+            return True
+        try:
+            ip_address = ipaddress.ip_address(ip)
+        except (TypeError, ValueError):
+            return False
+        return ip_address.is_private or ip_address.is_loopback
+
+    @classmethod
+    def get_cached_location(cls, ip: str | None) -> str | None:
+        """
+        获取ip归属区域，仅读取缓存，不会发起查询
+
+        :param ip: 需要查询的ip
+        :return: ip归属区域，未缓存时返回None
+        """
+        if not ip:
+            return None
+        if cls.is_internal_ip(ip):
+            return INTERNAL_LOCATION
+        return cls._cache.get(ip)
+
+    @classmethod
+    async def resolve(cls, ip: str | None) -> str:
+        """
+        查询ip归属区域
+
+        :param ip: 需要查询的ip
+        :return: ip归属区域
+        """
+        location = cls.get_cached_location(ip)
+        if location is not None:
+            return location
+        if not ip:
+            return UNKNOWN_LOCATION
+        pending = cls._pending.get(ip)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        pending = asyncio.get_running_loop().create_future()
+        cls._pending[ip] = pending
+        try:
+            location = await cls.get_backend().query(ip) or UNKNOWN_LOCATION
+            cls._cache.set(ip, location)
+        except Exception as e:
+            logger.warning(f'查询ip{ip}归属区域失败：{e}')
+            location = UNKNOWN_LOCATION
+            cls._cache.set(ip, location, ttl=cls._failure_cache_ttl)
+        finally:
+            cls._pending.pop(ip, None)
+            # 查询被取消时也需唤醒等待同一ip查询结果的协程
+            if not pending.done():
+                pending.set_result(location or UNKNOWN_LOCATION)
+        return location
+
+    @classmethod
+    async def resolve_batch(cls, ip_list: list[str | None]) -> dict[str, str]:
+        """
+        批量查询ip归属区域，相同ip只查询一次
+
+        :param ip_list: 需要查询的ip列表
+        :return: ip与归属区域的映射字典
+        """
+        unique_ip_list = list(dict.fromkeys(ip for ip in ip_list if ip))
+        location_list = await asyncio.gather(*(cls.resolve(ip) for ip in unique_ip_list))
+        return dict(zip(unique_ip_list, location_list, strict=True))
+
+    @classmethod
+    async def close(cls) -> None:
+        """
+        关闭查询后端
+
+        :return: None
+        """
+        if cls._backend is not None:
+            await cls._backend.close()
+            cls._backend = None
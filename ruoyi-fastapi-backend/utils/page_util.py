@@ -1,8 +1,13 @@
+import base64
 import math
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Row, Select, func, select
+import orjson
+from sqlalchemy import ColumnElement, Row, Select, and_, asc, desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from common.vo import PageModel
 from utils.common_util import CamelCaseUtil
@@ -11,8 +16,15 @@ from utils.common_util import CamelCaseUtil
 class PageUtil:
     """
     分页工具类
+
+    默认使用OFFSET分页并统计精确总数。数据量很大的表可传入游标列（排序列及主键）开启游标分页：
+    每页返回下一页游标，请求下一页时携带该游标即可按索引定位，不再随页码增大扫描并丢弃前面的全部记录；
+    同时可传入总数统计上限，总数只统计到上限为止，避免每次分页都全表计数。
+    导出等不分页的大结果集可开启流式获取，使用服务端游标分批读取，内存占用与总记录数无关
     """
 
+    STREAM_BATCH_SIZE = 1000
+
     @classmethod
     def get_page_obj(cls, data_list: list, page_num: int, page_size: int) -> PageModel:
         """
@@ -37,10 +49,83 @@ class PageUtil:
 
         return result
 
+    @classmethod
+    def _encode_cursor(cls, row: Row, keyset_columns: Sequence[InstrumentedAttribute], is_desc: bool) -> str | None:
+        """
+        根据当前页最后一条记录生成下一页游标
+
+        :param row: 当前页最后一条记录
+        :param keyset_columns: 游标列
+        :param is_desc: 游标列是否降序
+        :return: 下一页游标，游标列的值为None时返回None
+        """
+        values = []
+        for column in keyset_columns:
+            entity = next((item for item in row if isinstance(item, column.class_)), None)
+            value = getattr(entity, column.key, None)
+            if value is None:
+                return None
+            values.append(value)
+        payload = orjson.dumps({'keys': [column.key for column in keyset_columns], 'desc': is_desc, 'values': values})
+        return base64.urlsafe_b64encode(payload).decode()
+
+    @classmethod
+    def _decode_cursor(
+        cls, cursor: str, keyset_columns: Sequence[InstrumentedAttribute], is_desc: bool
+    ) -> list[Any] | None:
+        """
+        解析游标得到游标列的值
+
+        :param cursor: 游标
+        :param keyset_columns: 游标列
+        :param is_desc: 游标列是否降序
+        :return: 游标列的值，游标无效或与当前排序不一致时返回None
+        """
+        try:
+            payload = orjson.loads(base64.urlsafe_b64decode(cursor))
+            if payload.get('keys') != [column.key for column in keyset_columns] or payload.get('desc') != is_desc:
+                return None
+            values = []
+            for column, value in zip(keyset_columns, payload.get('values'), strict=True):
+                python_type = column.type.python_type
+                values.append(datetime.fromisoformat(value) if python_type is datetime else python_type(value))
+            return values
+        except (TypeError, ValueError, AttributeError, NotImplementedError):
+            return None
+
+    @classmethod
+    def _keyset_condition(
+        cls, keyset_columns: Sequence[InstrumentedAttribute], values: list[Any], is_desc: bool
+    ) -> ColumnElement[bool]:
+        """
+        生成位于游标之后的记录的查询条件，即(a, b) > (va, vb)展开后的形式：a > va OR (a = va AND b > vb)
+
+        :param keyset_columns: 游标列
+        :param values: 游标列的值
+        :param is_desc: 游标列是否降序
+        :return: 查询条件
+        """
+        conditions = []
+        for index, column in enumerate(keyset_columns):
+            after = column < values[index] if is_desc else column > values[index]
+            equals = [keyset_columns[i] == values[i] for i in range(index)]
+            conditions.append(and_(*equals, after))
+        return or_(*conditions)
+
     @classmethod
     async def paginate(
-        cls, db: AsyncSession, query: Select, page_num: int, page_size: int, is_page: bool = False
-    ) -> PageModel | list[dict[str, Any] | list[dict[Any, Any]]]:
+        cls,
+        db: AsyncSession,
+        query: Select,
+        page_num: int,
+        page_size: int,
+        is_page: bool = False,
+        keyset_columns: Sequence[InstrumentedAttribute] | None = None,
+        is_desc: bool = True,
+        cursor: str | None = None,
+        count_limit: int | None = None,
+        is_stream: bool = False,
+    ) -> PageModel | list[dict[str, Any] | list[dict[Any, Any]]] | AsyncIterator[list[Any]]:
         """
         输入查询语句和分页信息，返回分页数据列表结果
 
@@ -49,25 +134,49 @@ class PageUtil:
         :param page_num: 当前页码
         :param page_size: 当前页面数据量
         :param is_page: 是否开启分页
+        :param keyset_columns: 游标列，通常为排序列及主键，传入时按游标列排序并在分页结果中返回下一页游标，游标列的值不能为空
+        :param is_desc: 游标列是否降序
+        :param cursor: 上一页返回的下一页游标，无效或与当前排序不一致时按页码分页
+        :param count_limit: 总数统计上限，为None时统计精确总数
+        :param is_stream: 不分页时是否分批流式获取，开启时返回每次产出一批记录的异步迭代器，迭代期间需保持数据库会话可用
         :return: 分页数据对象
         """
         if is_page:
-            total = (await db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
-            query_result = await db.execute(query.offset((page_num - 1) * page_size).limit(page_size))
+            count_query = query.order_by(None) if count_limit is None else query.order_by(None).limit(count_limit)
+            total = (await db.execute(select(func.count('*')).select_from(count_query.subquery()))).scalar()
+            cursor_values = None
+            if keyset_columns:
+                query = query.order_by(None).order_by(
+                    *[desc(column) if is_desc else asc(column) for column in keyset_columns]
+                )
+                cursor_values = cls._decode_cursor(cursor, keyset_columns, is_desc) if cursor else None
+            if cursor_values is not None:
+                page_query = query.where(cls._keyset_condition(keyset_columns, cursor_values, is_desc))
+            else:
+                page_query = query.offset((page_num - 1) * page_size)
+            # 多查询一条记录用于判断是否存在下一页，总数只统计到上限时也能准确判断
+            query_result = (await db.execute(page_query.limit(page_size + 1))).all()
+            has_next = len(query_result) > page_size
+            query_result = query_result[:page_size]
+            next_cursor = (
+                cls._encode_cursor(query_result[-1], keyset_columns, is_desc) if keyset_columns and has_next else None
+            )
             paginated_data: list[Row] = []
             for row in query_result:
                 if row and len(row) == 1:
                     paginated_data.append(row[0])
                 else:
                     paginated_data.append(row)
-            has_next = math.ceil(total / page_size) > page_num
             result = PageModel[Any](
                 rows=CamelCaseUtil.transform_result(paginated_data),
                 pageNum=page_num,
                 pageSize=page_size,
                 total=total,
                 hasNext=has_next,
+                nextCursor=next_cursor,
             )
+        elif is_stream:
+            result = cls.stream(db, query)
         else:
             query_result = await db.execute(query)
             no_paginated_data: list[Row] = []
@@ -80,6 +189,22 @@ class PageUtil:
 
         return result
 
+    @classmethod
+    async def stream(
+        cls, db: AsyncSession, query: Select, batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[list[Any]]:
+        """
+        使用服务端游标分批获取查询结果
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :param batch_size: 每批记录数
+        :return: 每次产出一批记录的异步迭代器，记录格式与不分页查询结果一致
+        """
+        query_result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for partition in query_result.partitions():
+            yield CamelCaseUtil.transform_result([row[0] if row and len(row) == 1 else row for row in partition])
+
 
 def get_page_obj(data_list: list, page_num: int, page_size: int) -> PageModel:
     """
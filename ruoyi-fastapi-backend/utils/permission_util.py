@@ -0,0 +1,69 @@
+from collections.abc import Iterable
+
+_ALL_PERMISSION = '*:*:*'
+_WILDCARD = '*'
+_SEPARATOR = ':'
+_TERMINAL = None
+
+
+class PermissionMatcher:
+    """
+    权限标识匹配器
+
+    权限标识按`:`分段构建前缀树，精确权限通过集合直接命中，通配权限在前缀树中按段匹配，
+    匹配开销与权限标识的段数相关，与用户拥有的权限数量无关。
+    通配规则：`*`匹配任意一段，最后一段为`*`时同时匹配其后的任意多段，例如`system:*:list`、`system:user:*`，`*:*:*`表示拥有所有权限
+    """
+
+    __slots__ = ('_all_permission', '_exact_permissions', '_trie')
+
+    def __init__(self, permissions: Iterable[str]) -> None:
+        """
+        初始化权限标识匹配器
+
+        :param permissions: 用户拥有的权限标识列表
+        """
+        self._exact_permissions: frozenset[str] = frozenset(perm for perm in permissions if perm)
+        self._all_permission = _ALL_PERMISSION in self._exact_permissions
+        self._trie: dict = {}
+        for perm in self._exact_permissions:
+            if _WILDCARD not in perm:
+                continue
+            node = self._trie
+            for segment in perm.split(_SEPARATOR):
+                node = node.setdefault(segment, {})
+            node[_TERMINAL] = True
+
+    def has_permission(self, perm: str) -> bool:
+        """
+        判断是否拥有指定权限标识
+
+        :param perm: 需要校验的权限标识
+        :return: 是否拥有该权限
+        """
+        if self._all_permission or perm in self._exact_permissions:
+            return True
+        if not self._trie:
+            return False
+        return self._match(self._trie, perm.split(_SEPARATOR), 0)
+
+    def _match(self, node: dict, segments: list[str], index: int) -> bool:
+        """
+        在前缀树中递归匹配权限标识
+
+        :param node: 当前前缀树节点
+        :param segments: 需要校验的权限标识分段
+        :param index: 当前匹配的分段下标
+        :return: 是否匹配
+        """
+        if index == len(segments):
+            return _TERMINAL in node
+        wildcard_node = node.get(_WILDCARD)
+        if wildcard_node is not None:
+            # 末段通配符匹配剩余的所有分段
+            if _TERMINAL in wildcard_node:
+                return True
+            if self._match(wildcard_node, segments, index + 1):
+                return True
+        exact_node = node.get(segments[index])
+        return exact_node is not None and self._match(exact_node, segments, index + 1)
@@ -1,13 +1,29 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
 import bcrypt
 
+from config.env import AppConfig
+from exceptions.exception import ServiceException
+
+_T = TypeVar('_T')
+
 
 class PwdUtil:
     """
     密码工具类
+
+    bcrypt计算耗时较长，加密及校验均提交到有界线程池中执行以避免阻塞事件循环，
+    正在执行及排队的任务数超出上限时直接拒绝，防止登录高峰拖垮其他请求
     """
 
+    _executor: ThreadPoolExecutor | None = None
+    _pending_count: int = 0
+
     @classmethod
-    def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
         """
         工具方法：校验当前输入的密码与数据库存储的密码是否一致
 
@@ -15,16 +31,60 @@ class PwdUtil:
         :param hashed_password: 数据库存储的密码
         :return: 校验结果
         """
-        return (
-            bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8')) if hashed_password else None
+        if not hashed_password:
+            return None
+        return await cls._run_in_executor(
+            bcrypt.checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8')
         )
 
     @classmethod
-    def get_password_hash(cls, input_password: str) -> str:
+    async def get_password_hash(cls, input_password: str) -> str:
         """
         工具方法：对当前输入的密码进行加密
 
         :param input_password: 输入的密码
         :return: 加密成功的密码
         """
-        return bcrypt.hashpw(input_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed_password = await cls._run_in_executor(bcrypt.hashpw, input_password.encode('utf-8'), bcrypt.gensalt())
+        return hashed_password.decode('utf-8')
+
+    @classmethod
+    async def _run_in_executor(cls, func: Callable[..., _T], *args: Any) -> _T:
+        """
+        在密码计算线程池中执行函数
+
+        :param func: 需要执行的函数
+        :param args: 函数参数
+        :return: 函数执行结果
+        """
+        if cls._pending_count >= AppConfig.app_password_hash_workers + AppConfig.app_password_hash_queue_size:
+            raise ServiceException(message='系统繁忙，请稍后再试')
+        cls._pending_count += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(cls._get_executor(), func, *args)
+        finally:
+            cls._pending_count -= 1
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        """
+        获取密码计算线程池，首次使用时创建
+
+        :return: 密码计算线程池
+        """
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=AppConfig.app_password_hash_workers, thread_name_prefix='pwd_hash'
+            )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        关闭密码计算线程池
+
+        :return: None
+        """
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -0,0 +1,149 @@
+from collections.abc import AsyncIterator
+
+from redis import asyncio as aioredis
+
+
+class RedisKeyUtil:
+    """
+    Redis键批量操作工具类
+
+    基于SCAN命令分批遍历键，代替会阻塞Redis的KEYS命令，并对遍历结果分批执行MGET、UNLINK，
+    以及按目标键值对增量同步一组键
+    """
+
+    SCAN_COUNT = 1000
+
+    @classmethod
+    async def scan_batches(
+        cls, redis: aioredis.Redis, match: str | None = None, count: int = SCAN_COUNT
+    ) -> AsyncIterator[list[str]]:
+        """
+        按批次遍历匹配的键
+
+        :param redis: redis对象
+        :param match: 键名匹配模式，为None时遍历所有键
+        :param count: 每次SCAN的参考数量
+        :return: 键名列表的异步迭代器，每次返回一批非空的键名列表
+        """
+        cursor = 0
+        while True:
+            cursor, keys = await redis.scan(cursor=cursor, match=match, count=count)
+            if keys:
+                yield keys
+            if not cursor:
+                break
+
+    @classmethod
+    async def scan_keys(cls, redis: aioredis.Redis, match: str | None = None, count: int = SCAN_COUNT) -> list[str]:
+        """
+        获取所有匹配的键
+
+        :param redis: redis对象
+        :param match: 键名匹配模式，为None时遍历所有键
+        :param count: 每次SCAN的参考数量
+        :return: 键名列表
+        """
+        return [key async for keys in cls.scan_batches(redis, match, count) for key in keys]
+
+    @classmethod
+    async def scan_page(
+        cls, redis: aioredis.Redis, match: str | None = None, cursor: int = 0, page_size: int = SCAN_COUNT
+    ) -> tuple[int, list[str]]:
+        """
+        从指定游标开始分页获取匹配的键
+
+        :param redis: redis对象
+        :param match: 键名匹配模式，为None时遍历所有键
+        :param cursor: 起始游标，首页为0
+        :param page_size: 每页至少返回的键数量，遍历结束时可能不足
+        :return: 下一页游标及当前页键名列表，游标为0时表示遍历结束
+        """
+        page_keys: list[str] = []
+        while True:
+            cursor, keys = await redis.scan(cursor=cursor, match=match, count=page_size)
+            page_keys.extend(keys)
+            if not cursor or len(page_keys) >= page_size:
+                return cursor, page_keys
+
+    @classmethod
+    async def scan_mget(
+        cls, redis: aioredis.Redis, match: str | None = None, count: int = SCAN_COUNT
+    ) -> AsyncIterator[list[tuple[str, str]]]:
+        """
+        按批次遍历匹配的键并批量获取键值
+
+        :param redis: redis对象
+        :param match: 键名匹配模式，为None时遍历所有键
+        :param count: 每次SCAN的参考数量
+        :return: 键名及键值列表的异步迭代器，遍历期间已过期的键会被过滤
+        """
+        async for keys in cls.scan_batches(redis, match, count):
+            values = await redis.mget(keys)
+            items = [(key, value) for key, value in zip(keys, values, strict=True) if value is not None]
+            if items:
+                yield items
+
+    @classmethod
+    async def unlink_keys(cls, redis: aioredis.Redis, keys: list[str], batch_size: int = SCAN_COUNT) -> int:
+        """
+        分批异步删除指定的键
+
+        :param redis: redis对象
+        :param keys: 键名列表
+        :param batch_size: 每批删除的键数量
+        :return: 删除的键数量
+        """
+        deleted_count = 0
+        for index in range(0, len(keys), batch_size):
+            deleted_count += await redis.unlink(*keys[index : index + batch_size])
+        return deleted_count
+
+    @classmethod
+    async def unlink_by_pattern(
+        cls,
+        redis: aioredis.Redis,
+        match: str | None = None,
+        count: int = SCAN_COUNT,
+        exclude_prefixes: tuple[str, ...] = (),
+    ) -> int:
+        """
+        分批异步删除所有匹配的键
+
+        :param redis: redis对象
+        :param match: 键名匹配模式，为None时删除所有键
+        :param count: 每次SCAN的参考数量
+        :param exclude_prefixes: 不删除的键名前缀
+        :return: 删除的键数量
+        """
+        deleted_count = 0
+        async for keys in cls.scan_batches(redis, match, count):
+            unlink_keys = [key for key in keys if not key.startswith(exclude_prefixes)] if exclude_prefixes else keys
+            if unlink_keys:
+                deleted_count += await redis.unlink(*unlink_keys)
+        return deleted_count
+
+    @classmethod
+    async def sync_by_pattern(
+        cls, redis: aioredis.Redis, match: str, mapping: dict[str, str], count: int = SCAN_COUNT
+    ) -> list[str]:
+        """
+        将匹配的键增量同步为目标键值对，仅写入值发生变化的键并删除目标中不存在的键，写入及删除在同一事务中执行，
+        其他客户端只会看到同步前或同步后的完整结果，不会出现键被删除后尚未重建的窗口
+
+        :param redis: redis对象
+        :param match: 键名匹配模式，目标键值对中的键均需匹配该模式
+        :param mapping: 目标键值对
+        :param count: 每次SCAN的参考数量
+        :return: 发生变化的键名列表，包括新增、修改及删除的键
+        """
+        current = {key: value async for items in cls.scan_mget(redis, match, count) for key, value in items}
+        changed = {key: value for key, value in mapping.items() if current.get(key) != value}
+        stale_keys = [key for key in current if key not in mapping]
+        if changed or stale_keys:
+            async with redis.pipeline(transaction=True) as pipe:
+                if changed:
+                    pipe.mset(changed)
+                if stale_keys:
+                    pipe.unlink(*stale_keys)
+                await pipe.execute()
+        return [*changed, *stale_keys]
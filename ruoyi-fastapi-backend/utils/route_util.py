@@ -0,0 +1,115 @@
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from fastapi import Request
+
+from config.env import AppConfig
+from utils.cache_util import LRUCache
+
+
+class ExcludeRouteMatcher:
+    """
+    排除路由匹配器
+
+    初始化时将排除路由预编译为静态路径字典及合并后的动态路径正则表达式，
+    静态路径通过字典直接命中，动态路径只需执行一次正则匹配即可判断是否可能命中，
+    匹配结果按(请求方法, 请求路径)缓存，匹配开销不随排除路由数量增长
+    """
+
+    # 包含路径参数或正则元字符的路径需要按正则表达式进行匹配
+    _DYNAMIC_PATH_PATTERN = re.compile(r'[{}.*+?^$()\[\]|\\]')
+
+    def __init__(self, exclude_routes: Iterable[Mapping[str, Any]], cache_size: int = 4096) -> None:
+        """
+        初始化排除路由匹配器
+
+        :param exclude_routes: 需要排除的路由列表
+        :param cache_size: 匹配结果缓存的最大条目数
+        """
+        self._static_rules: dict[str, list[tuple[frozenset[str], frozenset[str]]]] = {}
+        self._dynamic_rules: list[tuple[re.Pattern, frozenset[str], frozenset[str]]] = []
+        for route in exclude_routes:
+            path = route.get('path', '')
+            methods = frozenset(method.upper() for method in route.get('methods', []))
+            ignore_paths = frozenset(route.get('ignore_paths', []))
+            if self._DYNAMIC_PATH_PATTERN.search(path):
+                self._dynamic_rules.append((self.compile_path_pattern(path), methods, ignore_paths))
+            else:
+                self._static_rules.setdefault(path, []).append((methods, ignore_paths))
+        # 合并所有动态路径为一个正则表达式，未命中时无需逐条匹配
+        self._dynamic_pattern = (
+            re.compile('|'.join(f'(?:{pattern.pattern})' for pattern, _, _ in self._dynamic_rules))
+            if self._dynamic_rules
+            else None
+        )
+        self._cache = LRUCache(maxsize=cache_size)
+
+    def __bool__(self) -> bool:
+        return bool(self._static_rules or self._dynamic_rules)
+
+    @classmethod
+    def compile_path_pattern(cls, path: str) -> re.Pattern:
+        """
+        将FastAPI路径转换为正则表达式模式
+
+        :param path: FastAPI路径（如 /configKey/{config_key}）
+        :return: 编译后的正则表达式模式
+        """
+        # 将FastAPI路径参数转换为正则表达式
+        # 例如：/configKey/{config_key} -> /configKey/[^/]+
+        pattern_str = re.sub(r'\{[^}]+\}', r'[^/]+', path)
+        # 添加开始和结束锚点，确保精确匹配
+        return re.compile(f'^{pattern_str}$')
+
+    def match(self, method: str, path: str) -> bool:
+        """
+        判断请求方法及路径是否匹配排除路由
+
+        :param method: 请求方法
+        :param path: 去掉APP_ROOT_PATH前缀后的请求路径
+        :return: 是否匹配
+        """
+        cache_key = (method, path)
+        result = self._cache.get(cache_key)
+        if result is None:
+            result = self._match(method, path)
+            self._cache.set(cache_key, result)
+        return result
+
+    def match_request(self, request: Request) -> bool:
+        """
+        判断当前请求是否匹配排除路由
+
+        :param request: 请求对象
+        :return: 是否匹配
+        """
+        if not self:
+            return False
+        # 获取当前请求路径和方法
+        path = request.url.path
+        method = request.method.upper()
+        # 去掉APP_ROOT_PATH前缀
+        app_root_path = AppConfig.app_root_path
+        if app_root_path and path.startswith(app_root_path):
+            path = path[len(app_root_path) :]
+        return self.match(method, path)
+
+    def _match(self, method: str, path: str) -> bool:
+        """
+        执行排除路由匹配
+
+        :param method: 请求方法
+        :param path: 请求路径
+        :return: 是否匹配
+        """
+        for exclude_methods, ignore_paths in self._static_rules.get(path, ()):
+            # methods为空集合（匹配所有方法）或者当前方法在允许集合中，且当前路径不在忽略集合中
+            if path not in ignore_paths and (not exclude_methods or method in exclude_methods):
+                return True
+        if self._dynamic_pattern is None or not self._dynamic_pattern.match(path):
+            return False
+        return any(
+            path not in ignore_paths and (not exclude_methods or method in exclude_methods) and pattern.match(path)
+            for pattern, exclude_methods, ignore_paths in self._dynamic_rules
+        )
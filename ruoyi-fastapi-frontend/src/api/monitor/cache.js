@@ -17,10 +17,11 @@ export function listCacheName() {
 }
 
 // 查询缓存键名列表
-export function listCacheKey(cacheName) {
+export function listCacheKey(cacheName, query) {
   return request({
     url: '/monitor/cache/getKeys/' + cacheName,
-    method: 'get'
+    method: 'get',
+    params: query
   })
 }
 
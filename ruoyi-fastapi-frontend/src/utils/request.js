@@ -150,4 +150,40 @@ export function download(url, params, filename, config) {
   })
 }
 
+// 通用异步导出方法，提交导出任务后轮询任务进度，执行成功后下载结果文件
+export function downloadAsync(url, params, filename, config) {
+  downloadLoadingInstance = ElLoading.service({ text: "正在提交导出任务，请稍候", background: "rgba(0, 0, 0, 0.7)", })
+  return service.post(url, params, {
+    params: { isAsync: true },
+    transformRequest: [(params) => { return tansParams(params) }],
+    headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+    ...config
+  }).then(async (res) => {
+    const taskId = res.data.taskId
+    let task = res.data
+    while (task.status === 'pending' || task.status === 'running') {
+      downloadLoadingInstance.setText(task.status === 'pending' ? '导出任务排队中，请稍候' : '正在导出数据，已处理' + task.processed + '条')
+      await new Promise(resolve => setTimeout(resolve, 1000))
+      task = (await service.get('/common/task/' + taskId)).data
+    }
+    if (task.status !== 'success') {
+      ElMessage.error(task.message || '导出失败')
+      return
+    }
+    downloadLoadingInstance.setText('正在下载数据，请稍候')
+    const data = await service.get('/common/task/download/' + taskId, { responseType: 'blob', timeout: 0 })
+    if (blobValidate(data)) {
+      saveAs(new Blob([data]), filename)
+    } else {
+      const rspObj = JSON.parse(await data.text())
+      ElMessage.error(errorCode[rspObj.code] || rspObj.msg || errorCode['default'])
+    }
+  }).catch((r) => {
+    console.error(r)
+    ElMessage.error('下载文件出现错误，请联系管理员！')
+  }).finally(() => {
+    downloadLoadingInstance.close()
+  })
+}
+
 export default service
@@ -226,6 +226,27 @@ export function tansParams(params) {
   return result
 }
 
+/**
+* 游标分页：顺序翻到下一页时携带上一页返回的下一页游标，其他情况仍按页码分页
+*/
+export function createPageCursor() {
+  let lastPage = null
+  return {
+    // 返回附加了游标的查询参数
+    apply(params) {
+      const useCursor = lastPage && lastPage.nextCursor && params.pageNum === lastPage.pageNum + 1 && params.pageSize === lastPage.pageSize
+      return { ...params, cursor: useCursor ? lastPage.nextCursor : undefined }
+    },
+    // 记录当前页返回的下一页游标
+    update(params, response) {
+      lastPage = { pageNum: params.pageNum, pageSize: params.pageSize, nextCursor: response.nextCursor }
+    },
+    // 查询条件或排序变化时清除游标
+    reset() {
+      lastPage = null
+    }
+  }
+}
 
 // 返回项目路径
 export function getNormalPath(p) {